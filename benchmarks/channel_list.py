@@ -0,0 +1,70 @@
+"""
+Time parsing the channels feed page: the old regex over the page source against the ytInitialData walk.
+
+    uv run python benchmarks/channel_list.py --channels 2000 --filler-mb 2
+
+The page is the tests' channels_feed_page fixture: --channels renderers inside
+ytInitialData with --filler-mb of unrelated script on each side. Each parser runs
+--repeat times and the best time is reported with the number of channels it found.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / 'src'), str(ROOT / 'tests')]
+
+from conftest import channels_feed_page  # noqa: E402
+from ytsubs.scrape_channel_stats import ChannelStatsMixin  # noqa: E402
+
+
+def regex_channel_list(parser: ChannelStatsMixin, page_source: str) -> dict:
+    """The parser before the walk: a lazy DOTALL regex per renderer, cut-off matches patched with '}'"""
+    channel_info = {}
+    for match in re.finditer(r'\{"channelRenderer":.+?(?=,\{"channelRenderer"|$)', page_source, re.DOTALL):
+        json_str = match.group(0)
+        if not json_str.endswith('}'):
+            json_str += '}'
+        try:
+            data = json.loads(json_str)
+        except json.JSONDecodeError:
+            continue
+        info = parser._channel_from_renderer(data['channelRenderer'])
+        if info:
+            channel_info[info['id']] = info
+    return channel_info
+
+
+PARSERS = {
+    'regex over page source': regex_channel_list,
+    'ytInitialData walk': lambda parser, page_source: parser.read_channel_page(page_source)[0],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--channels', type=int, default=2000)
+    parser.add_argument('--filler-mb', type=float, default=2.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    page = channels_feed_page(args.channels, filler_bytes=int(args.filler_mb * 1024 * 1024))
+    print(f"{args.channels:,} channels, {len(page) / 1024 / 1024:.1f} MB page")
+    for name, parse in PARSERS.items():
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):  # Per-channel progress lines
+                found = parse(ChannelStatsMixin(), page)
+            timings.append(time.perf_counter() - started)
+        print(f"  {name:<24} {len(found):>6,} channels   best {min(timings) * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
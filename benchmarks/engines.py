@@ -0,0 +1,165 @@
+"""
+Compare the sync and async scraper engines crawling channel pages from a local fixture site.
+
+    uv run python benchmarks/engines.py --channels 40 --workers 4 --latency 0.2
+    uv run python benchmarks/engines.py --averages dom  # needs `playwright install chromium`
+
+Every channel's /videos page is served from tests/fixtures after --latency seconds,
+standing in for YouTube's response time. JSON mode fetches through Playwright's
+APIRequestContext, so it runs without a browser binary. The database lives in a
+temporary state directory.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+os.environ['XDG_STATE_HOME'] = tempfile.mkdtemp(prefix='ytsubs-bench-')
+sys.path.insert(0, str(ROOT / 'src'))
+
+from playwright.async_api import async_playwright  # noqa: E402
+from playwright.sync_api import sync_playwright  # noqa: E402
+
+from ytsubs.scrape_channel_stats import AsyncChannelStatsScraper, ChannelStatsScraper  # noqa: E402
+
+FIXTURE_PAGES = {
+    'json': (ROOT / 'tests' / 'fixtures' / 'channel_videos.html').read_bytes(),
+    'dom': (ROOT / 'tests' / 'fixtures' / 'channel_videos_grid.html').read_bytes(),
+}
+
+
+class RequestPage:
+    """A page that only carries an APIRequestContext, which is all the JSON crawl uses"""
+
+    def __init__(self, request):
+        self.request = request
+
+    def is_closed(self):
+        return False
+
+    def close(self):
+        pass
+
+
+class AsyncRequestPage(RequestPage):
+    async def close(self):
+        pass
+
+
+class RequestBrowser:
+    def __init__(self, request):
+        self.request = request
+
+    def new_page(self):
+        return RequestPage(self.request)
+
+
+class AsyncRequestBrowser(RequestBrowser):
+    async def new_page(self):
+        return AsyncRequestPage(self.request)
+
+
+def serve(page: bytes, latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def channel_jobs(base_url: str, count: int) -> list:
+    return [
+        (f'@bench{i}', {
+            'name': f'Bench {i}', 'handle': f'bench{i}', 'youtube_id': None, 'url': f'{base_url}/@bench{i}',
+            'subscriber_count': 1000, 'is_verified': False, 'description': '', 'thumbnail_url': '',
+        })
+        for i in range(count)
+    ]
+
+
+def crawl_sync(jobs, workers, averages):
+    with sync_playwright() as p:
+        scraper = ChannelStatsScraper(workers=workers, averages=averages)
+        if averages == 'json':
+            request = p.request.new_context()
+            scraper._browser = RequestBrowser(request)
+            close = request.dispose
+        else:
+            browser = p.chromium.launch()
+            scraper._browser = browser.new_context()
+            close = browser.close
+        scraper._page = scraper._browser.new_page()
+        started = time.perf_counter()
+        try:
+            scraper.crawl_channels(jobs)
+        finally:
+            close()
+        return time.perf_counter() - started, scraper.workers
+
+
+async def crawl_async(jobs, workers, averages):
+    async with async_playwright() as p:
+        scraper = AsyncChannelStatsScraper(workers=workers, averages=averages)
+        if averages == 'json':
+            request = await p.request.new_context()
+            scraper._browser = AsyncRequestBrowser(request)
+            close = request.dispose
+        else:
+            browser = await p.chromium.launch()
+            scraper._browser = await browser.new_context()
+            close = browser.close
+        scraper._page = await scraper._browser.new_page()
+        started = time.perf_counter()
+        try:
+            await scraper.crawl_channels(jobs)
+        finally:
+            await close()
+        return time.perf_counter() - started, scraper.workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--channels', type=int, default=40)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.2, help='Seconds the fixture site takes per page')
+    parser.add_argument('--averages', choices=['json', 'dom'], default='json')
+    args = parser.parse_args()
+
+    httpd = serve(FIXTURE_PAGES[args.averages], args.latency)
+    base_url = f'http://127.0.0.1:{httpd.server_address[1]}'
+    results = []
+    for engine in ('sync', 'async'):
+        # Fresh channel ids per run, so neither engine sees rows the other stored
+        jobs = channel_jobs(f'{base_url}/{engine}', args.channels)
+        if engine == 'sync':
+            elapsed, workers = crawl_sync(jobs, args.workers, args.averages)
+        else:
+            elapsed, workers = asyncio.run(crawl_async(jobs, args.workers, args.averages))
+        results.append((engine, workers, elapsed))
+    httpd.shutdown()
+
+    print(f"\n{args.channels} channels, {args.averages} averages, {args.latency * 1000:.0f} ms per page")
+    for engine, workers, elapsed in results:
+        print(f"  {engine:<5}  {workers} worker{'s' if workers != 1 else ' '}  {elapsed:6.2f}s  "
+              f"{args.channels / elapsed * 60:7.1f} channels/min")
+
+
+if __name__ == '__main__':
+    main()
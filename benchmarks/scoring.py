@@ -0,0 +1,96 @@
+"""
+Time the feed ranking against the reference SQL recompute on synthetic databases.
+
+    uv run python benchmarks/scoring.py --videos 10000 100000 1000000
+
+For each size a database is filled with random channels and videos (video_scores is
+kept up to date by its triggers), then three things are timed on the same instant:
+the REFERENCE_SCORE_SQL feed rows (the query plus dict(row), as the feed used to
+read them), score_videos (the same rows from the numpy engine) and the ranking
+alone (load, components, weighted sum, sort).
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ytsubs.db_schema import connect  # noqa: E402
+from ytsubs.migrations import migrate  # noqa: E402
+from ytsubs.scoring import (  # noqa: E402
+    REFERENCE_SCORE_SQL,
+    ComponentCache,
+    julian_now,
+    load_score_columns,
+    rank_order,
+    score_videos,
+)
+
+
+def populate(conn: sqlite3.Connection, videos: int, seed: int = 1) -> None:
+    rng = random.Random(seed)
+    channels = max(10, videos // 50)
+    conn.executemany(
+        'INSERT INTO channels (id, name, url, subscriber_count, average_views) VALUES (?, ?, ?, ?, ?)',
+        [
+            (f'channel{i}', f'Channel {i}', f'https://www.youtube.com/@channel{i}',
+             int(10 ** rng.uniform(2, 7.5)), rng.choice([0, int(10 ** rng.uniform(2, 6))]))
+            for i in range(channels)
+        ],
+    )
+    now = datetime.now()
+    conn.executemany(
+        'INSERT INTO videos (id, title, url, channel_id, views, published_date, duration_seconds) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+        (
+            (f'video{i:08d}', f'Video {i}', f'https://www.youtube.com/watch?v=video{i:08d}',
+             f'channel{rng.randrange(channels)}', int(10 ** rng.uniform(1, 6.5)),
+             (now - timedelta(seconds=rng.randrange(30 * 86400))).isoformat(),
+             rng.choice([None, rng.randrange(30, 7200)]))
+            for i in range(videos)
+        ),
+    )
+    conn.commit()
+
+
+def timed(function):
+    started = time.perf_counter()
+    result = function()
+    return time.perf_counter() - started, result
+
+
+def rank_only(conn: sqlite3.Connection, now: float):
+    cache = ComponentCache(load_score_columns(conn), now)
+    return rank_order(cache.columns, cache.scores())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--videos', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='ytsubs-bench-') as directory:
+        for count in args.videos:
+            conn = connect(Path(directory) / f'scoring{count}.db')
+            with contextlib.redirect_stdout(io.StringIO()):  # Migration progress
+                migrate(conn)
+            fill_seconds, _ = timed(lambda: populate(conn, count))
+            now = julian_now(conn)
+            sql_seconds, _ = timed(lambda: [dict(row) for row in conn.execute(REFERENCE_SCORE_SQL, {'now': now})])
+            feed_seconds, _ = timed(lambda: score_videos(conn, now))
+            rank_seconds, _ = timed(lambda: rank_only(conn, now))
+            conn.close()
+            print(f"{count:>9,} videos (filled in {fill_seconds:.1f}s): reference SQL {sql_seconds:7.3f}s   "
+                  f"score_videos {feed_seconds:7.3f}s   ranking only {rank_seconds:7.3f}s")
+
+
+if __name__ == '__main__':
+    main()
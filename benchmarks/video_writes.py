@@ -0,0 +1,105 @@
+"""
+Compare per-video commits with YouTubeDB.upsert_videos when writing synthetic videos.
+
+    uv run python benchmarks/video_writes.py --videos 10000
+
+Each strategy writes into its own file-backed database (so commits pay for real
+fsyncs) twice: once inserting every video, once updating them all, as a rescrape does.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ytsubs.db_schema import YouTubeDB  # noqa: E402
+
+CHANNELS = 200
+SCROLL_BATCH = 30  # Roughly the cards one scroll of the subscriptions feed returns
+
+
+def synthetic_rows(count: int, views_offset: int = 0) -> list[tuple]:
+    now = datetime.now()
+    return [
+        (
+            f'video{i:07d}', f'channel{i % CHANNELS}', f'Video {i}', f'https://www.youtube.com/watch?v=video{i:07d}',
+            f'https://i.ytimg.com/vi/video{i:07d}/hqdefault.jpg', 1000 + i + views_offset,
+            (now - timedelta(hours=i % 720)).isoformat(), 3600, '12:34', 754,
+        )
+        for i in range(count)
+    ]
+
+
+def write_per_video(db: YouTubeDB, rows: list[tuple]) -> None:
+    """The scrape loop before batching: look up the channel and the video, write, commit"""
+    cursor = db.db.cursor()
+    for row in rows:
+        video_id, channel_id, title, url, thumbnail, views, published, _, duration, _ = row
+        cursor.execute('SELECT 1 FROM channels WHERE id = ?', (channel_id,))
+        if not cursor.fetchone():
+            continue
+        cursor.execute('SELECT id FROM videos WHERE id = ?', (video_id,))
+        if cursor.fetchone():
+            cursor.execute(
+                'UPDATE videos SET title = ?, url = ?, thumbnail = ?, views = ?, published_date = ?, duration = ? '
+                'WHERE id = ?',
+                (title, url, thumbnail, views, published, duration, video_id),
+            )
+        else:
+            cursor.execute(
+                'INSERT INTO videos (id, channel_id, title, url, thumbnail, views, published_date, duration) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (video_id, channel_id, title, url, thumbnail, views, published, duration),
+            )
+        db.db.commit()
+
+
+def write_per_scroll(db: YouTubeDB, rows: list[tuple]) -> None:
+    for start in range(0, len(rows), SCROLL_BATCH):
+        db.upsert_videos(rows[start:start + SCROLL_BATCH])
+
+
+def write_one_batch(db: YouTubeDB, rows: list[tuple]) -> None:
+    db.upsert_videos(rows)
+
+
+STRATEGIES = {
+    'per-video select+write+commit': write_per_video,
+    f'upsert_videos, {SCROLL_BATCH} rows per scroll': write_per_scroll,
+    'upsert_videos, one batch': write_one_batch,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--videos', type=int, default=10_000)
+    args = parser.parse_args()
+
+    inserts = synthetic_rows(args.videos)
+    updates = synthetic_rows(args.videos, views_offset=500)
+    print(f"{args.videos:,} videos across {CHANNELS} channels")
+    with tempfile.TemporaryDirectory(prefix='ytsubs-bench-') as directory:
+        for number, (name, write) in enumerate(STRATEGIES.items()):
+            with contextlib.redirect_stdout(io.StringIO()):  # Migration progress
+                db = YouTubeDB(str(Path(directory) / f'bench{number}.db'))
+            db.db.executemany('INSERT INTO channels (id, name, url) VALUES (?, ?, ?)',
+                              [(f'channel{i}', f'Channel {i}', f'https://www.youtube.com/@channel{i}')
+                               for i in range(CHANNELS)])
+            db.db.commit()
+            timings = []
+            for rows in (inserts, updates):
+                started = time.perf_counter()
+                write(db, rows)
+                timings.append(time.perf_counter() - started)
+            db.db.close()
+            print(f"  {name:<36} insert {timings[0]:7.3f}s   update {timings[1]:7.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+from playwright.async_api import async_playwright, Playwright, BrowserContext, Page
+import asyncio
+import time
+from pathlib import Path
+
+from .base_scraper import (
+    BROWSER_ARGS,
+    COUNT_ITEMS_JS,
+    FIXED_SCROLL_WAIT,
+    ITEMS_GREW_JS,
+    SCROLL_ITEM_SELECTOR,
+    SCROLL_TO_BOTTOM_JS,
+    BaseScraper,
+)
+from .request_blocking import DEFAULT_BLOCK_SPEC, RequestBlocker
+
+
+class AsyncBaseScraper:
+    """asyncio counterpart of BaseScraper with the same setup/check_login/scroll/cleanup lifecycle.
+
+    Subclasses implement ``async def scrape()`` and can run several pages of the shared
+    persistent context concurrently instead of blocking on each navigation.
+    """
+    _browser: BrowserContext | None
+    _page: Page | None
+    _playwright: Playwright | None
+
+    def __init__(
+        self,
+        debug: bool = False,
+        adaptive_waits: bool = True,
+        scroll_timeout: float = 5.0,
+        blocker: RequestBlocker | None = None,
+    ):
+        self._browser = None
+        self._page = None
+        self.chrome_profile_dir: Path = BaseScraper._resolve_chrome_profile_dir()
+        self._playwright = None
+        self.headless = not debug  # Start in non-headless mode if debug=True
+        self.adaptive_waits = adaptive_waits
+        self.scroll_timeout = scroll_timeout  # Ceiling for adaptive scroll waits, in seconds
+        self.wait_stats = {'adaptive_scrolls': 0, 'fallback_scrolls': 0, 'seconds_saved': 0.0}
+        self.blocker = blocker if blocker is not None else RequestBlocker.from_spec(DEFAULT_BLOCK_SPEC)
+
+    @property
+    def playwright(self) -> Playwright:
+        if self._playwright is None:
+            raise RuntimeError("Playwright not initialized. Call setup() first.")
+        return self._playwright
+
+    @property
+    def browser(self) -> BrowserContext:
+        if self._browser is None:
+            raise RuntimeError("Browser not initialized. Call setup() first.")
+        return self._browser
+
+    @property
+    def page(self) -> Page:
+        if self._page is None:
+            raise RuntimeError("Page not initialized. Call setup() first.")
+        return self._page
+
+    async def setup(self):
+        """Initialize browser with a persistent Chrome profile"""
+        self.chrome_profile_dir.mkdir(exist_ok=True)
+        print(f"Using Chrome profile at: {self.chrome_profile_dir.absolute()}")
+
+        self._playwright = await async_playwright().start()
+        await self._launch_browser()
+
+    async def _launch_browser(self):
+        """Launch browser with current headless setting"""
+        if self._browser:
+            await self._browser.close()
+
+        self._browser = await self.playwright.chromium.launch_persistent_context(
+            user_data_dir=str(self.chrome_profile_dir),
+            channel="chrome",  # Use installed Chrome instead of Chromium
+            headless=self.headless,
+            args=BROWSER_ARGS
+        )
+        if self.headless and self.blocker:
+            await self.browser.route('**/*', self.blocker.handle_route_async)
+        self._page = await self.browser.new_page()
+
+    async def is_logged_in(self):
+        """Check if we're already logged into YouTube"""
+        try:
+            print("Checking YouTube login status...")
+            await self.page.goto('https://www.youtube.com')
+            await self.wait_for_page_load(2)
+
+            sign_in_button = await self.page.query_selector('a[aria-label="Sign in"], ytd-button-renderer:has-text("Sign in")')
+            if sign_in_button:
+                print("Found sign-in button - not logged in")
+                return False
+
+            print("Checking subscriptions access...")
+            await self.page.goto('https://www.youtube.com/feed/subscriptions')
+            await self.wait_for_page_load(2)
+
+            if 'accounts.google.com' in self.page.url or 'signin' in self.page.url:
+                print("Redirected to login page - not logged in")
+                return False
+
+            feed = await self.page.query_selector('#contents ytd-rich-item-renderer, #contents ytd-grid-video-renderer')
+            if not feed:
+                print("No subscription feed found - not logged in")
+                return False
+
+            sign_in_promo = await self.page.query_selector('ytd-guide-signin-promo-renderer')
+            if sign_in_promo:
+                print("Found sign-in promo - not logged in")
+                return False
+
+            print("Successfully verified login!")
+            return True
+
+        except Exception as e:
+            print(f"Error checking login status: {e}")
+            return False
+
+    async def check_login(self):
+        """Prompt for manual login only if needed"""
+        if await self.is_logged_in():
+            return True
+
+        if self.headless:
+            print("\nNot logged in. Switching to non-headless mode for login...")
+            self.headless = False
+            await self._launch_browser()
+
+            if await self.is_logged_in():
+                return True
+
+        print("\nPlease log in to YouTube in the browser window.")
+        print("After logging in, press Enter to continue...")
+        await asyncio.to_thread(input)
+
+        for _ in range(3):  # Try up to 3 times
+            if await self.is_logged_in():
+                if not self.headless:
+                    print("\nLogin successful. Switching back to headless mode...")
+                    self.headless = True
+                    await self._launch_browser()
+                return True
+            print("Login verification failed, waiting a bit longer...")
+            await self.wait_for_page_load(2)
+
+        return False
+
+    async def wait_for_page_load(self, seconds=2):
+        """Wait for page to load without blocking other tasks"""
+        if not self.adaptive_waits or self._page is None:
+            await asyncio.sleep(seconds)
+            return
+
+        started = time.monotonic()
+        try:
+            await self._page.wait_for_load_state('networkidle', timeout=seconds * 1000)
+        except Exception:
+            remaining = seconds - (time.monotonic() - started)
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+            return
+        self.wait_stats['seconds_saved'] += max(0.0, seconds - (time.monotonic() - started))
+
+    async def scroll_page(self, page: Page | None = None):
+        """Scroll the page to the bottom and wait for new content"""
+        page = page or self.page
+        if self.adaptive_waits:
+            started = time.monotonic()
+            try:
+                before = await page.evaluate(COUNT_ITEMS_JS, SCROLL_ITEM_SELECTOR)
+                await page.evaluate(SCROLL_TO_BOTTOM_JS)
+                await page.wait_for_function(
+                    ITEMS_GREW_JS,
+                    arg=[SCROLL_ITEM_SELECTOR, before],
+                    timeout=self.scroll_timeout * 1000,
+                )
+                self.wait_stats['adaptive_scrolls'] += 1
+                self.wait_stats['seconds_saved'] += max(0.0, FIXED_SCROLL_WAIT - (time.monotonic() - started))
+                return
+            except Exception:
+                self.wait_stats['fallback_scrolls'] += 1
+                self.wait_stats['seconds_saved'] -= time.monotonic() - started
+
+        try:
+            await page.wait_for_load_state('networkidle', timeout=5000)
+            await page.evaluate(SCROLL_TO_BOTTOM_JS)
+            await asyncio.sleep(FIXED_SCROLL_WAIT)
+            await page.wait_for_selector('#contents', timeout=5000)
+        except Exception as e:
+            print(f"Warning: Scroll failed ({str(e)})")
+            await asyncio.sleep(FIXED_SCROLL_WAIT)
+
+    async def cleanup(self):
+        """Clean up resources"""
+        print("\nCleaning up...")
+        for closer in (self._page, self._browser):
+            if closer:
+                try:
+                    await closer.close()
+                except Exception:
+                    pass
+        if self._playwright:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+        self._page = None
+        self._browser = None
+        self._playwright = None
+        print("Cleanup complete")
+
+    async def run_async(self):
+        """Run the scraper with proper setup and cleanup"""
+        try:
+            await self.setup()
+            if not await self.check_login():
+                print("\nFailed to verify login after multiple attempts. Please try again.")
+                return
+            await self.scrape()
+        except asyncio.CancelledError:
+            print("\nInterrupt received, cleaning up...")
+        except Exception as e:
+            print(f"\nError during scraping: {e}")
+        finally:
+            if self.blocker.stats['blocked']:
+                print(f"\n{self.blocker.summary()}")
+            await self.cleanup()
+
+    def run(self):
+        """Blocking entry point matching BaseScraper.run()"""
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            print("\nInterrupt received, cleaning up...")
+
+    async def scrape(self):
+        """Override this method in child classes to implement specific scraping logic"""
+        raise NotImplementedError("Subclasses must implement scrape()")
@@ -6,18 +6,53 @@ from pathlib import Path
 import atexit
 import signal
 
+from .request_blocking import DEFAULT_BLOCK_SPEC, RequestBlocker
+
+
+# Chrome flags shared by the sync and async engines
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--no-sandbox',
+    '--disable-web-security',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--password-store=basic'
+]
+
+# Adaptive scrolling waits for the number of items under #contents to grow
+# instead of sleeping for a fixed interval after every scroll.
+SCROLL_ITEM_SELECTOR = '#contents > *'
+FIXED_SCROLL_WAIT = 2  # seconds the legacy scroll path sleeps for new content
+COUNT_ITEMS_JS = '(selector) => document.querySelectorAll(selector).length'
+ITEMS_GREW_JS = '([selector, before]) => document.querySelectorAll(selector).length > before'
+SCROLL_TO_BOTTOM_JS = '''() => {
+    window.scrollTo(0, document.documentElement.scrollHeight);
+    return document.documentElement.scrollHeight;
+}'''
+
 
 class BaseScraper:
     _browser: BrowserContext | None
     _page: Page | None
     _playwright: Playwright | None
 
-    def __init__(self, debug: bool = False):
+    def __init__(
+        self,
+        debug: bool = False,
+        adaptive_waits: bool = True,
+        scroll_timeout: float = 5.0,
+        blocker: RequestBlocker | None = None,
+    ):
         self._browser = None
         self._page = None
         self.chrome_profile_dir = self._resolve_chrome_profile_dir()
         self._playwright = None
         self.headless = not debug  # Start in non-headless mode if debug=True
+        self.adaptive_waits = adaptive_waits
+        self.scroll_timeout = scroll_timeout  # Ceiling for adaptive scroll waits, in seconds
+        self.wait_stats = {'adaptive_scrolls': 0, 'fallback_scrolls': 0, 'seconds_saved': 0.0}
+        # Only applied to headless launches, so the interactive login window renders normally
+        self.blocker = blocker if blocker is not None else RequestBlocker.from_spec(DEFAULT_BLOCK_SPEC)
         # Register cleanup on exit
         atexit.register(self.cleanup)
 
@@ -66,15 +101,10 @@ class BaseScraper:
             user_data_dir=str(self.chrome_profile_dir),
             channel="chrome",  # Use installed Chrome instead of Chromium
             headless=self.headless,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--no-sandbox',
-                '--disable-web-security',
-                '--no-first-run',
-                '--no-default-browser-check',
-                '--password-store=basic'
-            ]
+            args=BROWSER_ARGS
         )
+        if self.headless and self.blocker:
+            self.browser.route('**/*', self.blocker.handle_route)  # Context-wide: covers worker pages too
         self._page = self.browser.new_page()
 
     def is_logged_in(self):
@@ -154,39 +184,74 @@ class BaseScraper:
         return False
 
     def wait_for_page_load(self, seconds=2):
-        """Wait for page to load"""
-        time.sleep(seconds)
+        """Wait for page to load, returning early once the network settles when adaptive waits are on"""
+        if not self.adaptive_waits or self._page is None:
+            time.sleep(seconds)
+            return
+
+        started = time.monotonic()
+        try:
+            self._page.wait_for_load_state('networkidle', timeout=seconds * 1000)
+        except Exception:
+            # Timed out or the page is unusable - never wait longer than the fixed sleep would
+            remaining = seconds - (time.monotonic() - started)
+            if remaining > 0:
+                time.sleep(remaining)
+            return
+        self.wait_stats['seconds_saved'] += max(0.0, seconds - (time.monotonic() - started))
 
     def scroll_page(self, amount='window.innerHeight'):
         """Scroll the page by specified amount"""
+        if self.adaptive_waits:
+            started = time.monotonic()
+            if self._scroll_until_content_grows():
+                self.wait_stats['adaptive_scrolls'] += 1
+                self.wait_stats['seconds_saved'] += max(0.0, FIXED_SCROLL_WAIT - (time.monotonic() - started))
+                return
+            # Timed out waiting for new items: the adaptive attempt was pure overhead
+            self.wait_stats['fallback_scrolls'] += 1
+            self.wait_stats['seconds_saved'] -= time.monotonic() - started
+
+        self._scroll_with_fixed_waits()
+
+    def _scroll_until_content_grows(self):
+        """Scroll to the bottom and wait until more items render under #contents"""
+        try:
+            before = self.page.evaluate(COUNT_ITEMS_JS, SCROLL_ITEM_SELECTOR)
+            self.page.evaluate(SCROLL_TO_BOTTOM_JS)
+            self.page.wait_for_function(
+                ITEMS_GREW_JS,
+                arg=[SCROLL_ITEM_SELECTOR, before],
+                timeout=self.scroll_timeout * 1000,
+            )
+            return True
+        except Exception:
+            return False
+
+    def _scroll_with_fixed_waits(self):
+        """Legacy scroll: wait for network idle, scroll, then sleep for new content"""
         try:
             # First verify the page is still in a good state
             self.page.wait_for_load_state('networkidle', timeout=5000)
             
             # First scroll attempt
             try:
-                self.page.evaluate('''() => {
-                    window.scrollTo(0, document.documentElement.scrollHeight);
-                    return document.documentElement.scrollHeight;
-                }''')
+                self.page.evaluate(SCROLL_TO_BOTTOM_JS)
             except Exception as e:
                 print(f"First scroll attempt failed ({str(e)}), trying again...")
-                self.wait_for_page_load(2)
+                time.sleep(FIXED_SCROLL_WAIT)
                 # Second scroll attempt
-                self.page.evaluate('''() => {
-                    window.scrollTo(0, document.documentElement.scrollHeight);
-                    return document.documentElement.scrollHeight;
-                }''')
+                self.page.evaluate(SCROLL_TO_BOTTOM_JS)
             
             # Wait for new content
-            self.wait_for_page_load(2)
+            time.sleep(FIXED_SCROLL_WAIT)
             
             # Verify page is still responsive
             self.page.wait_for_selector('#contents', timeout=5000)
             
         except Exception as e:
             print(f"Warning: Both scroll attempts failed ({str(e)})")
-            self.wait_for_page_load(2)
+            time.sleep(FIXED_SCROLL_WAIT)
 
     def cleanup(self):
         """Clean up resources"""
@@ -236,6 +301,8 @@ class BaseScraper:
         except Exception as e:
             print(f"\nError during scraping: {e}")
         finally:
+            if self.blocker.stats['blocked']:
+                print(f"\n{self.blocker.summary()}")
             self.cleanup()
 
     def scrape(self):
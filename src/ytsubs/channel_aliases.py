@@ -0,0 +1,202 @@
+"""
+Unified channel identity.
+
+The same channel reaches the database under several names: scrape-channels
+keys rows by @handle, feed cards carry a handle or a UC id depending on the
+layout, and oEmbed answers with either. ``channel_aliases`` maps every known
+spelling (UC id, lower-cased handle, /c/ or /user/ custom URL) to the
+canonical ``channels.id``, and ``ChannelIndex`` serves those lookups from
+memory for the length of a run.
+"""
+
+import re
+import sqlite3
+from urllib.parse import unquote, urlparse
+
+CHANNEL_ALIASES_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS channel_aliases (
+    alias TEXT PRIMARY KEY,
+    channel_id TEXT NOT NULL,
+    kind TEXT NOT NULL  -- 'id', 'handle' or 'custom_url'
+);
+
+CREATE INDEX IF NOT EXISTS idx_channel_aliases_channel_id ON channel_aliases(channel_id);
+CREATE INDEX IF NOT EXISTS idx_channels_handle ON channels(handle);
+CREATE INDEX IF NOT EXISTS idx_channels_youtube_id ON channels(youtube_id);
+'''
+
+UC_ID = re.compile(r'^UC[\w-]{22}$')
+_URL_PATTERNS = (
+    (re.compile(r'^/channel/([\w-]+)'), 'id'),
+    (re.compile(r'^/@([^/?#]+)'), 'handle'),
+    (re.compile(r'^/(?:c|user)/([^/?#]+)'), 'custom_url'),
+)
+
+# Columns filled from a duplicate when the surviving row lacks them
+_MERGE_FILL_COLUMNS = ('youtube_id', 'handle', 'description', 'thumbnail_url')
+
+
+def alias_key(value: str | None) -> tuple[str, str] | None:
+    """(alias, kind) for a channel URL, @handle, bare handle or UC id; None if unusable"""
+    if not value or not value.strip():
+        return None
+    value = value.strip()
+    if '/' in value:
+        path = urlparse(value).path if '://' in value else value
+        for pattern, kind in _URL_PATTERNS:
+            match = pattern.match(path)
+            if match:
+                return _key(unquote(match.group(1)), kind)
+        return None
+    if value.startswith('@'):
+        return _key(value[1:], 'handle')
+    return _key(value, 'id' if UC_ID.match(value) else 'handle')
+
+
+def _key(name: str, kind: str) -> tuple[str, str] | None:
+    if not name:
+        return None
+    if kind == 'id':
+        return name, kind
+    if kind == 'handle':
+        return f'@{name.lower()}', kind  # Handles are case-insensitive
+    return f'c/{name.lower()}', kind
+
+
+def channel_aliases(row) -> list[tuple[str, str]]:
+    """Every alias a channels row is known by"""
+    keys = []
+    for value in (row['id'], row['youtube_id'], row['handle'], row['url']):
+        key = alias_key(value)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def record_channel_aliases(conn: sqlite3.Connection, channel_id: str, *identifiers: str | None) -> None:
+    """Point the aliases of ``identifiers`` (and of the id itself) at ``channel_id``"""
+    rows = []
+    for value in (channel_id, *identifiers):
+        key = alias_key(value)
+        if key:
+            rows.append((key[0], channel_id, key[1]))
+    conn.executemany('''
+        INSERT INTO channel_aliases (alias, channel_id, kind) VALUES (?, ?, ?)
+        ON CONFLICT(alias) DO UPDATE SET channel_id = excluded.channel_id, kind = excluded.kind
+    ''', rows)
+
+
+def resolve_channel_id(conn: sqlite3.Connection, *identifiers: str | None) -> str | None:
+    """Canonical id of the first identifier with a known alias (single lookup, no index load)"""
+    for value in identifiers:
+        key = alias_key(value)
+        if key:
+            row = conn.execute('SELECT channel_id FROM channel_aliases WHERE alias = ?', (key[0],)).fetchone()
+            if row:
+                return row[0]
+    return None
+
+
+class ChannelIndex:
+    """In-memory alias -> canonical channel id map, loaded once per run"""
+
+    def __init__(self, aliases: dict[str, str]):
+        self.aliases = aliases
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection) -> 'ChannelIndex':
+        # Channels written without going through record_channel_aliases still resolve by their own columns
+        aliases: dict[str, str] = {}
+        for row in conn.execute('SELECT id, youtube_id, handle, url FROM channels'):
+            for alias, _ in channel_aliases(row):
+                aliases.setdefault(alias, row['id'])
+        for alias, channel_id in conn.execute('SELECT alias, channel_id FROM channel_aliases'):
+            aliases[alias] = channel_id
+        return cls(aliases)
+
+    def resolve(self, *identifiers: str | None) -> str | None:
+        """Canonical id of the first identifier that maps to a tracked channel"""
+        for value in identifiers:
+            key = alias_key(value)
+            if key and key[0] in self.aliases:
+                return self.aliases[key[0]]
+        return None
+
+    def __len__(self) -> int:
+        return len(set(self.aliases.values()))
+
+
+def _duplicate_groups(rows) -> list[list]:
+    """Channels rows grouped by shared aliases (union-find over alias keys)"""
+    parent = list(range(len(rows)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner = {}
+    for i, row in enumerate(rows):
+        for alias, _ in channel_aliases(row):
+            if alias in owner:
+                parent[find(i)] = find(owner[alias])
+            else:
+                owner[alias] = i
+
+    groups = {}
+    for i, row in enumerate(rows):
+        groups.setdefault(find(i), []).append(row)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def merge_duplicate_channels(conn: sqlite3.Connection) -> list[tuple[str, list[str]]]:
+    """Fold channels rows that share an alias into one; returns (kept id, merged ids) per group.
+
+    The most recently crawled row survives (then the one with the most videos),
+    takes over the videos of the others and fills its empty columns from them.
+    """
+    rows = conn.execute('''
+        SELECT c.*, (SELECT COUNT(*) FROM videos v WHERE v.channel_id = c.id) AS video_count
+        FROM channels c
+    ''').fetchall()
+    merged = []
+    with conn:
+        for group in _duplicate_groups(rows):
+            group.sort(key=lambda row: (row['last_updated'] or '', row['video_count'], row['id']), reverse=True)
+            keep, duplicates = group[0], group[1:]
+            duplicate_ids = [row['id'] for row in duplicates]
+            placeholders = ', '.join('?' for _ in duplicate_ids)
+
+            for column in _MERGE_FILL_COLUMNS:
+                if keep[column]:
+                    continue
+                value = next((row[column] for row in duplicates if row[column]), None)
+                if value:
+                    conn.execute(f'UPDATE channels SET {column} = ? WHERE id = ?', (value, keep['id']))
+
+            conn.execute(f'UPDATE videos SET channel_id = ? WHERE channel_id IN ({placeholders})', [keep['id'], *duplicate_ids])
+            conn.execute(f'DELETE FROM channels WHERE id IN ({placeholders})', duplicate_ids)
+            merged.append((keep['id'], duplicate_ids))
+    return merged
+
+
+def rebuild_channel_aliases(conn: sqlite3.Connection) -> None:
+    """Recreate every alias from the channels table"""
+    with conn:
+        conn.execute('DELETE FROM channel_aliases')
+        for row in conn.execute('SELECT id, youtube_id, handle, url FROM channels').fetchall():
+            record_channel_aliases(conn, row['id'], row['youtube_id'], row['handle'], row['url'])
+
+
+def ensure_channel_aliases(conn: sqlite3.Connection) -> list[tuple[str, list[str]]]:
+    """Create the alias table; on first creation merge existing duplicates and index every channel"""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'channel_aliases'"
+    ).fetchone()
+    conn.executescript(CHANNEL_ALIASES_SCHEMA)
+    if exists:
+        return []
+    merged = merge_duplicate_channels(conn)
+    rebuild_channel_aliases(conn)
+    return merged
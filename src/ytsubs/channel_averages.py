@@ -0,0 +1,77 @@
+"""
+Channel average views, from a crawl of the channel page or from stored videos.
+
+Both sources go through the same outlier-trimmed average, so a channel's
+``average_views`` means the same thing whichever filled it. ``videos`` keeps
+30 days of subscription-feed uploads with their latest view counts; channels
+with enough uploads whose views were last read at least a week after release
+(so they have mostly settled) get their average from those and skip the page crawl.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+CHANNEL_SAMPLE_SIZE = 30  # Newest videos averaged per channel
+HISTORY_MIN_AGE = timedelta(days=7)
+HISTORY_MIN_SAMPLES = 10  # Fewer stored videos than this and the channel page is crawled
+
+SOURCE_CRAWL = 'crawl'
+SOURCE_HISTORY = 'history'
+
+
+@dataclass(frozen=True)
+class ViewAverage:
+    average: int
+    samples: int  # View counts the average was computed from, before trimming
+    outliers: int = 0
+    trimmed: int = 0  # Removed from each end for the trimmed mean
+
+
+NO_VIEWS = ViewAverage(0, 0)
+
+
+def trimmed_average(views) -> ViewAverage:
+    """Average with IQR outliers (beyond 2.5 * IQR, 10+ samples) and the top and bottom 10% removed"""
+    views = sorted(views)
+    samples = len(views)
+    outliers = 0
+    if samples >= 10:  # Only remove outliers if we have enough videos
+        q1 = views[samples // 4]
+        q3 = views[3 * samples // 4]
+        iqr = q3 - q1
+        lower_bound = max(0, q1 - 2.5 * iqr)
+        upper_bound = q3 + 2.5 * iqr
+        views = [v for v in views if lower_bound <= v <= upper_bound]
+        outliers = samples - len(views)
+
+    if not views:
+        return NO_VIEWS
+    if len(views) >= 5:
+        trim = max(1, len(views) // 10)
+        kept = views[trim:-trim]
+        return ViewAverage(int(sum(kept) / len(kept)), samples, outliers, trim)
+    return ViewAverage(int(sum(views) / len(views)), samples, outliers)
+
+
+def load_history_views(conn: sqlite3.Connection, now: datetime | None = None) -> dict[str, list[int]]:
+    """Newest CHANNEL_SAMPLE_SIZE matured view counts per stored channel id, in one pass over the videos index.
+
+    A view count has matured when it was read at least HISTORY_MIN_AGE after publication;
+    a video last scraped the day it came out keeps its first-day views however old it is.
+    """
+    # Naive local time, like the dates scrape-videos stores
+    cutoff = ((now or datetime.now()) - HISTORY_MIN_AGE).isoformat()
+    history: dict[str, list[int]] = {}
+    for channel_id, views in conn.execute('''
+        SELECT channel_id, views FROM (
+            SELECT channel_id, views,
+                   ROW_NUMBER() OVER (PARTITION BY channel_id ORDER BY published_date DESC) AS n
+            FROM videos
+            WHERE published_date < ? AND views > 0
+              AND julianday(views_updated) - julianday(published_date) >= ?
+        )
+        WHERE n <= ?
+    ''', (cutoff, HISTORY_MIN_AGE / timedelta(days=1), CHANNEL_SAMPLE_SIZE)):
+        history.setdefault(channel_id, []).append(views)
+    return history
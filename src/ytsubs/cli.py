@@ -1,8 +1,37 @@
 from __future__ import annotations
 
 import argparse
+from pathlib import Path
 
 from . import generate_feed, scrape_channel_stats, scrape_videos
+from .refresh_schedule import parse_budget
+from .request_blocking import DEFAULT_BLOCK_SPEC, RequestBlocker
+
+
+def _budget(text: str) -> float:
+    try:
+        return parse_budget(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def _block_spec(text: str) -> str:
+    try:
+        RequestBlocker.from_spec(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+    return text
+
+
+def _add_block_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--block",
+        type=_block_spec,
+        default=DEFAULT_BLOCK_SPEC,
+        metavar="LIST",
+        help="Requests headless pages skip: comma-separated resource types (image, media, font, stylesheet), "
+        "'ads' for ad and analytics hosts, host names, or 'none' (default: %(default)s).",
+    )
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -26,6 +55,36 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Skip generating the feed after scraping.",
     )
+    scrape_videos_parser.add_argument(
+        "--fixed-waits",
+        action="store_true",
+        help="Sleep a fixed interval after each scroll instead of waiting for new items.",
+    )
+    scrape_videos_parser.add_argument(
+        "--scroll-timeout",
+        type=float,
+        default=5.0,
+        help="Maximum seconds to wait for new feed items after a scroll.",
+    )
+    scrape_videos_parser.add_argument(
+        "--source",
+        choices=["dom", "network"],
+        default="dom",
+        help="Read feed items from rendered cards or from YouTube's browse JSON responses.",
+    )
+    scrape_videos_parser.add_argument(
+        "--oembed-workers",
+        type=int,
+        default=scrape_videos.DEFAULT_WORKERS,
+        help="Concurrent oEmbed lookups for videos whose card lacks a channel.",
+    )
+    scrape_videos_parser.add_argument(
+        "--oembed-rate",
+        type=float,
+        default=scrape_videos.DEFAULT_RATE,
+        help="Maximum oEmbed requests per second across workers (0 for no limit).",
+    )
+    _add_block_argument(scrape_videos_parser)
     scrape_videos_parser.set_defaults(func=_run_scrape_videos)
 
     scrape_channels_parser = subparsers.add_parser(
@@ -37,14 +96,151 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Run in non-headless mode.",
     )
+    scrape_channels_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of channels crawled concurrently (with JSON averages this selects the async engine).",
+    )
+    scrape_channels_parser.add_argument(
+        "--engine",
+        choices=["sync", "async"],
+        default="sync",
+        help="Playwright engine used for crawling (async overlaps page loads).",
+    )
+    scrape_channels_parser.add_argument(
+        "--averages",
+        choices=["json", "dom"],
+        default="json",
+        help="Read channel view counts from the page's embedded JSON without rendering it, or from the rendered /videos grid.",
+    )
+    scrape_channels_parser.add_argument(
+        "--max-channels",
+        type=int,
+        help="Crawl at most this many channels, most overdue first.",
+    )
+    scrape_channels_parser.add_argument(
+        "--budget",
+        type=_budget,
+        help="Stop starting new channel crawls after this long (e.g. 10m, 90s, 1h30m).",
+    )
+    scrape_channels_parser.add_argument(
+        "--all",
+        dest="refresh_all",
+        action="store_true",
+        help="Also crawl channels whose stats are still fresh.",
+    )
+    scrape_channels_parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Always crawl channel pages instead of averaging channels with enough stored videos.",
+    )
+    _add_block_argument(scrape_channels_parser)
     scrape_channels_parser.set_defaults(func=_run_scrape_channels)
 
+    feed_parser = subparsers.add_parser(
+        "feed",
+        help="Rank stored videos and regenerate the feed page.",
+    )
+    feed_parser.add_argument(
+        "--profile",
+        dest="profiles",
+        action="append",
+        metavar="NAME",
+        help="Ranking profile to use; repeat to add switchable profiles to the page (first one is the default view).",
+    )
+    feed_parser.add_argument(
+        "--profiles-file",
+        type=Path,
+        help="TOML file with extra ranking profiles (default: profiles.toml in the state directory).",
+    )
+    feed_parser.add_argument(
+        "--list-profiles",
+        action="store_true",
+        help="List available ranking profiles and exit.",
+    )
+    feed_parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Gzip the embedded video data (smaller files; the page inflates it on load).",
+    )
+    feed_parser.add_argument(
+        "--no-open",
+        action="store_true",
+        help="Write the feed without opening it in a browser.",
+    )
+    feed_parser.set_defaults(func=_run_feed)
+
     open_feed_parser = subparsers.add_parser(
         "open",
         help="Open the latest generated feed.",
     )
     open_feed_parser.set_defaults(func=_run_open_feed)
 
+    db_parser = subparsers.add_parser(
+        "db",
+        help="Database maintenance commands.",
+    )
+    db_subparsers = db_parser.add_subparsers(dest="db_command", required=True)
+    db_tune_parser = db_subparsers.add_parser(
+        "tune",
+        help="Apply the SQLite tuning pragmas and report current settings.",
+    )
+    db_tune_parser.set_defaults(func=_run_db_tune)
+    db_check_scores_parser = db_subparsers.add_parser(
+        "check-scores",
+        help="Compare incrementally maintained scores against a full recompute.",
+    )
+    db_check_scores_parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Recompute every stored score before checking.",
+    )
+    db_check_scores_parser.set_defaults(func=_run_db_check_scores)
+    db_migrate_parser = db_subparsers.add_parser(
+        "migrate",
+        help="Apply pending schema migrations and check the hot queries use their indexes.",
+    )
+    db_migrate_parser.set_defaults(func=_run_db_migrate)
+    db_merge_channels_parser = db_subparsers.add_parser(
+        "merge-channels",
+        help="Merge channel records stored under both a handle and a UC id, and rebuild the alias index.",
+    )
+    db_merge_channels_parser.set_defaults(func=_run_db_merge_channels)
+
+    thumbs_parser = subparsers.add_parser(
+        "thumbs",
+        help="Local thumbnail cache commands.",
+    )
+    thumbs_subparsers = thumbs_parser.add_subparsers(dest="thumbs_command", required=True)
+    thumbs_sync_parser = thumbs_subparsers.add_parser(
+        "sync",
+        help="Download thumbnails of recent videos so the feed loads them from disk.",
+    )
+    thumbs_sync_parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Number of concurrent downloads.",
+    )
+    thumbs_sync_parser.add_argument(
+        "--max-mb",
+        type=float,
+        default=200,
+        help="Size budget for the cache; least recently used thumbnails are evicted beyond it.",
+    )
+    thumbs_sync_parser.add_argument(
+        "--days",
+        type=int,
+        default=30,
+        help="Cache thumbnails of videos published within this many days.",
+    )
+    thumbs_sync_parser.add_argument(
+        "--image-host",
+        help="Fetch from this base URL instead of https://i.ytimg.com (e.g. a local stand-in).",
+    )
+    thumbs_sync_parser.set_defaults(func=_run_thumbs_sync)
+
     debug_scrape_parser = subparsers.add_parser(
         "debug-scrape",
         help="Debug the subscriptions feed scraper.",
@@ -74,12 +270,56 @@ def _run_scrape_videos(args: argparse.Namespace) -> int:
     scrape_videos.run(
         debug=args.debug,
         generate_feed_after=not args.no_generate_feed,
+        adaptive_waits=not args.fixed_waits,
+        scroll_timeout=args.scroll_timeout,
+        source=args.source,
+        oembed_workers=args.oembed_workers,
+        oembed_rate=args.oembed_rate,
+        block=args.block,
     )
     return 0
 
 
 def _run_scrape_channels(args: argparse.Namespace) -> int:
-    scrape_channel_stats.run(debug=args.debug)
+    scrape_channel_stats.run(
+        debug=args.debug,
+        workers=args.workers,
+        engine=args.engine,
+        averages=args.averages,
+        max_channels=args.max_channels,
+        budget=args.budget,
+        refresh_all=args.refresh_all,
+        history=not args.no_history,
+        block=args.block,
+    )
+    return 0
+
+
+def _run_feed(args: argparse.Namespace) -> int:
+    from . import profiles
+
+    try:
+        available = profiles.load_profiles(args.profiles_file)
+    except (OSError, ValueError) as e:
+        print(f"Error loading ranking profiles: {e}")
+        return 1
+
+    if args.list_profiles:
+        for name, profile in available.items():
+            print(f"{name:16} {profile.description}")
+        return 0
+
+    names = args.profiles or ["default"]
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        print(f"Unknown ranking profile: {', '.join(unknown)} (available: {', '.join(available)})")
+        return 1
+
+    generate_feed.run(
+        open_browser=not args.no_open,
+        compress=args.compress,
+        profiles=[available[name] for name in dict.fromkeys(names)],
+    )
     return 0
 
 
@@ -88,6 +328,44 @@ def _run_open_feed(args: argparse.Namespace) -> int:
     return 0 if opened else 1
 
 
+def _run_db_tune(args: argparse.Namespace) -> int:
+    from . import db_schema
+
+    db_schema.tune()
+    return 0
+
+
+def _run_db_check_scores(args: argparse.Namespace) -> int:
+    if args.rebuild:
+        generate_feed.rebuild_scores()
+    return 0 if generate_feed.check_scores() else 1
+
+
+def _run_db_migrate(args: argparse.Namespace) -> int:
+    from . import db_schema
+
+    return 0 if db_schema.migrate_database() else 1
+
+
+def _run_db_merge_channels(args: argparse.Namespace) -> int:
+    from . import db_schema
+
+    db_schema.merge_channels()
+    return 0
+
+
+def _run_thumbs_sync(args: argparse.Namespace) -> int:
+    from . import thumbnails
+
+    synced = thumbnails.run(
+        workers=args.workers,
+        max_mb=args.max_mb,
+        recent_days=args.days,
+        image_host=args.image_host,
+    )
+    return 0 if synced else 1
+
+
 def _run_debug_scrape(args: argparse.Namespace) -> int:
     from . import debug_scrape
 
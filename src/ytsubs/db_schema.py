@@ -1,8 +1,51 @@
 import os
 import sqlite3
-from importlib import resources
+from datetime import datetime
 from pathlib import Path
 
+from .channel_aliases import (
+    ChannelIndex,
+    ensure_channel_aliases,
+    merge_duplicate_channels,
+    rebuild_channel_aliases,
+    record_channel_aliases,
+    resolve_channel_id,
+)
+from .migrations import SCHEMA_VERSION, check_query_plans, migrate, schema_version
+
+# Applied to every connection. WAL lets feed generation read while a scrape is
+# writing, and synchronous=NORMAL drops the per-commit fsync of the rollback journal.
+CONNECTION_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('cache_size', -32000),  # Negative means KiB: ~32 MB page cache
+    ('mmap_size', 256 * 1024 * 1024),
+    ('temp_store', 'MEMORY'),
+    ('busy_timeout', 5000),  # ms to wait on a competing writer instead of failing
+)
+
+
+def connect(db_path: str | Path | None = None) -> sqlite3.Connection:
+    """Open a tuned connection to the ytsubs database; every module should use this"""
+    conn = sqlite3.connect(resolve_db_path(db_path))
+    conn.row_factory = sqlite3.Row
+    for name, value in CONNECTION_PRAGMAS:
+        conn.execute(f'PRAGMA {name} = {value}')
+    return conn
+
+
+def tuning_report(conn: sqlite3.Connection) -> list[tuple[str, object]]:
+    """Current values of the tuned pragmas plus a few size indicators"""
+    names = [name for name, _ in CONNECTION_PRAGMAS] + [
+        'page_size', 'page_count', 'freelist_count', 'wal_autocheckpoint'
+    ]
+    report = []
+    for name in names:
+        row = conn.execute(f'PRAGMA {name}').fetchone()
+        report.append((name, row[0] if row else None))
+    return report
+
+
 class YouTubeDB:
     db: sqlite3.Connection
 
@@ -11,29 +54,10 @@ class YouTubeDB:
         self.setup_database()
     
     def setup_database(self):
-        """Initialize SQLite database for caching"""
-        self.db = sqlite3.connect(self.db_path)
-        self.db.row_factory = sqlite3.Row
-        cursor = self.db.cursor()
-        
-        # Check if tables already exist
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' 
-            AND name IN ('videos', 'channels')
-        """)
-        existing_tables = {row[0] for row in cursor.fetchall()}
-        required_tables = {'videos', 'channels'}
-        
-        # Only initialize if tables are missing
-        if not required_tables.issubset(existing_tables):
-            schema_text = (
-                resources.files("ytsubs")
-                .joinpath("schema.sql")
-                .read_text(encoding="utf-8")
-            )
-            cursor.executescript(schema_text)
-            self.db.commit()
+        """Initialize SQLite database for caching, bringing its schema up to date"""
+        self.db = connect(self.db_path)
+        for version, description in migrate(self.db):
+            print(f"Applied database migration {version}: {description}")
 
     def get_last_video_date(self):
         """Get the most recent video date from the database"""
@@ -52,6 +76,67 @@ class YouTubeDB:
         cursor.execute('SELECT id, url FROM channels')
         return cursor.fetchall()
 
+    def get_tracked_channel_ids(self):
+        """Get the set of channel IDs we're tracking"""
+        cursor = self.db.cursor()
+        cursor.execute('SELECT id FROM channels')
+        return {row[0] for row in cursor.fetchall()}
+
+    def get_channel_index(self):
+        """Alias -> canonical channel id map for resolving handles, UC ids and channel URLs"""
+        return ChannelIndex.load(self.db)
+
+    def get_video_ids(self):
+        """Get the set of video IDs already stored"""
+        cursor = self.db.cursor()
+        cursor.execute('SELECT id FROM videos')
+        return {row[0] for row in cursor.fetchall()}
+
+    def upsert_videos(self, rows, observed_at=None):
+        """Insert or update a batch of videos in a single transaction.
+
+        Rows are (id, channel_id, title, url, thumbnail, views, published_date, published_precision,
+        duration, duration_seconds). Existing videos keep their channel_id, matching the old per-video
+        UPDATE, and their published_date unless the new one is more precise (a smaller precision in
+        seconds), so dates re-derived from "N days ago" on every scrape do not drift.
+
+        views_updated is set to observed_at (default now, naive local time like the publish dates),
+        the moment these view counts were read.
+        """
+        if not rows:
+            return
+        views_updated = (observed_at or datetime.now()).isoformat()
+        try:
+            with self.db:
+                self.db.executemany('''
+                    INSERT INTO videos
+                    (id, channel_id, title, url, thumbnail, views, published_date, published_precision, duration, duration_seconds,
+                     views_updated)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        title = excluded.title,
+                        url = excluded.url,
+                        thumbnail = excluded.thumbnail,
+                        views = excluded.views,
+                        views_updated = excluded.views_updated,
+                        published_date = CASE
+                            WHEN videos.published_precision IS NULL
+                                OR excluded.published_precision < videos.published_precision
+                            THEN excluded.published_date
+                            ELSE videos.published_date
+                        END,
+                        published_precision = CASE
+                            WHEN videos.published_precision IS NULL
+                                OR excluded.published_precision < videos.published_precision
+                            THEN excluded.published_precision
+                            ELSE videos.published_precision
+                        END,
+                        duration = excluded.duration,
+                        duration_seconds = excluded.duration_seconds
+                ''', [(*row, views_updated) for row in rows])
+        except sqlite3.Error as e:
+            print(f"Error writing {len(rows)} videos: {e}")
+
     def update_channel_subscriber_count(self, channel_id, sub_count):
         """Update subscriber count for a channel"""
         cursor = self.db.cursor()
@@ -71,33 +156,25 @@ class YouTubeDB:
             channel_url = video_info.get('channel_url', '')
             channel_id = None
             
-            # Try to extract channel ID from URL
-            if '/channel/' in channel_url:
-                channel_id = channel_url.split('/channel/')[1].split('?')[0]
-            elif '@' in channel_url:
-                # For URLs with handles like @username
-                handle = channel_url.split('@')[1].split('/')[0]
-                # Look up channel ID by handle
-                cursor.execute('SELECT id FROM channels WHERE handle = ?', (handle,))
-                result = cursor.fetchone()
-                if result:
-                    channel_id = result[0]
-            
-            if not channel_id:
-                print(f"Could not extract channel ID from URL: {channel_url}")
-                return
-            
-            # First ensure channel exists
-            cursor.execute('SELECT id FROM channels WHERE id = ?', (channel_id,))
-            if not cursor.fetchone():
+            # Known handle, UC id or custom URL: use the canonical id
+            channel_id = resolve_channel_id(self.db, channel_url)
+            if not channel_id and '/channel/' in channel_url:
+                # Unknown channel: add it under its UC id
+                channel_id = channel_url.split('/channel/')[1].split('?')[0].split('/')[0]
                 cursor.execute('''
-                    INSERT INTO channels (id, name, url)
-                    VALUES (?, ?, ?)
+                    INSERT INTO channels (id, youtube_id, name, url)
+                    VALUES (?, ?, ?, ?)
                 ''', (
+                    channel_id,
                     channel_id,
                     video_info.get('channel_name', ''),
                     channel_url
                 ))
+                record_channel_aliases(self.db, channel_id, channel_url)
+            
+            if not channel_id:
+                print(f"Could not extract channel ID from URL: {channel_url}")
+                return
             
             # Extract video ID from URL
             video_url = video_info.get('url', '')
@@ -145,8 +222,65 @@ def resolve_state_dir() -> Path:
     return target
 
 
-def resolve_db_path(db_path: str | None = None) -> Path:
+def resolve_db_path(db_path: str | os.PathLike[str] | None = None) -> Path:
     if db_path:
         return Path(db_path).expanduser()
 
     return resolve_state_dir() / "youtube.db"
+
+
+def tune(db_path: str | None = None) -> None:
+    """Open the database with the tuned settings applied and print what is in effect"""
+    path = resolve_db_path(db_path)
+    conn = connect(path)
+    try:
+        print(f"Database: {path}")
+        print(f"SQLite version: {sqlite3.sqlite_version}")
+        for name, value in tuning_report(conn):
+            print(f"  {name:<20} {value}")
+        wal_path = Path(f"{path}-wal")
+        if wal_path.exists():
+            print(f"  {'wal_file_bytes':<20} {wal_path.stat().st_size}")
+    finally:
+        conn.close()
+
+
+def migrate_database(db_path: str | None = None) -> bool:
+    """Apply pending migrations, then check the hot queries use their indexes"""
+    path = resolve_db_path(db_path)
+    conn = connect(path)
+    try:
+        print(f"Database: {path}")
+        print(f"Schema version: {schema_version(conn)} (latest {SCHEMA_VERSION})")
+        applied = migrate(conn)
+        for version, description in applied:
+            print(f"  applied {version}: {description}")
+        if not applied:
+            print("  up to date")
+        problems = check_query_plans(conn)
+    finally:
+        conn.close()
+
+    if problems:
+        print("Queries not using their indexes:")
+        for problem in problems:
+            print(f"  - {problem}")
+        return False
+    print("All hot queries use their indexes.")
+    return True
+
+
+def merge_channels(db_path: str | None = None) -> None:
+    """Merge channel records that share a handle, UC id or custom URL, then re-index aliases"""
+    path = resolve_db_path(db_path)
+    conn = connect(path)
+    try:
+        ensure_channel_aliases(conn)
+        merged = merge_duplicate_channels(conn)
+        rebuild_channel_aliases(conn)
+        for kept, duplicate_ids in merged:
+            print(f"  {kept} <- {', '.join(duplicate_ids)}")
+        print(f"Merged {sum(len(ids) for _, ids in merged)} duplicate channel records into {len(merged)} channels.")
+        print(f"{len(ChannelIndex.load(conn))} channels indexed.")
+    finally:
+        conn.close()
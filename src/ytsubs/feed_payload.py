@@ -0,0 +1,100 @@
+"""
+Compact encoding of feed videos for the static page.
+
+Videos are written column by column instead of as one object each: channels
+go into a small table referenced by index, and every per-video field becomes
+a parallel array. ``decodeFeed`` in static_template.html turns a payload back
+into the video objects ``generate_feed.iter_videos`` produced. A payload can
+also be gzipped and base64-encoded; the page inflates it with
+``DecompressionStream``.
+"""
+
+import base64
+import gzip
+import json
+
+PAYLOAD_VERSION = 1
+
+# Top-level video fields, stored as one array each
+VIDEO_FIELDS = (
+    'id',
+    'title',
+    'url',
+    'thumbnail',
+    'views',
+    'published_date',
+    'duration',
+    'avg_view_sub_ratio',
+    'performance_score',
+)
+
+# performance_details fields; the decoder also copies them to the top level, where the rows repeat them
+DETAIL_FIELDS = (
+    'relative_performance',
+    'subscriber_reach',
+    'forecast_relative_performance',
+    'velocity',
+    'video_age_hours',
+    'views_per_hour',
+    'observed_fraction_48h',
+    'predicted_views_48h',
+)
+
+CHANNEL_FIELDS = (
+    'name',
+    'subscriber_count',
+    'is_verified',
+    'thumbnail',
+    'average_views',
+    'average_views_samples',
+    'average_views_source',
+)
+
+
+def encode_videos(videos: list[dict]) -> dict:
+    """Columnar payload for a batch of feed videos"""
+    channels = {field: [] for field in CHANNEL_FIELDS}
+    channel_index: dict[tuple, int] = {}
+    channel_refs = []
+    fields = {field: [] for field in VIDEO_FIELDS}
+    details = {field: [] for field in DETAIL_FIELDS}
+    profile_names = list(videos[0].get('profile_scores', {})) if videos else []
+    profile_scores = {name: [] for name in profile_names}
+
+    for video in videos:
+        channel = video['channel']
+        key = tuple(channel[field] for field in CHANNEL_FIELDS)
+        if key not in channel_index:
+            channel_index[key] = len(channel_index)
+            for field, value in zip(CHANNEL_FIELDS, key):
+                channels[field].append(value)
+        channel_refs.append(channel_index[key])
+
+        for field in VIDEO_FIELDS:
+            fields[field].append(video[field])
+        performance_details = video['performance_details']
+        for field in DETAIL_FIELDS:
+            details[field].append(performance_details[field])
+        for name in profile_names:
+            profile_scores[name].append(video['profile_scores'][name])
+
+    payload = {
+        'version': PAYLOAD_VERSION,
+        'count': len(videos),
+        'channels': channels,
+        'channel': channel_refs,
+        'fields': fields,
+        'details': details,
+    }
+    if profile_scores:
+        payload['profile_scores'] = profile_scores
+    return payload
+
+
+def payload_json(payload: dict, compress: bool = False) -> str:
+    """JavaScript literal for a payload, safe to inline in a <script> tag"""
+    text = json.dumps(payload, separators=(',', ':'))
+    if compress:
+        data = base64.b64encode(gzip.compress(text.encode('utf-8'), mtime=0)).decode('ascii')
+        return json.dumps({'encoding': 'gzip+base64', 'data': data})
+    return text.replace('</', '<\\/')  # Keep a "</script>" in a title from ending the tag
@@ -2,17 +2,27 @@ import json
 import os
 import sqlite3
 import webbrowser
+from dataclasses import dataclass
 from datetime import datetime
 from importlib import resources
+from itertools import islice
 from pathlib import Path
 
-from .db_schema import resolve_db_path, resolve_state_dir
+from .db_schema import connect, resolve_db_path, resolve_state_dir
+from .feed_payload import encode_videos, payload_json
+from .migrations import migrate
+from .scoring import (
+    check_video_scores,
+    iter_scored_videos,
+    rebuild_video_scores,
+)
+from .thumbnails import load_cached_thumbnails
+
+FEED_CHUNK_SIZE = 2000  # Videos inlined in the page; the rest are written to sidecar chunks
 
 def get_db(db_path: Path):
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return connect(db_path)
     except sqlite3.Error as e:
         print(f"Database connection error: {e}")
         raise
@@ -51,233 +61,212 @@ def check_db_initialized(db_path: Path):
         if 'db' in locals():
             db.close()
 
+def check_scores() -> bool:
+    """Compare the scoring engine against a full SQL recompute"""
+    db_path = resolve_db_path()
+    is_initialized, error_message = check_db_initialized(db_path)
+    if not is_initialized:
+        print(f"Error: {error_message}")
+        return False
+
+    db = get_db(db_path)
+    try:
+        migrate(db)
+        problems = check_video_scores(db)
+    finally:
+        db.close()
+
+    if problems:
+        print("Incremental scores do not match a full recompute:")
+        for problem in problems:
+            print(f"  - {problem}")
+        print("Rebuild with `ytsubs db check-scores --rebuild`.")
+        return False
+    print("Incremental scores match a full recompute.")
+    return True
+
+def rebuild_scores() -> None:
+    db = get_db(resolve_db_path())
+    try:
+        migrate(db)
+        rebuild_video_scores(db)
+    finally:
+        db.close()
+    print("Rebuilt video_scores from scratch.")
+
 def get_thumbnail_url(video_id, thumbnail=None):
     """Get a valid thumbnail URL, falling back to YouTube's default if none provided."""
     if thumbnail and thumbnail.strip():
         return thumbnail
     return f'https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg'
 
-def get_videos():
+def get_videos(profiles=None):
+    """Ranked videos for the feed; ``profiles`` (RankingProfile list) picks the ranking, first one wins"""
+    return list(iter_videos(profiles))
+
+def iter_videos(profiles=None):
+    """Yield feed videos in ranked order without holding them all as dicts"""
     try:
         db_path = resolve_db_path()
         is_initialized, error_message = check_db_initialized(db_path)
         if not is_initialized:
             print(f"Error: {error_message}")
-            return []
+            return
 
         db = get_db(db_path)
-        cursor = db.cursor()
-        
-        cursor.execute('''
-            WITH ChannelStats AS (
-                SELECT 
-                    channel_id,
-                    AVG(views * 1.0 / c.subscriber_count) as avg_view_sub_ratio,
-                    -- Calculate median views for better outlier handling
-                    -- Using approximate median calculation
-                    AVG(views) as avg_views,
-                    COUNT(*) as video_count
-                FROM videos v
-                JOIN channels c ON v.channel_id = c.id
-                WHERE c.subscriber_count > 0
-                GROUP BY channel_id
-            ), VideoMetrics AS (
-                SELECT
-                    v.*,
-                    c.name as channel_name,
-                    c.subscriber_count,
-                    c.is_verified,
-                    c.thumbnail_url as channel_thumbnail,
-                    c.average_views as channel_average_views,
-                    cs.avg_view_sub_ratio,
-                    -- Calculate video age in hours
-                    (julianday('now') - julianday(v.published_date)) * 24 as video_age_hours,
-                    -- Views per hour (velocity metric)
-                    CASE 
-                        WHEN (julianday('now') - julianday(v.published_date)) * 24 > 0 
-                        THEN v.views * 1.0 / ((julianday('now') - julianday(v.published_date)) * 24)
-                        ELSE v.views 
-                    END as views_per_hour,
-                    -- Observed fraction of 48h views, assuming ~60% in first 8h and 95% by 48h
-                    CASE
-                        WHEN (julianday('now') - julianday(v.published_date)) * 24 <= 0 THEN 0.05
-                        WHEN (julianday('now') - julianday(v.published_date)) * 24 <= 8 THEN 
-                            MAX(0.05, 0.6 * (((julianday('now') - julianday(v.published_date)) * 24) / 8.0))
-                        WHEN (julianday('now') - julianday(v.published_date)) * 24 < 48 THEN 
-                            0.6 + 0.35 * ((((julianday('now') - julianday(v.published_date)) * 24) - 8.0) / 40.0)
-                        ELSE 0.95
-                    END as observed_fraction_48h,
-                    -- Predicted 48h views based on the above curve
-                    CASE
-                        WHEN (julianday('now') - julianday(v.published_date)) * 24 < 48 THEN
-                            v.views * 0.95 / NULLIF(
-                                CASE
-                                    WHEN (julianday('now') - julianday(v.published_date)) * 24 <= 0 THEN 0.05
-                                    WHEN (julianday('now') - julianday(v.published_date)) * 24 <= 8 THEN 
-                                        MAX(0.05, 0.6 * (((julianday('now') - julianday(v.published_date)) * 24) / 8.0))
-                                    WHEN (julianday('now') - julianday(v.published_date)) * 24 < 48 THEN 
-                                        0.6 + 0.35 * ((((julianday('now') - julianday(v.published_date)) * 24) - 8.0) / 40.0)
-                                END,
-                                0.05
-                            )
-                        ELSE v.views
-                    END as predicted_views_48h
-                FROM videos v
-                JOIN channels c ON v.channel_id = c.id
-                JOIN ChannelStats cs ON v.channel_id = cs.channel_id
-            )
-            SELECT 
-                vm.id,
-                vm.title,
-                vm.url,
-                vm.thumbnail as thumbnail,
-                vm.views as views,
-                vm.published_date,
-                vm.duration,
-                vm.channel_name,
-                vm.subscriber_count,
-                vm.is_verified,
-                vm.channel_thumbnail,
-                vm.channel_average_views,
-                vm.avg_view_sub_ratio,
-                vm.video_age_hours,
-                vm.views_per_hour,
-                vm.observed_fraction_48h,
-                vm.predicted_views_48h,
-                
-                -- PERFORMANCE SCORE focused on standout content with early-velocity forecast
-                CASE 
-                    WHEN vm.subscriber_count > 0 AND vm.channel_average_views > 0 THEN 
-                        (
-                            -- 1. Base performance relative to channel average (35% weight)
-                            (MIN(vm.views * 1.0 / NULLIF(vm.channel_average_views, 0), 5.0) / 5.0) * 0.35 +
-                            
-                            -- 2. Subscriber engagement rate (25% weight)
-                            CASE 
-                                WHEN vm.subscriber_count > 0 THEN
-                                    MIN(SQRT((vm.views * 1.0 / vm.subscriber_count) * 10), 1.0) * 0.25
-                                ELSE 0
-                            END +
-                            
-                            -- 3. Forecasted 48h performance (20% weight)
-                            (MIN(vm.predicted_views_48h * 1.0 / NULLIF(vm.channel_average_views, 0), 5.0) / 5.0) * 0.20 +
-                            
-                            -- 4. Velocity metric (10% weight)
-                            CASE
-                                WHEN vm.video_age_hours > 1 THEN
-                                    MIN(LOG10(1 + (vm.views * 1.0 / NULLIF(vm.video_age_hours, 1))) / 5.0, 1.0) * 0.10
-                                ELSE 0.10
-                            END +
-                            
-                            -- 5. Channel size normalization (7% weight)
-                            CASE
-                                WHEN vm.subscriber_count < 100000 THEN 0.07
-                                WHEN vm.subscriber_count < 1000000 THEN 0.05
-                                WHEN vm.subscriber_count < 10000000 THEN 0.02
-                                ELSE 0
-                            END +
-                            
-                            -- 6. Duration adjustment (3% weight)
-                            CASE
-                                WHEN vm.duration IS NOT NULL AND vm.duration > 0 THEN
-                                    CASE
-                                        WHEN vm.duration < 120 THEN 0.01  -- < 2 minutes
-                                        WHEN vm.duration < 600 THEN 0.02  -- 2-10 minutes
-                                        WHEN vm.duration < 1800 THEN 0.03 -- 10-30 minutes (sweet spot)
-                                        WHEN vm.duration < 3600 THEN 0.02 -- 30-60 minutes
-                                        ELSE 0.015 -- > 60 minutes
-                                    END
-                                ELSE 0.015 -- Default if no duration
-                            END
-                        )
-                        
-                    ELSE 0 
-                END as performance_score,
+        try:
+            # Static score terms are maintained incrementally; ranking runs over them column by column
+            migrate(db)
+            local_thumbnails = load_cached_thumbnails(db)  # Filled by `ytsubs thumbs sync`
+            for row in iter_scored_videos(db, profiles=profiles):
+                video = dict(row)
+                if video['published_date']:
+                    try:
+                        date = datetime.fromisoformat(video['published_date'].replace('Z', '+00:00'))
+                        video['published_date'] = date.isoformat()
+                    except (ValueError, AttributeError) as e:
+                        print(f"Invalid date format for video {video['id']}: {video['published_date']} - {str(e)}")
+                        continue
                 
-                -- Individual score components for debugging
-                CASE WHEN vm.channel_average_views > 0 THEN (vm.views * 1.0 / NULLIF(vm.channel_average_views, 0)) ELSE 0 END as relative_performance,
-                CASE WHEN vm.subscriber_count > 0 THEN (vm.views * 1.0 / vm.subscriber_count) ELSE 0 END as subscriber_reach,
-                CASE WHEN vm.channel_average_views > 0 THEN (vm.predicted_views_48h * 1.0 / NULLIF(vm.channel_average_views, 0)) ELSE 0 END as forecast_relative_performance,
-                CASE WHEN vm.video_age_hours > 1 THEN
-                    vm.views * 1.0 / vm.video_age_hours
-                ELSE vm.views END as velocity
+                thumbnail = get_thumbnail_url(video['id'], video['thumbnail'])
+                video['thumbnail'] = local_thumbnails.get(thumbnail, thumbnail)
+                video['duration'] = video.get('duration')  # Keep duration in the video object
                 
-            FROM VideoMetrics vm
-            ORDER BY performance_score DESC, vm.published_date DESC
-        ''')
-        
-        rows = cursor.fetchall()
-        videos = []
-        
-        for row in rows:
-            video = dict(row)
-            if video['published_date']:
-                try:
-                    date = datetime.fromisoformat(video['published_date'].replace('Z', '+00:00'))
-                    video['published_date'] = date.isoformat()
-                except (ValueError, AttributeError) as e:
-                    print(f"Invalid date format for video {video['id']}: {video['published_date']} - {str(e)}")
-                    continue
-            
-            video['thumbnail'] = get_thumbnail_url(video['id'], video['thumbnail'])
-            video['duration'] = video.get('duration')  # Keep duration in the video object
-            
-            subscriber_count = video.pop('subscriber_count')
-            average_views = video.pop('channel_average_views')
-            performance_score = video.pop('performance_score')
-            video['channel'] = {
-                'name': video.pop('channel_name'),
-                'subscriber_count': int(subscriber_count) if subscriber_count is not None else None,
-                'is_verified': bool(video.pop('is_verified')),
-                'thumbnail': video.pop('channel_thumbnail'),
-                'average_views': int(average_views) if average_views is not None else None
-            }
-            video['performance_score'] = float(performance_score) if performance_score is not None else 0
-            video['performance_details'] = {
-                'relative_performance': float(row['relative_performance']) if row['relative_performance'] is not None else 0,
-                'subscriber_reach': float(row['subscriber_reach']) if row['subscriber_reach'] is not None else 0,
-                'forecast_relative_performance': float(row['forecast_relative_performance']) if row['forecast_relative_performance'] is not None else 0,
-                'velocity': float(row['velocity']) if row['velocity'] is not None else 0,
-                'video_age_hours': float(row['video_age_hours']) if row['video_age_hours'] is not None else 0,
-                'views_per_hour': float(row['views_per_hour']) if row['views_per_hour'] is not None else 0,
-                'observed_fraction_48h': float(row['observed_fraction_48h']) if row['observed_fraction_48h'] is not None else 0,
-                'predicted_views_48h': float(row['predicted_views_48h']) if row['predicted_views_48h'] is not None else 0
-            }
-            videos.append(video)
-        
-        db.close()
-        return videos
+                subscriber_count = video.pop('subscriber_count')
+                average_views = video.pop('channel_average_views')
+                performance_score = video.pop('performance_score')
+                video['channel'] = {
+                    'name': video.pop('channel_name'),
+                    'subscriber_count': int(subscriber_count) if subscriber_count is not None else None,
+                    'is_verified': bool(video.pop('is_verified')),
+                    'thumbnail': video.pop('channel_thumbnail'),
+                    'average_views': int(average_views) if average_views is not None else None,
+                    'average_views_samples': video.pop('channel_average_views_samples'),
+                    'average_views_source': video.pop('channel_average_views_source'),
+                }
+                video['performance_score'] = float(performance_score) if performance_score is not None else 0
+                video['performance_details'] = {
+                    'relative_performance': float(row['relative_performance']) if row['relative_performance'] is not None else 0,
+                    'subscriber_reach': float(row['subscriber_reach']) if row['subscriber_reach'] is not None else 0,
+                    'forecast_relative_performance': float(row['forecast_relative_performance']) if row['forecast_relative_performance'] is not None else 0,
+                    'velocity': float(row['velocity']) if row['velocity'] is not None else 0,
+                    'video_age_hours': float(row['video_age_hours']) if row['video_age_hours'] is not None else 0,
+                    'views_per_hour': float(row['views_per_hour']) if row['views_per_hour'] is not None else 0,
+                    'observed_fraction_48h': float(row['observed_fraction_48h']) if row['observed_fraction_48h'] is not None else 0,
+                    'predicted_views_48h': float(row['predicted_views_48h']) if row['predicted_views_48h'] is not None else 0
+                }
+                yield video
+        finally:
+            db.close()
 
     except sqlite3.Error as e:
         print(f"Database error: {e}")
-        return []
     except Exception as e:
         print(f"Error: {e}")
-        return []
 
-def generate_html(videos, output_path: Path, open_browser: bool = True):
+def _format_size(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    return f"{size / 1024:.1f} KB"
+
+@dataclass
+class FeedSummary:
+    """Running totals while a feed is streamed out, for the report at the end"""
+    count: int = 0
+    first: str | None = None  # published_date of the first (top ranked) video
+    last: str | None = None
+    row_bytes: int = 0  # The videos as standalone JSON objects
+    payload_bytes: int = 0  # The columnar payloads actually written
+
+
+def feed_data_dir(output_path: Path) -> Path:
+    """Directory next to the page that holds its sidecar data chunks"""
+    return output_path.with_name(f"{output_path.stem}_data")
+
+def generate_html(
+    videos,
+    output_path: Path,
+    open_browser: bool = True,
+    profiles=None,
+    chunk_size: int = FEED_CHUNK_SIZE,
+    compress: bool = False,
+):
+    """Stream the feed page to disk.
+
+    The first ``chunk_size`` videos are inlined so the page paints right away; the
+    rest go to ``feed-NNN.js`` sidecar scripts that the page appends as they load.
+    Each batch is written as a columnar payload (see feed_payload), gzipped when
+    ``compress`` is set. ``videos`` can be any iterable, so memory stays flat
+    however large the feed is.
+    """
     template = (
         resources.files("ytsubs")
         .joinpath("static_template.html")
         .read_text(encoding="utf-8")
     )
-    
-    # Insert the video data as a JSON array
-    video_data_json = json.dumps(videos)
-    html = template.replace('const videoData = VIDEO_DATA_PLACEHOLDER;', f'const videoData = {video_data_json};')
+    head, tail = template.split('VIDEO_DATA_PLACEHOLDER', 1)
     
     output_path = output_path.resolve()
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    data_dir = feed_data_dir(output_path)
+    if data_dir.exists():
+        for stale in data_dir.glob('feed-*.js'):
+            stale.unlink()
+
+    summary = FeedSummary()
+
+    def tracked(items):
+        for video in items:
+            if summary.count == 0:
+                summary.first = video['published_date']
+            summary.last = video['published_date']
+            summary.count += 1
+            # What the same video costs as a standalone JSON object, for the size report
+            summary.row_bytes += len(json.dumps(video)) + 2
+            yield video
+
+    def encoded(batch) -> str:
+        text = payload_json(encode_videos(batch), compress)
+        summary.payload_bytes += len(text)
+        return text
+
+    remaining = tracked(videos)
+    chunk_urls = []
     with output_path.open('w', encoding="utf-8") as f:
-        f.write(html)
+        f.write(head)
+        f.write(encoded(list(islice(remaining, chunk_size))))
+
+        while batch := list(islice(remaining, chunk_size)):
+            data_dir.mkdir(exist_ok=True)
+            chunk_path = data_dir / f"feed-{len(chunk_urls):03d}.js"
+            with chunk_path.open('w', encoding="utf-8") as chunk:
+                chunk.write(f"ytsubsFeedChunk({encoded(batch)});\n")
+            chunk_urls.append(f"{data_dir.name}/{chunk_path.name}")
+
+        # Profiles the page can switch between; only emitted when more than one was ranked
+        profile_data = [
+            {'name': profile.name, 'description': profile.description}
+            for profile in profiles or []
+        ] if profiles and len(profiles) > 1 else []
+        tail = tail.replace('FEED_PROFILES_PLACEHOLDER', json.dumps(profile_data))
+        tail = tail.replace('FEED_CHUNKS_PLACEHOLDER', json.dumps(chunk_urls))
+        f.write(tail)
     
     # Get absolute file URL
     file_url = f"file://{output_path.resolve()}"
     
     print(f"\nGenerated static HTML file at: {output_path}")
-    print(f"Found {len(videos)} videos")
-    if videos:
-        print(f"Date range: {videos[-1]['published_date']} to {videos[0]['published_date']}")
+    if chunk_urls:
+        print(f"Wrote {len(chunk_urls)} data chunk(s) to: {data_dir}")
+    print(f"Found {summary.count} videos")
+    if summary.count:
+        saved = 1 - summary.payload_bytes / summary.row_bytes
+        print(
+            f"Video data: {_format_size(summary.row_bytes)} as JSON objects -> "
+            f"{_format_size(summary.payload_bytes)} {'gzipped ' if compress else ''}columnar ({saved:.0%} smaller)"
+        )
+    if summary.count:
+        print(f"Date range: {summary.last} to {summary.first}")
     if open_browser:
         print(f"\nOpening in default browser...")
         webbrowser.open(file_url)
@@ -299,8 +288,10 @@ def open_feed() -> bool:
     return True
 
 
-def run(output_path: Path | None = None, open_browser: bool = True) -> None:
+def run(output_path: Path | None = None, open_browser: bool = True, profiles=None, compress: bool = False) -> None:
     print("Generating static YouTube feed page...")
-    videos = get_videos()
+    if profiles:
+        print(f"Ranking profiles: {', '.join(profile.name for profile in profiles)}")
+    videos = iter_videos(profiles)
     target = output_path or feed_path()
-    generate_html(videos, output_path=target, open_browser=open_browser)
+    generate_html(videos, output_path=target, open_browser=open_browser, profiles=profiles, compress=compress)
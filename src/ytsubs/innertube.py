@@ -0,0 +1,271 @@
+"""
+Parsers for YouTube's InnerTube JSON.
+
+The subscriptions feed ships its first page as ``ytInitialData`` and loads every
+further page through ``youtubei/v1/browse`` continuation responses. Both contain
+``videoRenderer`` (classic) or ``lockupViewModel`` (current) nodes; the helpers
+here turn those into the same item dicts the DOM extraction in scrape_videos.py
+produces, so the rest of the pipeline does not care where an item came from.
+"""
+
+import json
+from typing import Any, Iterator
+
+BROWSE_ENDPOINT = '/youtubei/v1/browse'
+YOUTUBE_ORIGIN = 'https://www.youtube.com'
+
+FEED_ITEM_KEYS = ('videoRenderer', 'lockupViewModel')
+INITIAL_DATA_MARKERS = ('var ytInitialData = ', 'window["ytInitialData"] = ', 'ytInitialData = ')
+YTCFG_MARKER = 'ytcfg.set('
+SHORTS_SECONDS = 60  # Shorts badges carry no length; count them as a typical short
+
+
+def get_path(obj: Any, *path: str | int) -> Any:
+    """Follow a path of dict keys / list indexes, returning None on any miss"""
+    for key in path:
+        if isinstance(key, int):
+            if not isinstance(obj, list) or not -len(obj) <= key < len(obj):
+                return None
+        elif not isinstance(obj, dict):
+            return None
+        obj = obj[key] if isinstance(key, int) else obj.get(key)
+        if obj is None:
+            return None
+    return obj
+
+
+def get_text(obj: Any) -> str | None:
+    """Flatten InnerTube text objects ({simpleText}, {runs}, {content}) into a string"""
+    if isinstance(obj, str):
+        return obj
+    if not isinstance(obj, dict):
+        return None
+    if 'simpleText' in obj:
+        return obj['simpleText']
+    if 'runs' in obj:
+        return ''.join(run.get('text', '') for run in obj['runs'])
+    if 'content' in obj:
+        return obj['content']
+    return None
+
+
+def iter_nodes(data: Any, keys: tuple[str, ...]) -> Iterator[tuple[str, dict]]:
+    """Yield (key, node) for every renderer named in ``keys``, in document order"""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key in keys and isinstance(value, dict):
+                yield key, value
+            elif isinstance(value, (dict, list)):
+                yield from iter_nodes(value, keys)
+    elif isinstance(data, list):
+        for item in data:
+            yield from iter_nodes(item, keys)
+
+
+def extract_initial_data(html: str) -> dict | None:
+    """Decode the ytInitialData object embedded in a page's HTML, without rendering it"""
+    decoder = json.JSONDecoder()
+    for marker in INITIAL_DATA_MARKERS:
+        start = html.find(marker)
+        if start == -1:
+            continue
+        try:
+            data, _ = decoder.raw_decode(html, start + len(marker))
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            return data
+    return None
+
+
+def extract_ytcfg(html: str) -> dict:
+    """Merge every ``ytcfg.set({...})`` call in a page (INNERTUBE_API_KEY, INNERTUBE_CONTEXT, ...)"""
+    decoder = json.JSONDecoder()
+    config = {}
+    position = html.find(YTCFG_MARKER)
+    while position != -1:
+        position += len(YTCFG_MARKER)
+        try:
+            value, position = decoder.raw_decode(html, position)
+        except ValueError:
+            value = None
+        if isinstance(value, dict):
+            config.update(value)
+        position = html.find(YTCFG_MARKER, position)
+    return config
+
+
+def continuation_token(data: Any) -> str | None:
+    """Token of the first continuationItemRenderer (the "load more" marker at the end of a list)"""
+    for _, node in iter_nodes(data, ('continuationItemRenderer',)):
+        token = get_path(node, 'continuationEndpoint', 'continuationCommand', 'token')
+        if token:
+            return token
+    return None
+
+
+def browse_continuation_request(config: dict, token: str) -> tuple[str, dict] | None:
+    """(url, JSON body) for fetching a continuation through youtubei/v1/browse, or None without a client context"""
+    context = config.get('INNERTUBE_CONTEXT')
+    if not context:
+        return None
+    url = f'{YOUTUBE_ORIGIN}{BROWSE_ENDPOINT}?prettyPrint=false'
+    if config.get('INNERTUBE_API_KEY'):
+        url += f"&key={config['INNERTUBE_API_KEY']}"
+    return url, {'context': context, 'continuation': token}
+
+
+def channel_from_browse_endpoint(endpoint: dict | None) -> tuple[str | None, str | None]:
+    """Return (channel_id, channel_url), preferring the @handle like the DOM scraper does"""
+    if not endpoint:
+        return None, None
+    base_url = endpoint.get('canonicalBaseUrl') or ''
+    browse_id = endpoint.get('browseId')
+    if base_url.startswith('/@'):
+        return base_url[2:].split('/')[0], YOUTUBE_ORIGIN + base_url
+    if browse_id:
+        return browse_id, f'{YOUTUBE_ORIGIN}/channel/{browse_id}'
+    return None, None
+
+
+def parse_duration(text: str | None) -> int | None:
+    """Seconds from a duration badge ('12:34', '1:02:03', 'SHORTS'); None for 'LIVE', 'UPCOMING' and the like"""
+    if not text:
+        return None
+    text = text.strip().upper()
+    if text in ('SHORTS', 'SHORT'):
+        return SHORTS_SECONDS
+    parts = text.split(':')
+    if not 2 <= len(parts) <= 3 or not all(part.isdigit() for part in parts):
+        return None
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+def _split_metadata(texts: list[str]) -> tuple[str | None, str | None]:
+    """Pick the view count and relative publish date out of metadata strings"""
+    views = None
+    publish_date = None
+    for text in texts:
+        if 'views' in text:
+            views = text
+        elif any(unit in text for unit in ('ago', 'hour', 'day', 'week', 'month', 'year')):
+            publish_date = text
+    return views, publish_date
+
+
+def parse_video_renderer(renderer: dict) -> dict | None:
+    """Convert a classic videoRenderer node into a feed item"""
+    video_id = renderer.get('videoId')
+    if not video_id:
+        return None
+
+    owner_runs = (
+        get_path(renderer, 'ownerText', 'runs')
+        or get_path(renderer, 'longBylineText', 'runs')
+        or get_path(renderer, 'shortBylineText', 'runs')
+        or []
+    )
+    endpoint = get_path(owner_runs, 0, 'navigationEndpoint', 'browseEndpoint')
+    channel_id, channel_url = channel_from_browse_endpoint(endpoint)
+
+    duration = get_text(renderer.get('lengthText'))
+    if not duration:
+        for overlay in renderer.get('thumbnailOverlays', []):
+            duration = get_text(get_path(overlay, 'thumbnailOverlayTimeStatusRenderer', 'text'))
+            if duration:
+                break
+
+    thumbnails = get_path(renderer, 'thumbnail', 'thumbnails') or []
+    views, publish_date = _split_metadata([
+        text for text in (
+            get_text(renderer.get('viewCountText')),
+            get_text(renderer.get('publishedTimeText')),
+        ) if text
+    ])
+
+    return {
+        'videoId': video_id,
+        'title': get_text(renderer.get('title')),
+        'url': f'{YOUTUBE_ORIGIN}/watch?v={video_id}',
+        'channelName': ''.join(run.get('text', '') for run in owner_runs) or None,
+        'channelUrl': channel_url,
+        'channelId': channel_id,
+        'channelText': None,
+        'views': views or 0,
+        'publishDate': publish_date,
+        'thumbnailUrl': thumbnails[-1].get('url') if thumbnails else None,
+        'duration': duration.strip() if duration else None,
+    }
+
+
+def parse_lockup_view_model(lockup: dict) -> dict | None:
+    """Convert a lockupViewModel node (current feed layout) into a feed item"""
+    if lockup.get('contentType') not in (None, 'LOCKUP_CONTENT_TYPE_VIDEO'):
+        return None
+    video_id = lockup.get('contentId')
+    if not video_id:
+        return None
+
+    metadata = get_path(lockup, 'metadata', 'lockupMetadataViewModel') or {}
+    rows = get_path(metadata, 'metadata', 'contentMetadataViewModel', 'metadataRows') or []
+
+    channel_name = None
+    endpoint = None
+    texts = []
+    for row in rows:
+        for part in row.get('metadataParts', []):
+            text = get_text(part.get('text'))
+            if not text:
+                continue
+            texts.append(text)
+            for command_run in get_path(part, 'text', 'commandRuns') or []:
+                found = get_path(command_run, 'onTap', 'innertubeCommand', 'browseEndpoint')
+                if found and endpoint is None:
+                    endpoint = found
+                    channel_name = text
+    if endpoint is None:
+        endpoint = get_path(
+            metadata, 'image', 'decoratedAvatarViewModel', 'rendererContext',
+            'commandContext', 'onTap', 'innertubeCommand', 'browseEndpoint',
+        )
+    channel_id, channel_url = channel_from_browse_endpoint(endpoint)
+    views, publish_date = _split_metadata(texts)
+    if channel_name is None and texts and texts[0] not in (views, publish_date):
+        channel_name = texts[0]
+
+    content_image = lockup.get('contentImage') or {}
+    sources = get_path(content_image, 'thumbnailViewModel', 'image', 'sources') or []
+    duration = None
+    for _, badge in iter_nodes(content_image, ('thumbnailBadgeViewModel',)):
+        duration = badge.get('text')
+        if duration:
+            break
+
+    return {
+        'videoId': video_id,
+        'title': get_text(metadata.get('title')),
+        'url': f'{YOUTUBE_ORIGIN}/watch?v={video_id}',
+        'channelName': channel_name,
+        'channelUrl': channel_url,
+        'channelId': channel_id,
+        'channelText': None,
+        'views': views or 0,
+        'publishDate': publish_date,
+        'thumbnailUrl': sources[-1].get('url') if sources else None,
+        'duration': duration.strip() if duration else None,
+    }
+
+
+def iter_feed_items(data: Any) -> Iterator[dict]:
+    """Yield feed items from ytInitialData or a browse continuation response, skipping nodes of an unexpected shape"""
+    for key, node in iter_nodes(data, FEED_ITEM_KEYS):
+        parse = parse_video_renderer if key == 'videoRenderer' else parse_lockup_view_model
+        try:
+            item = parse(node)
+        except (AttributeError, TypeError, KeyError, IndexError):
+            continue  # One odd renderer should not cost the rest of the page
+        if item:
+            yield item
@@ -0,0 +1,186 @@
+"""
+Numbered schema migrations, tracked with ``PRAGMA user_version``.
+
+Each migration runs once per database, in order, and bumps ``user_version``
+when it completes. Databases created before versioning report version 0;
+the early migrations only use ``IF NOT EXISTS`` statements, so replaying them
+over an existing schema is harmless. Migrations that cannot be replayed
+(column changes) must run inside a single transaction.
+
+Some migrations call the current ensure_* helpers, which may read columns
+added later. Such columns are also declared in schema.sql and added by
+``_base_schema`` for databases that predate versioning; the numbered
+migration that introduces them still backfills whatever it needs.
+
+To change the schema, append a migration; never renumber or drop one that has shipped.
+"""
+
+import sqlite3
+from importlib import resources
+from typing import Callable
+
+from .channel_aliases import ensure_channel_aliases
+from .innertube import parse_duration
+from .oembed import ensure_oembed_cache
+from .scoring import VIDEO_SCORES_SCHEMA, ensure_video_scores, rebuild_video_scores
+
+# Columns schema.sql declares that unversioned databases may lack: (table, column, type)
+_LATER_COLUMNS = (
+    ('videos', 'duration_seconds', 'INTEGER'),
+)
+
+
+def _has_column(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    return any(row[1] == column for row in conn.execute(f'PRAGMA table_info({table})'))
+
+
+def _add_column(conn: sqlite3.Connection, table: str, column: str, column_type: str) -> None:
+    if not _has_column(conn, table, column):
+        conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
+
+
+def _base_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(resources.files("ytsubs").joinpath("schema.sql").read_text(encoding="utf-8"))
+    with conn:
+        for table, column, column_type in _LATER_COLUMNS:
+            _add_column(conn, table, column, column_type)
+
+
+def _thumbnail_cache(conn: sqlite3.Connection) -> None:
+    from .thumbnails import ensure_thumbnail_cache  # thumbnails imports db_schema, which imports us
+
+    ensure_thumbnail_cache(conn)
+
+
+def _channel_aliases(conn: sqlite3.Connection) -> None:
+    merged = ensure_channel_aliases(conn)
+    if merged:
+        print(f"Merged {sum(len(ids) for _, ids in merged)} duplicate channel records into {len(merged)} channels")
+
+
+def _feed_query_indexes(conn: sqlite3.Connection) -> None:
+    conn.executescript('''
+        -- Per-channel scans (score triggers, channel view stats) read only the index
+        CREATE INDEX IF NOT EXISTS idx_videos_channel_published_views ON videos(channel_id, published_date, views);
+        DROP INDEX IF EXISTS idx_videos_channel_id;  -- A prefix of the index above
+        CREATE INDEX IF NOT EXISTS idx_channels_handle ON channels(handle);
+        CREATE INDEX IF NOT EXISTS idx_channels_subscriber_count ON channels(subscriber_count);
+    ''')
+
+
+def _integer_durations(conn: sqlite3.Connection) -> None:
+    conn.create_function('ytsubs_parse_duration', 1, parse_duration, deterministic=True)
+    with conn:
+        _add_column(conn, 'videos', 'duration_seconds', 'INTEGER')
+        conn.execute('''
+            UPDATE videos SET duration_seconds = ytsubs_parse_duration(duration)
+            WHERE duration_seconds IS NULL AND duration IS NOT NULL
+        ''')
+        # The score trigger now watches duration_seconds instead of the badge text
+        conn.execute('DROP TRIGGER IF EXISTS video_scores_video_update')
+    conn.executescript(VIDEO_SCORES_SCHEMA)
+    rebuild_video_scores(conn)
+
+
+def _published_precision(conn: sqlite3.Connection) -> None:
+    # Existing dates have unknown precision (NULL), so the next scrape may still refine them
+    with conn:
+        _add_column(conn, 'videos', 'published_precision', 'INTEGER')
+
+
+def _average_views_provenance(conn: sqlite3.Connection) -> None:
+    # Every average stored so far came from a channel page crawl; its sample count was not kept
+    with conn:
+        _add_column(conn, 'channels', 'average_views_samples', 'INTEGER')
+        _add_column(conn, 'channels', 'average_views_source', 'TEXT')
+        conn.execute("UPDATE channels SET average_views_source = 'crawl' WHERE average_views > 0 AND average_views_source IS NULL")
+
+
+def _views_updated(conn: sqlite3.Connection) -> None:
+    # When existing view counts were read was not kept; they stay out of history averages until rescraped
+    with conn:
+        _add_column(conn, 'videos', 'views_updated', 'TIMESTAMP')
+
+
+MIGRATIONS: list[tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "videos and channels tables", _base_schema),
+    (2, "incremental video_scores table and triggers", ensure_video_scores),
+    (3, "oEmbed channel cache", ensure_oembed_cache),
+    (4, "thumbnail cache", _thumbnail_cache),
+    (5, "channel alias index (merges duplicate channels)", _channel_aliases),
+    (6, "feed query indexes", _feed_query_indexes),
+    (7, "integer video durations (backfilled from badge text)", _integer_durations),
+    (8, "publish date precision", _published_precision),
+    (9, "channel average views sample count and source", _average_views_provenance),
+    (10, "video view count observation time", _views_updated),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# Hot queries and the index each one must use
+QUERY_PLAN_EXPECTATIONS = (
+    (
+        "trim old videos",
+        "DELETE FROM videos WHERE published_date < ?",
+        "idx_videos_published_date",
+    ),
+    (
+        "score rows for a channel",
+        "SELECT id FROM videos WHERE channel_id = ?",
+        "idx_videos_channel_published_views",
+    ),
+    (
+        "recent views of a channel",
+        "SELECT published_date, views FROM videos WHERE channel_id = ? AND published_date >= ?",
+        "COVERING INDEX idx_videos_channel_published_views",
+    ),
+    (
+        "channels with stats",
+        "SELECT COUNT(*) FROM channels WHERE subscriber_count > 0",
+        "idx_channels_subscriber_count",
+    ),
+    (
+        "channel by handle",
+        "SELECT id FROM channels WHERE handle = ?",
+        "idx_channels_handle",
+    ),
+    (
+        "channel alias lookup",
+        "SELECT channel_id FROM channel_aliases WHERE alias = ?",
+        "sqlite_autoindex_channel_aliases_1",
+    ),
+)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> list[tuple[int, str]]:
+    """Apply every migration newer than the database; returns the (version, description) pairs applied"""
+    current = schema_version(conn)
+    applied = []
+    for version, description, apply in MIGRATIONS:
+        if version <= current:
+            continue
+        apply(conn)
+        conn.execute(f'PRAGMA user_version = {version}')
+        conn.commit()
+        applied.append((version, description))
+    return applied
+
+
+def query_plan(conn: sqlite3.Connection, sql: str) -> str:
+    """EXPLAIN QUERY PLAN details for ``sql`` (parameters bound to NULL), one step per line"""
+    params = (None,) * sql.count('?')
+    return "\n".join(row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params))
+
+
+def check_query_plans(conn: sqlite3.Connection) -> list[str]:
+    """Hot queries whose plan does not use the expected index"""
+    problems = []
+    for name, sql, expected in QUERY_PLAN_EXPECTATIONS:
+        plan = query_plan(conn, sql)
+        if expected not in plan:
+            problems.append(f"{name}: expected {expected}, got {plan!r}")
+    return problems
@@ -0,0 +1,187 @@
+"""
+Channel lookup through YouTube's oEmbed endpoint, with a persistent cache.
+
+The subscriptions feed sometimes omits the channel of a video (collabs,
+some Shorts). oEmbed recovers it, but each call is a blocking HTTP request,
+so results are kept in the ``oembed_cache`` table: successful lookups for
+``ttl`` and definite misses (4xx responses, no channel in the reply) for the
+shorter ``negative_ttl``. Network errors and 5xx responses are not cached.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from urllib import error, parse, request
+
+OEMBED_ENDPOINT = 'https://www.youtube.com/oembed'
+OEMBED_TIMEOUT = 10
+DEFAULT_TTL = timedelta(days=30)
+DEFAULT_NEGATIVE_TTL = timedelta(days=1)
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 8.0  # Requests per second across all workers
+
+OEMBED_CACHE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS oembed_cache (
+    video_id TEXT PRIMARY KEY,
+    channel_id TEXT,
+    channel_url TEXT,
+    channel_name TEXT,
+    fetched_at TIMESTAMP NOT NULL
+);
+'''
+
+
+def ensure_oembed_cache(conn: sqlite3.Connection) -> None:
+    conn.executescript(OEMBED_CACHE_SCHEMA)
+
+
+def parse_author_url(author_url: str | None) -> str | None:
+    """Channel id from an oEmbed author_url, preferring /channel/ ids over @handles"""
+    if not author_url:
+        return None
+    id_match = re.search(r'/channel/([A-Za-z0-9_-]+)', author_url)
+    if id_match:
+        return id_match.group(1)
+    handle_match = re.search(r'/@([A-Za-z0-9_-]+)', author_url)
+    if handle_match:
+        return handle_match.group(1)
+    return None
+
+
+class OEmbedResolver:
+    """Resolve video ids to (channel_id, channel_url, channel_name), cache first"""
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        endpoint: str = OEMBED_ENDPOINT,
+        ttl: timedelta = DEFAULT_TTL,
+        negative_ttl: timedelta = DEFAULT_NEGATIVE_TTL,
+    ):
+        self.conn = conn
+        self.endpoint = endpoint
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stats = {'hits': 0, 'negative_hits': 0, 'misses': 0, 'errors': 0}
+        ensure_oembed_cache(conn)
+
+    def lookup_cached(self, video_id: str, now: datetime) -> tuple | None:
+        """Cached (channel_id, channel_url, channel_name) if still fresh, else None"""
+        row = self.conn.execute(
+            'SELECT channel_id, channel_url, channel_name, fetched_at FROM oembed_cache WHERE video_id = ?',
+            (video_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        channel_id, channel_url, channel_name, fetched_at = row
+        ttl = self.ttl if channel_id else self.negative_ttl
+        if fetched_at < (now - ttl).isoformat():
+            return None
+        return channel_id, channel_url, channel_name
+
+    def fetch(self, video_id: str) -> tuple | None:
+        """Ask oEmbed directly; None when the outcome is transient and should not be cached"""
+        video_url = f'https://www.youtube.com/watch?v={video_id}'
+        url = f'{self.endpoint}?{parse.urlencode({"url": video_url, "format": "json"})}'
+        try:
+            with request.urlopen(url, timeout=OEMBED_TIMEOUT) as resp:
+                data = json.load(resp)
+        except error.HTTPError as e:
+            if 400 <= e.code < 500:  # Private, removed or not embeddable: a definite miss
+                return None, None, None
+            return None
+        except (error.URLError, OSError, ValueError):
+            return None
+
+        author_url = data.get('author_url')
+        return parse_author_url(author_url), author_url, data.get('author_name')
+
+    def resolve(self, video_id: str) -> tuple[str | None, str | None, str | None]:
+        cached = self.resolve_cached(video_id)
+        if cached is not None:
+            return cached
+        return self.record(video_id, self.fetch(video_id))
+
+    def resolve_cached(self, video_id: str) -> tuple | None:
+        """Cache-only half of resolve(); None means a network lookup is needed"""
+        cached = self.lookup_cached(video_id, datetime.now(timezone.utc))
+        if cached is not None:
+            self.stats['hits' if cached[0] else 'negative_hits'] += 1
+        return cached
+
+    def record(self, video_id: str, result: tuple | None) -> tuple[str | None, str | None, str | None]:
+        """Store the outcome of fetch() (unless transient) and count it"""
+        self.stats['misses'] += 1
+        if result is None:
+            self.stats['errors'] += 1
+            return None, None, None
+
+        with self.conn:
+            self.conn.execute('''
+                INSERT INTO oembed_cache (video_id, channel_id, channel_url, channel_name, fetched_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(video_id) DO UPDATE SET
+                    channel_id = excluded.channel_id,
+                    channel_url = excluded.channel_url,
+                    channel_name = excluded.channel_name,
+                    fetched_at = excluded.fetched_at
+            ''', (video_id, *result, datetime.now(timezone.utc).isoformat()))
+        return result
+
+    def summary(self) -> str:
+        stats = self.stats
+        return (
+            f"oEmbed cache: {stats['hits'] + stats['negative_hits']} hits "
+            f"({stats['negative_hits']} cached misses), {stats['misses']} network lookups "
+            f"({stats['errors']} failed)"
+        )
+
+
+class OEmbedPool:
+    """Run oEmbed fetches on worker threads so the caller can keep scrolling.
+
+    Only the network call leaves the calling thread: cache reads and writes stay
+    with the resolver's connection. ``rate`` caps requests per second across all
+    workers.
+    """
+
+    def __init__(self, resolver: OEmbedResolver, workers: int = DEFAULT_WORKERS, rate: float | None = DEFAULT_RATE):
+        self.resolver = resolver
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='oembed')
+        self.min_interval = 1 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self.pending: dict[str, tuple[Future, object]] = {}
+
+    def submit(self, video_id: str, context: object = None) -> None:
+        """Queue a lookup; ``context`` comes back with the result"""
+        if video_id not in self.pending:
+            self.pending[video_id] = (self.executor.submit(self._fetch, video_id), context)
+
+    def _fetch(self, video_id: str) -> tuple | None:
+        if self.min_interval:
+            with self._lock:
+                now = time.monotonic()
+                slot = max(now, self._next_slot)
+                self._next_slot = slot + self.min_interval
+            time.sleep(slot - now)
+        return self.resolver.fetch(video_id)
+
+    def completed(self, wait: bool = False) -> list[tuple[str, tuple, object]]:
+        """(video_id, resolved, context) for finished lookups, or for all of them with ``wait``"""
+        finished = [
+            video_id for video_id, (future, _) in self.pending.items()
+            if wait or future.done()
+        ]
+        results = []
+        for video_id in finished:
+            future, context = self.pending.pop(video_id)
+            results.append((video_id, self.resolver.record(video_id, future.result()), context))
+        return results
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
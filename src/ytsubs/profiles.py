@@ -0,0 +1,120 @@
+"""
+Named ranking profiles.
+
+A profile is a set of component weights plus the forecast curve used to
+project 48h views. ``default`` reproduces the original ranking exactly; more
+profiles can be defined in ``profiles.toml`` next to the database:
+
+    [profiles.rising]
+    description = "Videos taking off right now"
+    weights = { forecast_48h = 0.35, velocity = 0.25, channel_relative = 0.20 }
+
+    [profiles.rising.curve]
+    early_hours = 6
+
+Weights and curve values left out fall back to the default profile.
+"""
+
+import tomllib
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+
+from .db_schema import resolve_state_dir
+from .scoring import DEFAULT_CURVE, DEFAULT_WEIGHTS, ForecastCurve
+
+
+@dataclass(frozen=True)
+class RankingProfile:
+    name: str
+    description: str = ''
+    weights: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_WEIGHTS))
+    curve: ForecastCurve = DEFAULT_CURVE
+
+
+BUILTIN_PROFILES = {
+    'default': RankingProfile('default', 'Standout videos relative to their channel'),
+    'rising': RankingProfile(
+        'rising',
+        'Recent videos with fast early views',
+        weights={
+            'channel_relative': 0.20,
+            'subscriber_reach': 0.15,
+            'forecast_48h': 0.35,
+            'velocity': 0.20,
+            'channel_size': 0.07,
+            'duration': 0.03,
+        },
+    ),
+    'small-channels': RankingProfile(
+        'small-channels',
+        'Breakouts from smaller channels',
+        weights={
+            'channel_relative': 0.40,
+            'subscriber_reach': 0.30,
+            'forecast_48h': 0.10,
+            'velocity': 0.05,
+            'channel_size': 0.15,
+            'duration': 0.03,
+        },
+    ),
+}
+
+CURVE_FIELDS = {f.name for f in fields(ForecastCurve)}
+
+
+def profiles_path() -> Path:
+    return resolve_state_dir() / "profiles.toml"
+
+
+def _parse_profile(name: str, spec: dict) -> RankingProfile:
+    """Build a profile from one [profiles.NAME] table, raising ValueError on bad input"""
+    unknown = set(spec) - {'description', 'weights', 'curve'}
+    if unknown:
+        raise ValueError(f"Profile '{name}': unknown keys {', '.join(sorted(unknown))}")
+
+    weights = dict(DEFAULT_WEIGHTS)
+    for key, value in spec.get('weights', {}).items():
+        if key not in DEFAULT_WEIGHTS:
+            raise ValueError(
+                f"Profile '{name}': unknown weight '{key}' (expected one of {', '.join(DEFAULT_WEIGHTS)})"
+            )
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f"Profile '{name}': weight '{key}' must be a non-negative number")
+        weights[key] = float(value)
+
+    curve_spec = spec.get('curve', {})
+    unknown = set(curve_spec) - CURVE_FIELDS
+    if unknown:
+        raise ValueError(f"Profile '{name}': unknown curve keys {', '.join(sorted(unknown))}")
+    if any(isinstance(value, bool) for value in curve_spec.values()):
+        raise ValueError(f"Profile '{name}': curve values must be numbers")
+    try:
+        curve = ForecastCurve(**{key: float(value) for key, value in curve_spec.items()})
+    except (TypeError, ValueError):
+        raise ValueError(f"Profile '{name}': curve values must be numbers")
+    if not 0 < curve.early_hours < curve.full_hours:
+        raise ValueError(f"Profile '{name}': curve needs 0 < early_hours < full_hours")
+    if not 0 < curve.floor <= curve.early_fraction <= curve.full_fraction <= 1:
+        raise ValueError(f"Profile '{name}': curve needs 0 < floor <= early_fraction <= full_fraction <= 1")
+
+    return RankingProfile(name, str(spec.get('description', '')), weights, curve)
+
+
+def load_profiles(path: Path | None = None) -> dict[str, RankingProfile]:
+    """Built-in profiles plus any defined in the TOML file (which may override them)"""
+    profiles = dict(BUILTIN_PROFILES)
+    path = path or profiles_path()
+    if not path.exists():
+        return profiles
+
+    try:
+        with path.open('rb') as f:
+            data = tomllib.load(f)
+    except tomllib.TOMLDecodeError as e:
+        raise ValueError(f"{path}: {e}")
+
+    for name, spec in data.get('profiles', {}).items():
+        if not isinstance(spec, dict):
+            raise ValueError(f"{path}: [profiles.{name}] must be a table")
+        profiles[name] = _parse_profile(name, spec)
+    return profiles
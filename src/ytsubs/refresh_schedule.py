@@ -0,0 +1,111 @@
+"""
+Pick which channels `scrape-channels` re-crawls.
+
+Crawling a channel's videos for its average views is the slow part of a
+channel refresh. Each channel gets a priority from how long ago it was
+crawled (scaled up for channels that upload often, whose averages move
+faster) plus how much its subscriber count changed since. Channels never crawled come first, channels
+whose priority is below 1 are fresh and skipped, and the rest are refreshed
+most-overdue first until a channel-count or time budget runs out. Skipped
+channels keep their stored row untouched, so the subscriber change keeps
+accumulating until the channel is crawled again.
+"""
+
+import math
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from .channel_aliases import ChannelIndex
+
+REFRESH_INTERVAL_DAYS = 7.0  # A channel with no uploads is due again after this long
+ACTIVITY_WINDOW_DAYS = 30
+SUBSCRIBER_DELTA_WEIGHT = 10.0  # A 10% subscriber change makes a channel due on its own
+
+_BUDGET_PART = re.compile(r'(\d+(?:\.\d+)?)([hms])')
+
+
+@dataclass
+class RefreshPlan:
+    """Jobs to refresh, most overdue first, and the fresh ones left out"""
+    due: list = field(default_factory=list)
+    fresh: list = field(default_factory=list)
+
+
+def parse_budget(text: str) -> float:
+    """Seconds from a budget like '10m', '90s', '1h30m' or a bare number of minutes"""
+    text = text.strip().lower()
+    try:
+        return float(text) * 60
+    except ValueError:
+        pass
+    parts = _BUDGET_PART.findall(text)
+    if not parts or ''.join(number + unit for number, unit in parts) != text:
+        raise ValueError(f"Invalid budget '{text}' (use e.g. 10m, 90s, 1h30m)")
+    scale = {'h': 3600, 'm': 60, 's': 1}
+    return sum(float(number) * scale[unit] for number, unit in parts)
+
+
+def refresh_priority(
+    days_since_crawl: float | None,
+    average_views: int | None,
+    recent_uploads: int,
+    stored_subscribers: int | None,
+    current_subscribers: int | None,
+) -> float:
+    """How overdue a channel is; inf if never crawled, below 1 if its stats are still fresh"""
+    if days_since_crawl is None or not average_views:
+        return math.inf
+    activity = 1 + min(recent_uploads, ACTIVITY_WINDOW_DAYS) / 10
+    priority = days_since_crawl / REFRESH_INTERVAL_DAYS * activity
+    if stored_subscribers and current_subscribers is not None:
+        priority += abs(current_subscribers - stored_subscribers) / stored_subscribers * SUBSCRIBER_DELTA_WEIGHT
+    return priority
+
+
+def plan_refresh(
+    conn: sqlite3.Connection,
+    jobs: list,
+    include_fresh: bool = False,
+    now: datetime | None = None,
+) -> RefreshPlan:
+    """Order (channel_id, info) jobs by refresh priority and split off the ones to skip"""
+    now = now or datetime.now()
+    # Naive local time, like the dates scrape-videos stores (datetime('now') would be UTC)
+    activity_cutoff = (now - timedelta(days=ACTIVITY_WINDOW_DAYS)).isoformat()
+    # last_updated is SQLite's CURRENT_TIMESTAMP, which is UTC
+    crawl_clock = now.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    index = ChannelIndex.load(conn)
+    stored = {
+        row['id']: row for row in conn.execute('''
+            SELECT id, average_views, subscriber_count,
+                   julianday(?) - julianday(last_updated) AS days_since_crawl
+            FROM channels
+        ''', (crawl_clock,))
+    }
+    uploads = dict(conn.execute(
+        'SELECT channel_id, COUNT(*) FROM videos WHERE published_date >= ? GROUP BY channel_id',
+        (activity_cutoff,),
+    ).fetchall())
+
+    plan = RefreshPlan()
+    ranked = []
+    for channel_id, info in jobs:
+        canonical = index.resolve(info.get('youtube_id'), info.get('handle'), channel_id)
+        row = stored.get(canonical)
+        priority = refresh_priority(
+            row['days_since_crawl'] if row else None,
+            row['average_views'] if row else None,
+            uploads.get(canonical, 0),
+            row['subscriber_count'] if row else None,
+            info.get('subscriber_count'),
+        )
+        if priority < 1 and not include_fresh:
+            plan.fresh.append((channel_id, info))
+        else:
+            ranked.append((priority, channel_id, info))
+
+    ranked.sort(key=lambda item: item[0], reverse=True)  # Stable: ties keep channel-list order
+    plan.due = [(channel_id, info) for _, channel_id, info in ranked]
+    return plan
@@ -0,0 +1,115 @@
+"""
+Request blocking for scraper pages.
+
+The scrapers only read text, hrefs and embedded JSON, yet a full Chrome page
+downloads every thumbnail, avatar, font and video preview. ``RequestBlocker``
+is installed as a route on the browser context (so worker pages opened later
+are covered too) and aborts requests by resource type or by host. Playwright
+cannot see the size of a request it never sent, so bytes saved are estimated
+from typical YouTube asset sizes.
+
+``page.request`` fetches (InnerTube JSON, channel pages read as text) do not go
+through routes and are never blocked. Note that Playwright disables the HTTP
+cache while a route is installed, so scripts are re-fetched per navigation;
+pass ``--block none`` when that costs more than the assets saved.
+"""
+
+from urllib.parse import urlsplit
+
+DEFAULT_BLOCK_SPEC = 'image,media,font,ads'
+
+# Resource types that can be blocked; document, script, xhr and fetch carry the data we read
+BLOCKABLE_RESOURCE_TYPES = ('image', 'media', 'font', 'stylesheet')
+
+# Third-party ad and analytics hosts loaded by YouTube pages ('ads' in a block spec)
+AD_HOSTS = (
+    'doubleclick.net',
+    'googlesyndication.com',
+    'googleadservices.com',
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googletagservices.com',
+    'imasdk.googleapis.com',
+)
+
+# Rough transfer size of one blocked request, by resource type
+ESTIMATED_BYTES = {
+    'image': 20_000,  # Thumbnails are ~15-40 KB, avatars a few KB
+    'media': 250_000,  # Hover previews stream in segments of a few hundred KB
+    'font': 30_000,
+    'stylesheet': 20_000,
+}
+ESTIMATED_OTHER_BYTES = 5_000  # Ad and analytics scripts, beacons
+
+
+def _matches_host(host: str, blocked: str) -> bool:
+    return host == blocked or host.endswith('.' + blocked)
+
+
+class RequestBlocker:
+    """Decide which requests to abort and count what was blocked"""
+
+    def __init__(self, resource_types=(), hosts=()):
+        self.resource_types = frozenset(resource_types)
+        self.hosts = tuple(hosts)
+        self.stats = {'requests': 0, 'blocked': 0, 'estimated_bytes': 0}
+        self.blocked_by_type: dict[str, int] = {}
+
+    @classmethod
+    def from_spec(cls, spec: str) -> 'RequestBlocker':
+        """Blocker from a comma-separated list of resource types, host names, 'ads' or 'none'"""
+        resource_types, hosts = [], []
+        for item in (part.strip().lower() for part in spec.split(',')):
+            if not item or item == 'none':
+                continue
+            if item == 'ads':
+                hosts.extend(AD_HOSTS)
+            elif item in BLOCKABLE_RESOURCE_TYPES:
+                resource_types.append(item)
+            elif '.' in item:
+                hosts.append(item)
+            else:
+                raise ValueError(
+                    f"Unknown block item '{item}' (use {', '.join(BLOCKABLE_RESOURCE_TYPES)}, ads, none or a host name)"
+                )
+        return cls(resource_types, hosts)
+
+    def __bool__(self) -> bool:
+        return bool(self.resource_types or self.hosts)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.resource_types:
+            return True
+        host = urlsplit(url).hostname or ''
+        return any(_matches_host(host, blocked) for blocked in self.hosts)
+
+    def check(self, resource_type: str, url: str) -> bool:
+        """should_block() for a live request, counting the ones blocked"""
+        self.stats['requests'] += 1
+        if not self.should_block(resource_type, url):
+            return False
+        self.stats['blocked'] += 1
+        self.stats['estimated_bytes'] += ESTIMATED_BYTES.get(resource_type, ESTIMATED_OTHER_BYTES)
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+        return True
+
+    def handle_route(self, route) -> None:
+        """Route handler for the sync Playwright API"""
+        if self.check(route.request.resource_type, route.request.url):
+            route.abort('blockedbyclient')
+        else:
+            route.continue_()
+
+    async def handle_route_async(self, route) -> None:
+        """Route handler for the async Playwright API"""
+        if self.check(route.request.resource_type, route.request.url):
+            await route.abort('blockedbyclient')
+        else:
+            await route.continue_()
+
+    def summary(self) -> str:
+        stats = self.stats
+        by_type = ', '.join(f"{count} {kind}" for kind, count in sorted(self.blocked_by_type.items()))
+        saved = stats['estimated_bytes']
+        size = f"{saved / (1024 * 1024):.1f} MB" if saved >= 1024 * 1024 else f"{saved / 1024:.0f} KB"
+        return f"Blocked {stats['blocked']} of {stats['requests']} page requests ({by_type}), ~{size} saved (estimated)"
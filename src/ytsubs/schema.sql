@@ -9,6 +9,8 @@ CREATE TABLE IF NOT EXISTS channels (
     thumbnail_url TEXT,
     is_verified BOOLEAN DEFAULT 0,
     average_views INTEGER DEFAULT 0,
+    average_views_samples INTEGER,  -- Videos the average was computed from; NULL if unknown
+    average_views_source TEXT,  -- 'crawl' (channel page) or 'history' (stored videos)
     last_updated TIMESTAMP
 );
 
@@ -18,12 +20,14 @@ CREATE TABLE IF NOT EXISTS videos (
     url TEXT NOT NULL,
     channel_id TEXT NOT NULL,
     views INTEGER DEFAULT 0,
+    views_updated TIMESTAMP,  -- When views was last read, in naive local time like published_date; NULL if unknown
     published_date TIMESTAMP,
+    published_precision INTEGER,  -- Seconds the published_date may be off by; NULL if unknown
     thumbnail TEXT,
     duration TEXT,
+    duration_seconds INTEGER,
     discovered_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (channel_id) REFERENCES channels(id)
 );
 
-CREATE INDEX IF NOT EXISTS idx_videos_published_date ON videos(published_date);
-CREATE INDEX IF NOT EXISTS idx_videos_channel_id ON videos(channel_id); 
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_videos_published_date ON videos(published_date); 
\ No newline at end of file
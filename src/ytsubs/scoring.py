@@ -0,0 +1,660 @@
+"""
+Performance scoring for the feed.
+
+Scores are split into parts that only change when a video or its channel
+changes (kept in the ``video_scores`` table by triggers) and parts that depend
+on the current time (age, velocity, 48h forecast), which are computed at read
+time from the stored Julian publish date.
+
+Ranking happens in numpy: ``load_score_columns`` reads video_scores once into
+column arrays and each score component is computed as a whole column.
+``REFERENCE_SCORE_SQL`` is the original full-recompute query, kept to check the
+engine against (``ytsubs db check-scores``).
+"""
+
+import math
+import sqlite3
+from dataclasses import dataclass
+from typing import Iterator
+
+import numpy as np
+
+NAN = math.nan
+LN_10 = math.log(10)  # SQLite's LOG10() is ln(x)/ln(10), not C log10(); match it to the last bit
+
+# Full recompute over every video. Bind :now to julianday('now').
+REFERENCE_SCORE_SQL = '''
+    WITH ChannelStats AS (
+        SELECT 
+            channel_id,
+            AVG(views * 1.0 / c.subscriber_count) as avg_view_sub_ratio,
+            -- Calculate median views for better outlier handling
+            -- Using approximate median calculation
+            AVG(views) as avg_views,
+            COUNT(*) as video_count
+        FROM videos v
+        JOIN channels c ON v.channel_id = c.id
+        WHERE c.subscriber_count > 0
+        GROUP BY channel_id
+    ), VideoMetrics AS (
+        SELECT
+            v.*,
+            c.name as channel_name,
+            c.subscriber_count,
+            c.is_verified,
+            c.thumbnail_url as channel_thumbnail,
+            c.average_views as channel_average_views,
+            cs.avg_view_sub_ratio,
+            -- Calculate video age in hours
+            (:now - julianday(v.published_date)) * 24 as video_age_hours,
+            -- Views per hour (velocity metric)
+            CASE 
+                WHEN (:now - julianday(v.published_date)) * 24 > 0 
+                THEN v.views * 1.0 / ((:now - julianday(v.published_date)) * 24)
+                ELSE v.views 
+            END as views_per_hour,
+            -- Observed fraction of 48h views, assuming ~60% in first 8h and 95% by 48h
+            CASE
+                WHEN (:now - julianday(v.published_date)) * 24 <= 0 THEN 0.05
+                WHEN (:now - julianday(v.published_date)) * 24 <= 8 THEN 
+                    MAX(0.05, 0.6 * (((:now - julianday(v.published_date)) * 24) / 8.0))
+                WHEN (:now - julianday(v.published_date)) * 24 < 48 THEN 
+                    0.6 + 0.35 * ((((:now - julianday(v.published_date)) * 24) - 8.0) / 40.0)
+                ELSE 0.95
+            END as observed_fraction_48h,
+            -- Predicted 48h views based on the above curve
+            CASE
+                WHEN (:now - julianday(v.published_date)) * 24 < 48 THEN
+                    v.views * 0.95 / NULLIF(
+                        CASE
+                            WHEN (:now - julianday(v.published_date)) * 24 <= 0 THEN 0.05
+                            WHEN (:now - julianday(v.published_date)) * 24 <= 8 THEN 
+                                MAX(0.05, 0.6 * (((:now - julianday(v.published_date)) * 24) / 8.0))
+                            WHEN (:now - julianday(v.published_date)) * 24 < 48 THEN 
+                                0.6 + 0.35 * ((((:now - julianday(v.published_date)) * 24) - 8.0) / 40.0)
+                        END,
+                        0.05
+                    )
+                ELSE v.views
+            END as predicted_views_48h
+        FROM videos v
+        JOIN channels c ON v.channel_id = c.id
+        JOIN ChannelStats cs ON v.channel_id = cs.channel_id
+    )
+    SELECT 
+        vm.id,
+        vm.title,
+        vm.url,
+        vm.thumbnail as thumbnail,
+        vm.views as views,
+        vm.published_date,
+        vm.duration,
+        vm.channel_name,
+        vm.subscriber_count,
+        vm.is_verified,
+        vm.channel_thumbnail,
+        vm.channel_average_views,
+        vm.avg_view_sub_ratio,
+        vm.video_age_hours,
+        vm.views_per_hour,
+        vm.observed_fraction_48h,
+        vm.predicted_views_48h,
+
+        -- PERFORMANCE SCORE focused on standout content with early-velocity forecast
+        CASE 
+            WHEN vm.subscriber_count > 0 AND vm.channel_average_views > 0 THEN 
+                (
+                    -- 1. Base performance relative to channel average (35% weight)
+                    (MIN(vm.views * 1.0 / NULLIF(vm.channel_average_views, 0), 5.0) / 5.0) * 0.35 +
+
+                    -- 2. Subscriber engagement rate (25% weight)
+                    CASE 
+                        WHEN vm.subscriber_count > 0 THEN
+                            MIN(SQRT((vm.views * 1.0 / vm.subscriber_count) * 10), 1.0) * 0.25
+                        ELSE 0
+                    END +
+
+                    -- 3. Forecasted 48h performance (20% weight)
+                    (MIN(vm.predicted_views_48h * 1.0 / NULLIF(vm.channel_average_views, 0), 5.0) / 5.0) * 0.20 +
+
+                    -- 4. Velocity metric (10% weight)
+                    CASE
+                        WHEN vm.video_age_hours > 1 THEN
+                            MIN(LOG10(1 + (vm.views * 1.0 / NULLIF(vm.video_age_hours, 1))) / 5.0, 1.0) * 0.10
+                        ELSE 0.10
+                    END +
+
+                    -- 5. Channel size normalization (7% weight)
+                    CASE
+                        WHEN vm.subscriber_count < 100000 THEN 0.07
+                        WHEN vm.subscriber_count < 1000000 THEN 0.05
+                        WHEN vm.subscriber_count < 10000000 THEN 0.02
+                        ELSE 0
+                    END +
+
+                    -- 6. Duration adjustment (3% weight)
+                    CASE
+                        WHEN vm.duration_seconds IS NOT NULL AND vm.duration_seconds > 0 THEN
+                            CASE
+                                WHEN vm.duration_seconds < 120 THEN 0.01  -- < 2 minutes
+                                WHEN vm.duration_seconds < 600 THEN 0.02  -- 2-10 minutes
+                                WHEN vm.duration_seconds < 1800 THEN 0.03 -- 10-30 minutes (sweet spot)
+                                WHEN vm.duration_seconds < 3600 THEN 0.02 -- 30-60 minutes
+                                ELSE 0.015 -- > 60 minutes
+                            END
+                        ELSE 0.015 -- Default if no duration
+                    END
+                )
+
+            ELSE 0 
+        END as performance_score,
+
+        -- Individual score components for debugging
+        CASE WHEN vm.channel_average_views > 0 THEN (vm.views * 1.0 / NULLIF(vm.channel_average_views, 0)) ELSE 0 END as relative_performance,
+        CASE WHEN vm.subscriber_count > 0 THEN (vm.views * 1.0 / vm.subscriber_count) ELSE 0 END as subscriber_reach,
+        CASE WHEN vm.channel_average_views > 0 THEN (vm.predicted_views_48h * 1.0 / NULLIF(vm.channel_average_views, 0)) ELSE 0 END as forecast_relative_performance,
+        CASE WHEN vm.video_age_hours > 1 THEN
+            vm.views * 1.0 / vm.video_age_hours
+        ELSE vm.views END as velocity
+
+    FROM VideoMetrics vm
+    ORDER BY performance_score DESC, vm.published_date DESC
+'''
+
+# Time-independent inputs and score terms for the videos selected by the WHERE clause
+# that callers append. Terms are kept separate so the read path can add them up in
+# exactly the order the reference query does.
+_SCORE_ROWS_SELECT = '''
+    SELECT
+        v.id,
+        v.channel_id,
+        julianday(v.published_date),
+        v.views,
+        c.subscriber_count,
+        c.average_views,
+        CASE WHEN c.subscriber_count > 0 AND c.average_views > 0 THEN 1 ELSE 0 END,
+        CASE WHEN c.average_views > 0 THEN (v.views * 1.0 / NULLIF(c.average_views, 0)) ELSE 0 END,
+        CASE WHEN c.subscriber_count > 0 THEN (v.views * 1.0 / c.subscriber_count) ELSE 0 END,
+        (MIN(v.views * 1.0 / NULLIF(c.average_views, 0), 5.0) / 5.0) * 0.35 +
+        CASE
+            WHEN c.subscriber_count > 0 THEN
+                MIN(SQRT((v.views * 1.0 / c.subscriber_count) * 10), 1.0) * 0.25
+            ELSE 0
+        END,
+        CASE
+            WHEN c.subscriber_count < 100000 THEN 0.07
+            WHEN c.subscriber_count < 1000000 THEN 0.05
+            WHEN c.subscriber_count < 10000000 THEN 0.02
+            ELSE 0
+        END,
+        CASE
+            WHEN v.duration_seconds IS NOT NULL AND v.duration_seconds > 0 THEN
+                CASE
+                    WHEN v.duration_seconds < 120 THEN 0.01
+                    WHEN v.duration_seconds < 600 THEN 0.02
+                    WHEN v.duration_seconds < 1800 THEN 0.03
+                    WHEN v.duration_seconds < 3600 THEN 0.02
+                    ELSE 0.015
+                END
+            ELSE 0.015
+        END
+    FROM videos v
+    JOIN channels c ON v.channel_id = c.id
+    WHERE c.subscriber_count > 0
+'''
+
+_SCORE_ROWS_INSERT = '''
+    INSERT OR REPLACE INTO video_scores (
+        video_id, channel_id, published_jd, views, subscriber_count, channel_average_views,
+        scoreable, relative_performance, subscriber_reach, base_score, size_score, duration_score
+    )
+''' + _SCORE_ROWS_SELECT
+
+VIDEO_SCORES_SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS video_scores (
+    video_id TEXT PRIMARY KEY,
+    channel_id TEXT NOT NULL,
+    published_jd REAL,
+    views INTEGER,
+    subscriber_count INTEGER,
+    channel_average_views INTEGER,
+    scoreable INTEGER NOT NULL,
+    relative_performance REAL,
+    subscriber_reach REAL,
+    base_score REAL,  -- channel-relative (35%) + subscriber reach (25%)
+    size_score REAL,  -- channel size normalization (7%)
+    duration_score REAL  -- duration adjustment (3%)
+);
+
+CREATE INDEX IF NOT EXISTS idx_video_scores_channel_id ON video_scores(channel_id);
+
+CREATE TRIGGER IF NOT EXISTS video_scores_video_insert AFTER INSERT ON videos BEGIN
+    {_SCORE_ROWS_INSERT} AND v.id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS video_scores_video_update
+AFTER UPDATE OF channel_id, views, published_date, duration_seconds ON videos BEGIN
+    DELETE FROM video_scores WHERE video_id = NEW.id;
+    {_SCORE_ROWS_INSERT} AND v.id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS video_scores_video_delete AFTER DELETE ON videos BEGIN
+    DELETE FROM video_scores WHERE video_id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS video_scores_channel_insert AFTER INSERT ON channels BEGIN
+    {_SCORE_ROWS_INSERT} AND v.channel_id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS video_scores_channel_update
+AFTER UPDATE OF subscriber_count, average_views ON channels BEGIN
+    DELETE FROM video_scores WHERE channel_id = NEW.id;
+    {_SCORE_ROWS_INSERT} AND v.channel_id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS video_scores_channel_delete AFTER DELETE ON channels BEGIN
+    DELETE FROM video_scores WHERE channel_id = OLD.id;
+END;
+'''
+
+# Everything the ranking needs, read in one pass over video_scores
+_SCORE_COLUMNS_SQL = '''
+    SELECT
+        s.video_id,
+        s.channel_id,
+        s.published_jd,
+        s.views,
+        s.subscriber_count,
+        s.channel_average_views,
+        s.scoreable,
+        s.size_score,
+        s.duration_score,
+        v.published_date,
+        v.rowid
+    FROM video_scores s
+    JOIN videos v ON v.id = s.video_id
+'''
+
+# AVG() per channel over the same rows, as the reference query's ChannelStats computes it
+_CHANNEL_RATIO_SQL = '''
+    SELECT channel_id, AVG(views * 1.0 / subscriber_count)
+    FROM video_scores
+    GROUP BY channel_id
+'''
+
+# Display fields, fetched only for the rows being emitted (by rowid: one b-tree search per video)
+_DISPLAY_SQL = '''
+    SELECT
+        v.rowid,
+        v.title,
+        v.url,
+        v.thumbnail,
+        v.duration,
+        c.name,
+        c.is_verified,
+        c.thumbnail_url,
+        c.average_views_samples,
+        c.average_views_source
+    FROM videos v
+    JOIN channels c ON c.id = v.channel_id
+    WHERE v.rowid IN ({placeholders})
+'''
+DISPLAY_BATCH_SIZE = 500
+
+# Weight of each score component in the reference query, in the order it adds them up
+DEFAULT_WEIGHTS = {
+    'channel_relative': 0.35,
+    'subscriber_reach': 0.25,
+    'forecast_48h': 0.20,
+    'velocity': 0.10,
+    'channel_size': 0.07,
+    'duration': 0.03,
+}
+
+# Components stored already weighted (tiers in video_scores); scaled by weight / default
+_PRESCALED_COMPONENTS = ('channel_size', 'duration')
+
+
+@dataclass(frozen=True)
+class ForecastCurve:
+    """Assumed share of a video's 48h views seen by a given age.
+
+    Linear up to ``early_fraction`` at ``early_hours``, then linear up to
+    ``full_fraction`` at ``full_hours``; never below ``floor``.
+    """
+    early_hours: float = 8.0
+    early_fraction: float = 0.6
+    full_hours: float = 48.0
+    full_fraction: float = 0.95
+    floor: float = 0.05
+
+
+DEFAULT_CURVE = ForecastCurve()
+
+
+@dataclass
+class ScoreColumns:
+    """Column-oriented copy of video_scores plus the publish date used to break ties.
+
+    Numeric columns are float64 arrays with NaN standing in for SQL NULL, which keeps
+    the reference query's NULL propagation (e.g. an undated video) intact.
+    """
+    video_ids: list[str]
+    channel_ids: list[str]
+    published_jd: np.ndarray
+    views: np.ndarray
+    subscriber_count: np.ndarray
+    channel_average_views: np.ndarray
+    scoreable: np.ndarray
+    size_score: np.ndarray
+    duration_score: np.ndarray
+    published_date: list[str | None]
+    video_rowids: list[int]
+
+    def __len__(self) -> int:
+        return len(self.video_ids)
+
+
+def _float_column(values: tuple) -> np.ndarray:
+    """float64 array for one column; numpy turns NULL (None) into NaN"""
+    return np.array(values, dtype=np.float64)
+
+
+def load_score_columns(conn: sqlite3.Connection) -> ScoreColumns:
+    """Read video_scores once into column arrays"""
+    cursor = conn.cursor()
+    cursor.row_factory = None  # Plain tuples transpose much faster than sqlite3.Row
+    rows = cursor.execute(_SCORE_COLUMNS_SQL).fetchall()
+    if not rows:
+        empty = np.empty(0, dtype=np.float64)
+        return ScoreColumns([], [], *(empty for _ in range(4)), np.empty(0, dtype=bool), empty, empty, [], [])
+
+    (video_ids, channel_ids, published_jd, views, subscriber_count, channel_average_views,
+     scoreable, size_score, duration_score, published_date, video_rowids) = zip(*rows)
+    return ScoreColumns(
+        video_ids=list(video_ids),
+        channel_ids=list(channel_ids),
+        published_jd=_float_column(published_jd),
+        views=_float_column(views),
+        subscriber_count=_float_column(subscriber_count),
+        channel_average_views=_float_column(channel_average_views),
+        scoreable=np.array(scoreable, dtype=bool),
+        size_score=_float_column(size_score),
+        duration_score=_float_column(duration_score),
+        published_date=list(published_date),
+        video_rowids=list(video_rowids),
+    )
+
+
+def compute_metrics(columns: ScoreColumns, now: float, curve: ForecastCurve = DEFAULT_CURVE) -> dict[str, np.ndarray]:
+    """Time-dependent per-video metrics (age, velocity, 48h forecast) as whole columns"""
+    views = columns.views
+    early_hours, early_fraction = curve.early_hours, curve.early_fraction
+    full_hours, full_fraction, floor = curve.full_hours, curve.full_fraction, curve.floor
+    late_gain = full_fraction - early_fraction
+    late_hours = full_hours - early_hours
+    with np.errstate(all='ignore'):  # Branches not taken may divide by zero or meet NaN
+        age = (now - columns.published_jd) * 24
+        observed = np.select(
+            [age <= 0, age <= early_hours, age < full_hours],
+            [
+                floor,
+                np.maximum(floor, early_fraction * (age / early_hours)),
+                early_fraction + late_gain * ((age - early_hours) / late_hours),
+            ],
+            default=full_fraction,
+        )
+        predicted = np.where(
+            age < full_hours,
+            # NULLIF(observed, 0.05) in the reference query: the floor value yields NULL
+            np.where(observed == floor, NAN, views * full_fraction / observed),
+            views,
+        )
+        views_per_hour = np.where(age > 0, views / age, views)
+    return {
+        'video_age_hours': age,
+        'views_per_hour': views_per_hour,
+        'observed_fraction_48h': observed,
+        'predicted_views_48h': predicted,
+    }
+
+
+def compute_components(columns: ScoreColumns, metrics: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Each score component as a column, before weighting (0..1, tiers excepted)"""
+    views = columns.views
+    average = columns.channel_average_views
+    subscribers = columns.subscriber_count
+    age = metrics['video_age_hours']
+    with np.errstate(all='ignore'):
+        return {
+            'channel_relative': np.where(average > 0, np.minimum(views / average, 5.0) / 5.0, NAN),
+            'subscriber_reach': np.where(subscribers > 0, np.minimum(np.sqrt((views / subscribers) * 10), 1.0), 0.0),
+            'forecast_48h': np.where(average > 0, np.minimum(metrics['predicted_views_48h'] / average, 5.0) / 5.0, NAN),
+            'velocity': np.where(age > 1, np.minimum(np.log(1 + (views / age)) / LN_10 / 5.0, 1.0), 1.0),
+            'channel_size': columns.size_score,
+            'duration': columns.duration_score,
+        }
+
+
+def combine_components(
+    columns: ScoreColumns,
+    components: dict[str, np.ndarray],
+    weights: dict[str, float] | None = None,
+) -> np.ndarray:
+    """Weighted sum of the component columns; NaN marks a score the reference leaves NULL"""
+    weights = weights or DEFAULT_WEIGHTS
+    scores = np.zeros(len(columns))
+    # Added one component at a time, in reference order, so default weights match exactly
+    for name, default in DEFAULT_WEIGHTS.items():
+        weight = weights.get(name, default)
+        values = components[name]
+        if name in _PRESCALED_COMPONENTS:
+            if weight == default:
+                scores = scores + values
+                continue
+            weight = weight / default
+        scores = scores + values * weight
+    return np.where(columns.scoreable, scores, 0.0)
+
+
+def rank_order(columns: ScoreColumns, scores: np.ndarray) -> np.ndarray:
+    """Row indexes by score descending, then newest first; NULL scores and dates sort last like SQL"""
+    # Sorting the date text, not published_jd, keeps SQL's tie order when date formats are mixed
+    dates = np.array([date or '' for date in columns.published_date])  # '' sorts below every date, like NULL
+    newest_first = np.argsort(dates, kind='stable')[::-1]
+    sort_keys = np.where(np.isnan(scores), np.inf, -scores)[newest_first]
+    return newest_first[np.argsort(sort_keys, kind='stable')]
+
+
+class ComponentCache:
+    """Component columns for one snapshot of video_scores, computed once per forecast curve.
+
+    Ranking under another set of weights is then a linear combination plus a sort,
+    with no further database reads.
+    """
+
+    def __init__(self, columns: ScoreColumns, now: float):
+        self.columns = columns
+        self.now = now
+        self._by_curve: dict[ForecastCurve, tuple[dict[str, np.ndarray], dict[str, np.ndarray]]] = {}
+
+    def get(self, curve: ForecastCurve = DEFAULT_CURVE) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+        """(metrics, components) for ``curve``"""
+        if curve not in self._by_curve:
+            metrics = compute_metrics(self.columns, self.now, curve)
+            self._by_curve[curve] = (metrics, compute_components(self.columns, metrics))
+        return self._by_curve[curve]
+
+    def scores(self, weights: dict[str, float] | None = None, curve: ForecastCurve = DEFAULT_CURVE) -> np.ndarray:
+        return combine_components(self.columns, self.get(curve)[1], weights)
+
+
+def _iter_display(conn: sqlite3.Connection, rowids: list[int]) -> Iterator[tuple]:
+    """Yield the display fields of each video rowid in turn, reading the text columns a batch at a time"""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    for start in range(0, len(rowids), DISPLAY_BATCH_SIZE):
+        batch = rowids[start:start + DISPLAY_BATCH_SIZE]
+        sql = _DISPLAY_SQL.format(placeholders=', '.join('?' * len(batch)))
+        found = {row[0]: row[1:] for row in cursor.execute(sql, batch)}
+        for rowid in batch:
+            yield found[rowid]
+
+
+def _zero_nan(values: np.ndarray) -> list[float]:
+    """Column as a list with NaN (SQL NULL) reported as 0, like the feed always has"""
+    return np.where(np.isnan(values), 0.0, values).tolist()
+
+
+def score_videos(conn: sqlite3.Connection, now: float | None = None, profiles: list | None = None) -> list[dict]:
+    """Ranked feed rows with the keys the reference query returns, plus channel average provenance"""
+    return list(iter_scored_videos(conn, now, profiles))
+
+
+def iter_scored_videos(conn: sqlite3.Connection, now: float | None = None, profiles: list | None = None) -> Iterator[dict]:
+    """Yield ranked feed rows one at a time, so callers can stream them out.
+
+    ``profiles`` are RankingProfile objects; the first one orders the rows and fills
+    ``performance_score``. With more than one, every row also gets ``profile_scores``
+    keyed by profile name.
+    """
+    now = julian_now(conn) if now is None else now
+    columns = load_score_columns(conn)
+    cache = ComponentCache(columns, now)
+    curve = profiles[0].curve if profiles else DEFAULT_CURVE
+    weights = profiles[0].weights if profiles else None
+    metrics, _ = cache.get(curve)
+    scores = cache.scores(weights, curve)
+    extra_scores = {
+        profile.name: cache.scores(profile.weights, profile.curve)
+        for profile in profiles or []
+    } if profiles and len(profiles) > 1 else {}
+    ratios = dict(conn.execute(_CHANNEL_RATIO_SQL).fetchall())
+    order = rank_order(columns, scores)
+
+    # Every field is computed as a whole column and put in rank order before it becomes a
+    # Python list, so the loop below walks each list front to back instead of hopping around
+    views = columns.views
+    average = columns.channel_average_views
+    subscribers = columns.subscriber_count
+    age = metrics['video_age_hours']
+    predicted = metrics['predicted_views_48h']
+    with np.errstate(all='ignore'):
+        relative_performance = np.where(average > 0, views / average, 0.0)
+        subscriber_reach = np.where(subscribers > 0, views / subscribers, 0.0)
+        forecast_relative = np.where(average > 0, predicted / average, 0.0)
+        velocity = np.where(age > 1, views / age, views)
+    ranked_lists = [
+        _zero_nan(values[order]) for values in (
+            age, metrics['views_per_hour'], predicted, scores,
+            relative_performance, subscriber_reach, forecast_relative, velocity,
+        )
+    ]
+    ranked_ids = [columns.video_ids[i] for i in order.tolist()]
+    rows = zip(
+        ranked_ids,
+        [columns.channel_ids[i] for i in order.tolist()],
+        [columns.published_date[i] for i in order.tolist()],
+        [None if math.isnan(v) else int(v) for v in views[order].tolist()],
+        [None if math.isnan(avg) else int(avg) for avg in average[order].tolist()],
+        subscribers[order].astype(np.int64).tolist(),
+        metrics['observed_fraction_48h'][order].tolist(),
+        *ranked_lists,
+        _iter_display(conn, [columns.video_rowids[i] for i in order.tolist()]),
+    )
+    extra_scores = {name: _zero_nan(values[order]) for name, values in extra_scores.items()}
+
+    for rank, (video_id, channel_id, published_date, view_count, average_views, subscriber_count, observed,
+               age_hours, views_per_hour, predicted_views, score, relative, reach, forecast, speed,
+               display) in enumerate(rows):
+        (title, url, thumbnail, duration, channel_name, is_verified, channel_thumbnail,
+         average_samples, average_source) = display
+        video = {
+            'id': video_id,
+            'title': title,
+            'url': url,
+            'thumbnail': thumbnail,
+            'views': view_count,
+            'published_date': published_date,
+            'duration': duration,
+            'channel_name': channel_name,
+            'subscriber_count': subscriber_count,
+            'is_verified': is_verified,
+            'channel_thumbnail': channel_thumbnail,
+            'channel_average_views': average_views,
+            'channel_average_views_samples': average_samples,
+            'channel_average_views_source': average_source,
+            'avg_view_sub_ratio': ratios.get(channel_id),
+            'video_age_hours': age_hours,
+            'views_per_hour': views_per_hour,
+            'observed_fraction_48h': observed,
+            'predicted_views_48h': predicted_views,
+            'performance_score': score,
+            'relative_performance': relative,
+            'subscriber_reach': reach,
+            'forecast_relative_performance': forecast,
+            'velocity': speed,
+        }
+        if extra_scores:
+            video['profile_scores'] = {name: values[rank] for name, values in extra_scores.items()}
+        yield video
+
+
+def julian_now(conn: sqlite3.Connection) -> float:
+    """SQLite's julianday('now'), so both scoring paths can share one instant"""
+    return conn.execute("SELECT julianday('now')").fetchone()[0]
+
+
+def ensure_video_scores(conn: sqlite3.Connection) -> None:
+    """Create the video_scores table and its triggers, backfilling it on first creation"""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'video_scores'"
+    ).fetchone()
+    conn.executescript(VIDEO_SCORES_SCHEMA)
+    if not exists:
+        rebuild_video_scores(conn)
+
+
+def rebuild_video_scores(conn: sqlite3.Connection) -> None:
+    """Recompute every stored score row from scratch"""
+    with conn:
+        conn.execute('DELETE FROM video_scores')
+        conn.execute(_SCORE_ROWS_INSERT)
+
+
+def check_video_scores(conn: sqlite3.Connection, tolerance: float = 1e-9) -> list[str]:
+    """Compare the scoring engine over video_scores with the reference SQL; returns a list of problems"""
+    now = julian_now(conn)
+    reference = [
+        (row['id'], row['performance_score'] or 0.0)
+        for row in conn.execute(REFERENCE_SCORE_SQL, {'now': now})
+    ]
+    incremental = [
+        (video['id'], video['performance_score'])
+        for video in score_videos(conn, now)
+    ]
+
+    problems = []
+    reference_scores = dict(reference)
+    incremental_scores = dict(incremental)
+    missing = reference_scores.keys() - incremental_scores.keys()
+    extra = incremental_scores.keys() - reference_scores.keys()
+    if missing:
+        problems.append(f"{len(missing)} videos missing from video_scores (e.g. {sorted(missing)[:3]})")
+    if extra:
+        problems.append(f"{len(extra)} stale rows in video_scores (e.g. {sorted(extra)[:3]})")
+
+    drifted = [
+        video_id for video_id, score in reference_scores.items()
+        if video_id in incremental_scores and abs(score - incremental_scores[video_id]) > tolerance
+    ]
+    if drifted:
+        problems.append(f"{len(drifted)} scores differ by more than {tolerance} (e.g. {drifted[:3]})")
+
+    # Compare rank by rank on score so ties may come back in either order
+    if not problems and any(
+        abs(ref_score - inc_score) > tolerance
+        for (_, ref_score), (_, inc_score) in zip(reference, incremental)
+    ):
+        problems.append("Ranking order differs from the full recompute")
+    return problems
@@ -1,13 +1,86 @@
-import json
+import asyncio
 import re
+import time
+from collections import deque
 
+from .async_base_scraper import AsyncBaseScraper
 from .base_scraper import BaseScraper
+from .channel_aliases import ChannelIndex, record_channel_aliases, resolve_channel_id
+from .channel_averages import (
+    CHANNEL_SAMPLE_SIZE,
+    HISTORY_MIN_SAMPLES,
+    NO_VIEWS,
+    SOURCE_CRAWL,
+    SOURCE_HISTORY,
+    load_history_views,
+    trimmed_average,
+)
 from .db_schema import YouTubeDB
+from .innertube import (
+    browse_continuation_request,
+    continuation_token,
+    extract_initial_data,
+    extract_ytcfg,
+    iter_feed_items,
+    iter_nodes,
+)
+from .refresh_schedule import plan_refresh
+from .request_blocking import DEFAULT_BLOCK_SPEC, RequestBlocker
+
+CHANNEL_FETCH_TIMEOUT_MS = 10000
+MAX_CHANNEL_LIST_PAGES = 200  # Continuation pages of the channels feed, as a loop guard
+
+# Collects view counts for the first 30 videos of a channel's /videos grid
+CHANNEL_VIEWS_SCRIPT = """() => {
+    const processViewCount = (text) => {
+        if (!text) return 0;
+        text = text.toLowerCase().replace('views', '').replace(',', '').trim();
+        try {
+            if (text.includes('k')) {
+                return parseFloat(text.replace('k', '')) * 1000;
+            } else if (text.includes('m')) {
+                return parseFloat(text.replace('m', '')) * 1000000;
+            } else {
+                return parseFloat(text);
+            }
+        } catch {
+            return 0;
+        }
+    };
+
+    const videos = Array.from(document.querySelectorAll('ytd-rich-grid-media, ytd-grid-video-renderer')).slice(0, 30);
+    const views = videos.map(video => {
+        const metadataLine = video.querySelector('#metadata-line');
+        if (!metadataLine) return 0;
+
+        const spans = Array.from(metadataLine.querySelectorAll('span'));
+        for (const span of spans) {
+            if (span.textContent.includes('views')) {
+                return processViewCount(span.textContent);
+            }
+        }
+        return 0;
+    }).filter(views => views > 0);
+
+    return views;
+}"""
+
+def check_response(response):
+    """Raise for an error status, so the crawl counts the channel as failed instead of averaging an error page"""
+    if not response.ok:
+        raise RuntimeError(f"HTTP {response.status} for {response.url}")
 
-class ChannelStatsScraper(BaseScraper):
-    def __init__(self, debug=False):
-        super().__init__(debug)
-        self.db = YouTubeDB()
+
+class ChannelStatsMixin:
+    """Page-independent parsing and persistence shared by the sync and async channel scrapers"""
+    db: YouTubeDB
+    workers: int
+    averages: str  # 'json' reads ytInitialData from the raw page, 'dom' renders the /videos grid
+    max_channels: int | None
+    budget: float | None  # Seconds of crawling before the rest waits for the next run
+    deadline: float | None  # time.monotonic() at which the budget runs out
+    refresh_all: bool
+    history: bool  # Average channels from stored videos when there are enough
 
     def parse_subscriber_count(self, count_text):
         """Parse subscriber count from text like '1.2M subscribers', '500K subscribers', etc."""
@@ -50,221 +123,144 @@ class ChannelStatsScraper(BaseScraper):
             print(f"Could not parse subscriber count '{count_text}': {str(e)}")
             return None
 
-    def extract_channel_stats(self):
-        """Extract all channel stats from the channels feed page"""
-        try:
-            print("\nGoing to channels feed page...")
-            response = self.page.goto('https://www.youtube.com/feed/channels')
-            self.page.wait_for_load_state('networkidle')
-            
-            # Get the full page source
-            page_source = self.page.content()
-            
-            # Find all channel renderer JSON objects in the source
-            channel_data = []
-            
-            # Find all instances of channel renderer objects
-            pattern = r'\{"channelRenderer":.+?(?=,\{"channelRenderer"|$)'
-            matches = re.finditer(pattern, page_source, re.DOTALL)
-            
-            for match in matches:
-                try:
-                    # Add closing brace if it was cut off by the regex
-                    json_str = match.group(0)
-                    if not json_str.endswith('}'):
-                        json_str += '}'
-                    
-                    # Parse the JSON object
-                    data = json.loads(json_str)
-                    if data and 'channelRenderer' in data:
-                        channel_data.append(data)
-                except json.JSONDecodeError as e:
-                    print(f"Error parsing channel JSON at position {match.start()}: {str(e)[:100]}")
-                    continue
-            
-            print(f"\nFound {len(channel_data)} channels")
-            
-            channel_info = {}
-            for data in channel_data:
-                try:
-                    channel = data['channelRenderer']
-                    channel_id = channel.get('channelId')
-                    
-                    if not channel_id:
-                        continue
-                    
-                    # Get subscriber count from videoCountText
-                    subscriber_text = None
-                    video_count_text = channel.get('videoCountText', {})
-                    if isinstance(video_count_text, dict):
-                        if 'simpleText' in video_count_text:
-                            subscriber_text = video_count_text['simpleText']
-                        elif 'accessibility' in video_count_text:
-                            subscriber_text = video_count_text.get('accessibility', {}).get('accessibilityData', {}).get('label', '')
-                    
-                    # Get channel handle from subscriberCountText or custom URL
-                    handle = None
-                    subscriber_count_text = channel.get('subscriberCountText', {})
-                    if isinstance(subscriber_count_text, dict) and 'simpleText' in subscriber_count_text:
-                        handle_text = subscriber_count_text['simpleText']
-                        if handle_text.startswith('@'):
-                            handle = handle_text[1:]  # Remove @ symbol
-                    
-                    if not handle:  # Fallback to custom URL
-                        custom_url = channel.get('navigationEndpoint', {}).get('browseEndpoint', {}).get('canonicalBaseUrl', '')
-                        if custom_url.startswith('@'):
-                            handle = custom_url[1:]  # Remove @ symbol
-                    
-                    # Check for verification badge
-                    is_verified = False
-                    owner_badges = channel.get('ownerBadges', [])
-                    for badge in owner_badges:
-                        badge_renderer = badge.get('metadataBadgeRenderer', {})
-                        if badge_renderer.get('style') == 'BADGE_STYLE_TYPE_VERIFIED':
-                            is_verified = True
-                            break
-                    
-                    # Extract all channel information
-                    channel_info[handle] = {
-                        'id': handle,  # Use handle as primary ID
-                        'name': channel.get('title', {}).get('simpleText', ''),
-                        'url': 'https://youtube.com' + channel.get('navigationEndpoint', {}).get('commandMetadata', {}).get('webCommandMetadata', {}).get('url', ''),
-                        'description': channel.get('descriptionSnippet', {}).get('runs', [{}])[0].get('text', ''),
-                        'subscriber_count': self.parse_subscriber_count(subscriber_text),
-                        'thumbnail_url': None,
-                        'is_verified': is_verified,
-                        'handle': handle,
-                        'youtube_id': channel_id  # Store original YouTube ID as a reference
-                    }
-                    
-                    # Get the highest resolution thumbnail
-                    thumbnails = channel.get('thumbnail', {}).get('thumbnails', [])
-                    if thumbnails:
-                        channel_info[handle]['thumbnail_url'] = thumbnails[-1].get('url', '')
-                        if channel_info[handle]['thumbnail_url'].startswith('//'):
-                            channel_info[handle]['thumbnail_url'] = 'https:' + channel_info[handle]['thumbnail_url']
-                    
-                    print(f"Found channel {channel_info[handle]['name']} (@{channel_info[handle]['handle']}): {channel_info[handle]['subscriber_count']:,} subscribers {'✓' if is_verified else ''}")
-                    
-                except Exception as e:
-                    print(f"Error processing channel: {e}")
-                    continue
-            
-            return channel_info
-            
-        except Exception as e:
-            print(f"Error extracting channel stats: {e}")
-            return {}
+    def parse_channel_list(self, page_source):
+        """Parse channel info keyed by handle from the channels feed page source"""
+        return self.read_channel_page(page_source)[0]
 
-    def get_channel_average_views(self, channel_url):
-        """Calculate average views from the last 30 videos by visiting the channel page, excluding top and bottom 3 performing videos"""
-        try:
-            print(f"\nGetting average views from {channel_url}...")
-            
-            # Use commit instead of domcontentloaded - faster and still reliable
-            try:
-                self.page.goto(channel_url + '/videos', timeout=5000, wait_until='commit')
-            except Exception as e:
-                print(f"Initial page load timed out, but continuing anyway: {e}")
-            
-            # Wait for any video to appear
-            try:
-                self.page.wait_for_selector('ytd-rich-grid-media, ytd-grid-video-renderer', timeout=3000)
-            except Exception as e:
-                print(f"Warning: Video grid not found: {e}")
-                return 0  # Return early if no videos found
-            
-            # Quick double-scroll to load more videos
+    def read_channel_page(self, page_source):
+        """Channels on the first page of the channels feed, plus the request for the next page (or None)"""
+        data = extract_initial_data(page_source)
+        if data is None:
+            print("\nNo ytInitialData found in channels page")
+            return {}, None
+
+        channel_info = self.channel_info_from_data(data)
+        print(f"\nFound {len(channel_info)} channels")
+        token = continuation_token(data)
+        request = browse_continuation_request(extract_ytcfg(page_source), token) if token else None
+        return channel_info, request
+
+    def next_channel_request(self, request, data):
+        """Request for the page after a continuation response, reusing the client context"""
+        token = continuation_token(data)
+        if not token or token == request[1]['continuation']:
+            return None
+        url, body = request
+        return url, {**body, 'continuation': token}
+
+    def channel_info_from_data(self, data):
+        """Channel info keyed by handle for every channelRenderer in ytInitialData or a continuation"""
+        channel_info = {}
+        for _, channel in iter_nodes(data, ('channelRenderer',)):
             try:
-                self.page.evaluate('''() => {
-                    window.scrollTo(0, document.documentElement.scrollHeight / 2);
-                    setTimeout(() => window.scrollTo(0, document.documentElement.scrollHeight), 250);
-                }''')
-                self.page.wait_for_timeout(300)  # Brief wait for lazy loading
+                info = self._channel_from_renderer(channel)
             except Exception as e:
-                print(f"Warning: Scroll failed: {e}")
-            
-            # Extract video information using JavaScript - optimized to get all data in one pass
-            videos_info = self.page.evaluate("""() => {
-                const processViewCount = (text) => {
-                    if (!text) return 0;
-                    text = text.toLowerCase().replace('views', '').replace(',', '').trim();
-                    try {
-                        if (text.includes('k')) {
-                            return parseFloat(text.replace('k', '')) * 1000;
-                        } else if (text.includes('m')) {
-                            return parseFloat(text.replace('m', '')) * 1000000;
-                        } else {
-                            return parseFloat(text);
-                        }
-                    } catch {
-                        return 0;
-                    }
-                };
-
-                const videos = Array.from(document.querySelectorAll('ytd-rich-grid-media, ytd-grid-video-renderer')).slice(0, 30);
-                const views = videos.map(video => {
-                    const metadataLine = video.querySelector('#metadata-line');
-                    if (!metadataLine) return 0;
-                    
-                    const spans = Array.from(metadataLine.querySelectorAll('span'));
-                    for (const span of spans) {
-                        if (span.textContent.includes('views')) {
-                            return processViewCount(span.textContent);
-                        }
-                    }
-                    return 0;
-                }).filter(views => views > 0);
-
-                return views;
-            }""")
-            
-            if not videos_info:
-                print("No videos found on channel page")
-                return 0
-            
-            # videos_info is now already an array of numbers, no need for parsing
-            views = videos_info
-            
-            if len(views) >= 10:  # Only remove outliers if we have enough videos
-                views.sort()
-                
-                # Calculate quartiles for better outlier detection
-                q1_index = len(views) // 4
-                q3_index = 3 * len(views) // 4
-                q1 = views[q1_index]
-                q3 = views[q3_index]
-                iqr = q3 - q1
-                
-                # Remove extreme outliers (beyond 2.5 * IQR)
-                lower_bound = max(0, q1 - 2.5 * iqr)
-                upper_bound = q3 + 2.5 * iqr
-                
-                original_count = len(views)
-                views = [v for v in views if lower_bound <= v <= upper_bound]
-                
-                if len(views) < original_count:
-                    print(f"Removed {original_count - len(views)} outliers from average calculation")
-                    print(f"View range after outlier removal: {min(views):,} - {max(views):,}")
-            
-            if views:
-                # Use trimmed mean: remove top and bottom 10% for more robust average
-                if len(views) >= 5:
-                    trim_count = max(1, len(views) // 10)
-                    trimmed_views = views[trim_count:-trim_count]
-                    average = int(sum(trimmed_views) / len(trimmed_views))
-                    print(f"Calculated trimmed average from {len(trimmed_views)} videos (excluded {trim_count} from each end): {average:,}")
-                else:
-                    average = int(sum(views) / len(views))
-                    print(f"Calculated average views from {len(views)} videos: {average:,}")
-                return average
-            
+                print(f"Error processing channel: {e}")
+                continue
+            if info:
+                channel_info[info['id']] = info
+        return channel_info
+
+    def _channel_from_renderer(self, channel):
+        channel_id = channel.get('channelId')
+        if not channel_id:
+            return None
+
+        # Get subscriber count from videoCountText
+        subscriber_text = None
+        video_count_text = channel.get('videoCountText', {})
+        if isinstance(video_count_text, dict):
+            if 'simpleText' in video_count_text:
+                subscriber_text = video_count_text['simpleText']
+            elif 'accessibility' in video_count_text:
+                subscriber_text = video_count_text.get('accessibility', {}).get('accessibilityData', {}).get('label', '')
+
+        # Get channel handle from subscriberCountText or custom URL
+        handle = None
+        subscriber_count_text = channel.get('subscriberCountText', {})
+        if isinstance(subscriber_count_text, dict) and 'simpleText' in subscriber_count_text:
+            handle_text = subscriber_count_text['simpleText']
+            if handle_text.startswith('@'):
+                handle = handle_text[1:]  # Remove @ symbol
+
+        if not handle:  # Fallback to custom URL
+            custom_url = channel.get('navigationEndpoint', {}).get('browseEndpoint', {}).get('canonicalBaseUrl', '')
+            if custom_url.startswith('@'):
+                handle = custom_url[1:]  # Remove @ symbol
+
+        # Check for verification badge
+        is_verified = False
+        owner_badges = channel.get('ownerBadges', [])
+        for badge in owner_badges:
+            badge_renderer = badge.get('metadataBadgeRenderer', {})
+            if badge_renderer.get('style') == 'BADGE_STYLE_TYPE_VERIFIED':
+                is_verified = True
+                break
+
+        # Extract all channel information
+        info = {
+            'id': handle or channel_id,  # Use handle as primary ID; channels without one keep their UC id
+            'name': channel.get('title', {}).get('simpleText', ''),
+            'url': 'https://youtube.com' + channel.get('navigationEndpoint', {}).get('commandMetadata', {}).get('webCommandMetadata', {}).get('url', ''),
+            'description': channel.get('descriptionSnippet', {}).get('runs', [{}])[0].get('text', ''),
+            'subscriber_count': self.parse_subscriber_count(subscriber_text),
+            'thumbnail_url': None,
+            'is_verified': is_verified,
+            'handle': handle,
+            'youtube_id': channel_id  # Store original YouTube ID as a reference
+        }
+
+        # Get the highest resolution thumbnail
+        thumbnails = channel.get('thumbnail', {}).get('thumbnails', [])
+        if thumbnails:
+            info['thumbnail_url'] = thumbnails[-1].get('url', '')
+            if info['thumbnail_url'].startswith('//'):
+                info['thumbnail_url'] = 'https:' + info['thumbnail_url']
+
+        print(f"Found channel {info['name']} (@{info['handle']}): {info['subscriber_count']:,} subscribers {'✓' if is_verified else ''}")
+        return info
+
+    def summarize_view_counts(self, views):
+        """Outlier-trimmed average of a list of view counts"""
+        result = trimmed_average(views)
+        if result.outliers:
+            print(f"Removed {result.outliers} outliers from average calculation")
+        if not result.samples:
             print("No valid view counts found")
-            return 0
-            
-        except Exception as e:
-            print(f"Error getting channel average views: {e}")
-            return 0
+        elif result.trimmed:
+            used = result.samples - result.outliers - 2 * result.trimmed
+            print(f"Calculated trimmed average from {used} videos (excluded {result.trimmed} from each end): {result.average:,}")
+        else:
+            print(f"Calculated average views from {result.samples - result.outliers} videos: {result.average:,}")
+        return result
+
+    def channel_views_from_data(self, data):
+        """Positive view counts of the videos in channel ytInitialData or a browse continuation"""
+        views = (self.parse_view_count(item['views']) for item in iter_feed_items(data) if item['views'])
+        return [count for count in views if count > 0]
+
+    def plan_channel_views(self, html):
+        """View counts from a fetched /videos page, plus the continuation request to make if it has too few"""
+        data = extract_initial_data(html)
+        if data is None:
+            print("No ytInitialData found in channel page")
+            return [], None
+        views = self.channel_views_from_data(data)
+        continuation = None
+        if len(views) < CHANNEL_SAMPLE_SIZE:
+            token = continuation_token(data)
+            if token:
+                continuation = browse_continuation_request(extract_ytcfg(html), token)
+        return views, continuation
+
+    def average_sampled_views(self, views):
+        """Average of the newest CHANNEL_SAMPLE_SIZE view counts read from JSON"""
+        views = views[:CHANNEL_SAMPLE_SIZE]
+        if not views:
+            print("No videos found on channel page")
+            return NO_VIEWS
+        print(f"Read {len(views)} view counts from ytInitialData")
+        return self.summarize_view_counts(views)
 
     def parse_view_count(self, view_count_text):
         """Convert view count text like '3.2K views', '15K views', '3M views' into numbers."""
@@ -289,44 +285,77 @@ class ChannelStatsScraper(BaseScraper):
             print(f"Could not parse view count: {view_count_text}")
             return 0
 
-    def update_channel_info(self, channel_id, info):
-        """Update channel information in the database"""
+    def save_channel_info(self, channel_id, info, average, source=SOURCE_CRAWL):
+        """Insert or update a channel record with fresh stats and the ViewAverage behind its average views.
+
+        An average of None means it could not be read: only the subscriber fields are written, and the
+        stored average and last_updated stay as they were so the channel remains due for a crawl.
+        """
         cursor = self.db.db.cursor()
-        
+
         try:
-            # Calculate average views from last 30 videos on channel page
-            average_views = self.get_channel_average_views(info['url'])
-            
-            # First check if channel exists
-            cursor.execute('SELECT id FROM channels WHERE id = ?', (channel_id,))
-            channel_exists = cursor.fetchone() is not None
-            
-            if channel_exists:
+            # The channel may already be stored under its UC id or an older handle
+            existing_id = resolve_channel_id(self.db.db, info.get('youtube_id'), info['handle'], channel_id)
+
+            if average is None:
+                channel_id = existing_id or channel_id
+                cursor.execute('''
+                    INSERT INTO channels
+                    (id, youtube_id, name, url, subscriber_count, description, thumbnail_url, is_verified, handle)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        subscriber_count = excluded.subscriber_count,
+                        is_verified = excluded.is_verified,
+                        handle = excluded.handle,
+                        youtube_id = COALESCE(excluded.youtube_id, youtube_id)
+                ''', (
+                    channel_id,
+                    info.get('youtube_id'),
+                    info['name'],
+                    info['url'],
+                    info['subscriber_count'],
+                    info['description'],
+                    info['thumbnail_url'],
+                    info['is_verified'],
+                    info['handle']
+                ))
+                print(f"Saved {info['name']} with {info['subscriber_count']:,} subscribers; average views left unchanged")
+            elif existing_id:
+                channel_id = existing_id
                 # Update only specific fields for existing channels
                 cursor.execute('''
                     UPDATE channels 
                     SET subscriber_count = ?,
                         is_verified = ?,
                         handle = ?,
+                        youtube_id = COALESCE(?, youtube_id),
                         average_views = ?,
+                        average_views_samples = ?,
+                        average_views_source = ?,
                         last_updated = CURRENT_TIMESTAMP
                     WHERE id = ?
                 ''', (
                     info['subscriber_count'],
                     info['is_verified'],
                     info['handle'],
-                    average_views,
+                    info.get('youtube_id'),
+                    average.average,
+                    average.samples,
+                    source,
                     channel_id
                 ))
-                print(f"Updated channel {info['name']} with {info['subscriber_count']:,} subscribers (avg views: {average_views:,})")
+                print(f"Updated channel {info['name']} with {info['subscriber_count']:,} subscribers "
+                      f"(avg views: {average.average:,} from {average.samples} videos, {source})")
             else:
                 # Insert new channel with all fields
                 cursor.execute('''
                     INSERT INTO channels 
-                    (id, name, url, subscriber_count, description, thumbnail_url, is_verified, handle, average_views, last_updated)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    (id, youtube_id, name, url, subscriber_count, description, thumbnail_url, is_verified, handle,
+                     average_views, average_views_samples, average_views_source, last_updated)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
                 ''', (
                     channel_id,
+                    info.get('youtube_id'),
                     info['name'],
                     info['url'],
                     info['subscriber_count'],
@@ -334,16 +363,185 @@ class ChannelStatsScraper(BaseScraper):
                     info['thumbnail_url'],
                     info['is_verified'],
                     info['handle'],
-                    average_views
+                    average.average,
+                    average.samples,
+                    source
                 ))
-                print(f"Inserted new channel {info['name']} with {info['subscriber_count']:,} subscribers (avg views: {average_views:,})")
+                print(f"Inserted new channel {info['name']} with {info['subscriber_count']:,} subscribers "
+                      f"(avg views: {average.average:,} from {average.samples} videos, {source})")
             
+            record_channel_aliases(self.db.db, channel_id, info.get('youtube_id'), info['handle'], info['url'])
             self.db.db.commit()
             
         except Exception as e:
             print(f"Error updating channel {channel_id}: {e}")
             self.db.db.rollback()
 
+    def select_channel_jobs(self, channel_info):
+        """Only crawl channels we have a valid subscriber count for"""
+        jobs = []
+        for channel_id, info in channel_info.items():
+            if info.get('subscriber_count') is not None:
+                jobs.append((channel_id, info))
+            else:
+                print(f"Skipping update for {info['name']} - no valid subscriber count")
+        return jobs
+
+    def schedule_channel_jobs(self, jobs):
+        """Channels to crawl, most overdue first: fresh ones, those averaged from stored videos
+        and those over --max-channels are left out"""
+        plan = plan_refresh(self.db.db, jobs, include_fresh=self.refresh_all)
+        due = self.average_from_history(plan.due) if self.history else plan.due
+        deferred = []
+        if self.max_channels is not None:
+            due, deferred = due[:self.max_channels], due[self.max_channels:]
+        print(f"\nRefresh plan: {len(due)} channels to crawl, {len(plan.fresh)} fresh, "
+              f"{len(plan.due) - len(due) - len(deferred)} averaged from stored videos, "
+              f"{len(deferred)} deferred by --max-channels")
+        return due
+
+    def average_from_history(self, jobs):
+        """Save averages for channels with enough matured videos stored; returns the jobs that still need a crawl"""
+        history = load_history_views(self.db.db)
+        index = ChannelIndex.load(self.db.db)
+        remaining = []
+        for channel_id, info in jobs:
+            views = history.get(index.resolve(info.get('youtube_id'), info['handle'], channel_id), [])
+            if len(views) < HISTORY_MIN_SAMPLES:
+                remaining.append((channel_id, info))
+                continue
+            print(f"\nAveraging {info['name']} from {len(views)} stored videos")
+            self.save_channel_info(channel_id, info, self.summarize_view_counts(views), source=SOURCE_HISTORY)
+        return remaining
+
+    def start_budget(self):
+        self.deadline = time.monotonic() + self.budget if self.budget else None
+
+    def out_of_budget(self, remaining):
+        """True once the --budget deadline has passed; reports the channels left for the next run"""
+        if self.deadline is None or time.monotonic() < self.deadline:
+            return False
+        print(f"\nTime budget reached, leaving {remaining} channels for the next run")
+        return True
+
+    def print_crawl_summary(self, channel_count, updated_count, failed_count, elapsed):
+        rate = updated_count / elapsed * 60 if elapsed > 0 else 0
+        print(f"\nFinished updating {updated_count} channel statistics!")
+        print(f"Crawled {channel_count} channels in {elapsed:.1f}s ({rate:.1f} channels/min) "
+              f"using {self.workers} worker{'s' if self.workers != 1 else ''}, {failed_count} errors")
+
+
+class ChannelStatsScraper(ChannelStatsMixin, BaseScraper):
+    def __init__(self, debug=False, workers=1, averages='json', max_channels=None, budget=None, refresh_all=False, history=True, blocker=None):
+        super().__init__(debug, blocker=blocker)
+        self.db = YouTubeDB()
+        self.workers = max(1, workers)
+        if averages == 'json' and self.workers > 1:
+            # Sync Playwright calls block, so JSON fetches cannot overlap here; run() uses the async engine instead
+            print("Warning: the sync engine fetches JSON averages one channel at a time; ignoring --workers")
+            self.workers = 1
+        self.averages = averages
+        self.max_channels = max_channels
+        self.budget = budget  # Seconds of crawling before the rest waits for the next run
+        self.refresh_all = refresh_all
+        self.history = history  # Average channels from stored videos when there are enough
+        self.deadline = None
+
+    def extract_channel_stats(self):
+        """Extract all channel stats from the channels feed page"""
+        try:
+            print("\nGoing to channels feed page...")
+            self.page.goto('https://www.youtube.com/feed/channels')
+            self.page.wait_for_load_state('networkidle')
+            
+            # Channels past the first page come from browse continuations, not from scrolling
+            channel_info, request = self.read_channel_page(self.page.content())
+            for _ in range(MAX_CHANNEL_LIST_PAGES):
+                if not request:
+                    break
+                url, body = request
+                data = self.page.request.post(url, data=body, timeout=CHANNEL_FETCH_TIMEOUT_MS).json()
+                more = self.channel_info_from_data(data)
+                channel_info.update(more)
+                print(f"Found {len(more)} more channels ({len(channel_info)} total)")
+                request = self.next_channel_request(request, data)
+            return channel_info
+            
+        except Exception as e:
+            print(f"Error extracting channel stats: {e}")
+            return {}
+
+    def get_channel_average_views(self, channel_url, page=None):
+        """Calculate average views from the last 30 videos by visiting the channel page, excluding top and bottom 3 performing videos"""
+        page = page or self.page
+        try:
+            if self.averages == 'json':
+                return self._read_channel_average_views_json(page, channel_url)
+            self._open_channel_videos(page, channel_url)
+            return self._read_channel_average_views(page)
+        except Exception as e:
+            print(f"Error getting channel average views: {e}")
+            return None
+
+    def _read_channel_average_views_json(self, page, channel_url):
+        """Average views from the JSON embedded in the /videos page, fetched with the browser's cookies but never rendered"""
+        print(f"\nGetting average views from {channel_url}...")
+        response = page.request.get(channel_url + '/videos', timeout=CHANNEL_FETCH_TIMEOUT_MS)
+        check_response(response)
+        views, continuation = self.plan_channel_views(response.text())
+        if continuation:
+            url, body = continuation
+            response = page.request.post(url, data=body, timeout=CHANNEL_FETCH_TIMEOUT_MS)
+            check_response(response)
+            views += self.channel_views_from_data(response.json())
+        return self.average_sampled_views(views)
+
+    def _open_channel_videos(self, page, channel_url):
+        """Start loading a channel's /videos tab without waiting for the grid to render"""
+        print(f"\nGetting average views from {channel_url}...")
+
+        # Use commit instead of domcontentloaded - faster and still reliable
+        try:
+            page.goto(channel_url + '/videos', timeout=5000, wait_until='commit')
+        except Exception as e:
+            print(f"Initial page load timed out, but continuing anyway: {e}")
+
+    def _read_channel_average_views(self, page):
+        """Wait for the video grid on an already-navigated page and average its view counts"""
+        # Wait for any video to appear
+        try:
+            page.wait_for_selector('ytd-rich-grid-media, ytd-grid-video-renderer', timeout=3000)
+        except Exception as e:
+            print(f"Warning: Video grid not found: {e}")
+            return NO_VIEWS  # Return early if no videos found
+
+        # Quick double-scroll to load more videos
+        try:
+            page.evaluate('''() => {
+                window.scrollTo(0, document.documentElement.scrollHeight / 2);
+                setTimeout(() => window.scrollTo(0, document.documentElement.scrollHeight), 250);
+            }''')
+            page.wait_for_timeout(300)  # Brief wait for lazy loading
+        except Exception as e:
+            print(f"Warning: Scroll failed: {e}")
+
+        # Extract video information using JavaScript - optimized to get all data in one pass
+        videos_info = page.evaluate(CHANNEL_VIEWS_SCRIPT)
+
+        if not videos_info:
+            print("No videos found on channel page")
+            return NO_VIEWS
+
+        # videos_info is now already an array of numbers, no need for parsing
+        return self.summarize_view_counts(videos_info)
+
+    def update_channel_info(self, channel_id, info, average_views=None):
+        """Update channel information in the database"""
+        # Calculate average views from last 30 videos on channel page
+        if average_views is None:
+            average_views = self.get_channel_average_views(info['url'])
+        self.save_channel_info(channel_id, info, average_views)
+
     def scrape(self):
         """Scrape channel information from the subscriptions page"""
         print("\nFetching channel statistics...")
@@ -355,25 +553,273 @@ class ChannelStatsScraper(BaseScraper):
             print("No channels found on subscriptions page.")
             return
         
-        # Update information for all channels found
+        jobs = self.schedule_channel_jobs(self.select_channel_jobs(channel_info))
+        started = time.monotonic()
+        self.start_budget()
+        updated_count, failed_count = self.crawl_channels(jobs)
+        self.print_crawl_summary(len(jobs), updated_count, failed_count, time.monotonic() - started)
+
+    def crawl_channels(self, jobs):
+        """Crawl channel pages for average views, spreading them across a pool of pages.
+
+        Each worker page holds at most one in-flight channel: navigations are started on every
+        idle page first, then each page is read back in turn while the others keep loading.
+        In JSON mode channels are fetched one after another on one page (the async engine
+        overlaps them).
+        """
+        if self.averages == 'json':
+            return self._crawl_channels_json(jobs)
+
+        pending = deque(jobs)
+        total_channels = len(jobs)
+        pages = [self.page] + [self.browser.new_page() for _ in range(self.workers - 1)]
+        in_flight = [None] * len(pages)
+        started_count = 0
         updated_count = 0
-        total_channels = len(channel_info)
+        failed_count = 0
+        
+        try:
+            while pending or any(in_flight):
+                if pending and self.out_of_budget(len(pending)):
+                    pending.clear()  # Channels already loading are still read back
+
+                # Hand the next channels to idle workers
+                for slot, page in enumerate(pages):
+                    if in_flight[slot] is not None or not pending:
+                        continue
+                    channel_id, info = pending.popleft()
+                    started_count += 1
+                    print(f"\nProcessing channel {started_count}/{total_channels}: {info['name']} (worker {slot + 1})")
+                    try:
+                        self._open_channel_videos(page, info['url'])
+                    except Exception as e:
+                        print(f"Worker {slot + 1} failed to open {info['url']}: {e}")
+                    in_flight[slot] = (channel_id, info)
+                
+                # Collect results; a failing worker only loses its own channel
+                for slot, page in enumerate(pages):
+                    job = in_flight[slot]
+                    if job is None:
+                        continue
+                    in_flight[slot] = None
+                    channel_id, info = job
+                    
+                    try:
+                        average_views = self._read_channel_average_views(page)
+                    except Exception as e:
+                        print(f"Error getting channel average views for {info['name']} (worker {slot + 1}): {e}")
+                        failed_count += 1
+                        if page.is_closed():
+                            pages[slot] = self.browser.new_page()
+                            if slot == 0:
+                                self._page = pages[slot]
+                        self.save_channel_info(channel_id, info, None)
+                        continue
+
+                    try:
+                        self.update_channel_info(channel_id, info, average_views=average_views)
+                        print(f"Updated info for {info['name']} (@{info['handle']}): {info['subscriber_count']:,} subscribers")
+                        updated_count += 1
+                    except Exception as e:
+                        print(f"Error updating channel {channel_id}: {e}")
+        finally:
+            # The first page is owned by BaseScraper and closed in cleanup()
+            for page in pages[1:]:
+                try:
+                    page.close()
+                except Exception:
+                    pass
         
-        for i, (channel_id, info) in enumerate(channel_info.items(), 1):
+        return updated_count, failed_count
+
+    def _crawl_channels_json(self, jobs):
+        updated_count = 0
+        failed_count = 0
+        for number, (channel_id, info) in enumerate(jobs, 1):
+            if self.out_of_budget(len(jobs) - number + 1):
+                break
+            print(f"\nProcessing channel {number}/{len(jobs)}: {info['name']}")
+            try:
+                average_views = self._read_channel_average_views_json(self.page, info['url'])
+            except Exception as e:
+                print(f"Error getting channel average views for {info['name']}: {e}")
+                failed_count += 1
+                self.save_channel_info(channel_id, info, None)
+                continue
+
             try:
-                print(f"\nProcessing channel {i}/{total_channels}: {info['name']}")
-                subscriber_count = info.get('subscriber_count')
-                if subscriber_count is not None:  # Only update if we have a valid subscriber count
-                    self.update_channel_info(channel_id, info)
-                    print(f"Updated info for {info['name']} (@{info['handle']}): {subscriber_count:,} subscribers")
-                    updated_count += 1
-                else:
-                    print(f"Skipping update for {info['name']} - no valid subscriber count")
+                self.update_channel_info(channel_id, info, average_views=average_views)
+                print(f"Updated info for {info['name']} (@{info['handle']}): {info['subscriber_count']:,} subscribers")
+                updated_count += 1
             except Exception as e:
                 print(f"Error updating channel {channel_id}: {e}")
-        
-        print(f"\nFinished updating {updated_count} channel statistics!")
+        return updated_count, failed_count
+
+
+
+class AsyncChannelStatsScraper(ChannelStatsMixin, AsyncBaseScraper):
+    """Channel stats scraper on the asyncio engine: workers share a bounded queue of channels"""
+
+    def __init__(self, debug=False, workers=4, averages='json', max_channels=None, budget=None, refresh_all=False, history=True, blocker=None):
+        super().__init__(debug, blocker=blocker)
+        self.db = YouTubeDB()
+        self.workers = max(1, workers)
+        self.averages = averages
+        self.max_channels = max_channels
+        self.budget = budget
+        self.refresh_all = refresh_all
+        self.history = history
+        self.deadline = None
+
+    async def extract_channel_stats(self):
+        """Extract all channel stats from the channels feed page"""
+        try:
+            print("\nGoing to channels feed page...")
+            await self.page.goto('https://www.youtube.com/feed/channels')
+            await self.page.wait_for_load_state('networkidle')
+
+            channel_info, request = self.read_channel_page(await self.page.content())
+            for _ in range(MAX_CHANNEL_LIST_PAGES):
+                if not request:
+                    break
+                url, body = request
+                response = await self.page.request.post(url, data=body, timeout=CHANNEL_FETCH_TIMEOUT_MS)
+                data = await response.json()
+                more = self.channel_info_from_data(data)
+                channel_info.update(more)
+                print(f"Found {len(more)} more channels ({len(channel_info)} total)")
+                request = self.next_channel_request(request, data)
+            return channel_info
+        except Exception as e:
+            print(f"Error extracting channel stats: {e}")
+            return {}
+
+    async def get_channel_average_views(self, channel_url, page=None):
+        """Async version of ChannelStatsScraper.get_channel_average_views"""
+        page = page or self.page
+        if self.averages == 'json':
+            return await self._read_channel_average_views_json(page, channel_url)
+        print(f"\nGetting average views from {channel_url}...")
+        try:
+            await page.goto(channel_url + '/videos', timeout=5000, wait_until='commit')
+        except Exception as e:
+            print(f"Initial page load timed out, but continuing anyway: {e}")
+
+        try:
+            await page.wait_for_selector('ytd-rich-grid-media, ytd-grid-video-renderer', timeout=3000)
+        except Exception as e:
+            print(f"Warning: Video grid not found: {e}")
+            return NO_VIEWS
+
+        try:
+            await page.evaluate('''() => {
+                window.scrollTo(0, document.documentElement.scrollHeight / 2);
+                setTimeout(() => window.scrollTo(0, document.documentElement.scrollHeight), 250);
+            }''')
+            await page.wait_for_timeout(300)
+        except Exception as e:
+            print(f"Warning: Scroll failed: {e}")
+
+        videos_info = await page.evaluate(CHANNEL_VIEWS_SCRIPT)
+        if not videos_info:
+            print("No videos found on channel page")
+            return NO_VIEWS
+        return self.summarize_view_counts(videos_info)
+
+    async def _read_channel_average_views_json(self, page, channel_url):
+        """Async version of ChannelStatsScraper._read_channel_average_views_json"""
+        print(f"\nGetting average views from {channel_url}...")
+        response = await page.request.get(channel_url + '/videos', timeout=CHANNEL_FETCH_TIMEOUT_MS)
+        check_response(response)
+        views, continuation = self.plan_channel_views(await response.text())
+        if continuation:
+            url, body = continuation
+            response = await page.request.post(url, data=body, timeout=CHANNEL_FETCH_TIMEOUT_MS)
+            check_response(response)
+            views += self.channel_views_from_data(await response.json())
+        return self.average_sampled_views(views)
+
+    async def scrape(self):
+        """Scrape channel information from the subscriptions page"""
+        print("\nFetching channel statistics...")
+
+        channel_info = await self.extract_channel_stats()
+        if not channel_info:
+            print("No channels found on subscriptions page.")
+            return
+
+        jobs = self.schedule_channel_jobs(self.select_channel_jobs(channel_info))
+        started = time.monotonic()
+        self.start_budget()
+        updated_count, failed_count = await self.crawl_channels(jobs)
+        self.print_crawl_summary(len(jobs), updated_count, failed_count, time.monotonic() - started)
+
+    async def crawl_channels(self, jobs):
+        """Feed channels through a bounded queue to one task per browser page"""
+        queue = asyncio.Queue(maxsize=self.workers * 2)
+        total_channels = len(jobs)
+        counts = {'started': 0, 'updated': 0, 'failed': 0}
+        pages = [self.page] + [await self.browser.new_page() for _ in range(self.workers - 1)]
+
+        async def produce():
+            for number, job in enumerate(jobs):
+                if self.out_of_budget(len(jobs) - number):
+                    break
+                await queue.put(job)
+            for _ in pages:
+                await queue.put(None)
+
+        async def work(slot, page):
+            while (job := await queue.get()) is not None:
+                channel_id, info = job
+                counts['started'] += 1
+                print(f"\nProcessing channel {counts['started']}/{total_channels}: {info['name']} (worker {slot + 1})")
+                try:
+                    average_views = await self.get_channel_average_views(info['url'], page)
+                except Exception as e:
+                    print(f"Error getting channel average views for {info['name']} (worker {slot + 1}): {e}")
+                    counts['failed'] += 1
+                    if page.is_closed():
+                        page = await self.browser.new_page()
+                        pages[slot] = page
+                    self.save_channel_info(channel_id, info, None)
+                    continue
+
+                # SQLite writes stay on the event loop thread; they are short next to page loads
+                self.save_channel_info(channel_id, info, average_views)
+                print(f"Updated info for {info['name']} (@{info['handle']}): {info['subscriber_count']:,} subscribers")
+                counts['updated'] += 1
+
+        try:
+            await asyncio.gather(produce(), *(work(slot, page) for slot, page in enumerate(pages)))
+        finally:
+            self._page = pages[0]
+            for page in pages[1:]:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+        return counts['updated'], counts['failed']
 
-def run(debug: bool = False) -> None:
-    scraper = ChannelStatsScraper(debug=debug)
+def run(
+    debug: bool = False,
+    workers: int = 1,
+    engine: str = "sync",
+    averages: str = "json",
+    max_channels: int | None = None,
+    budget: float | None = None,
+    refresh_all: bool = False,
+    history: bool = True,
+    block: str = DEFAULT_BLOCK_SPEC,
+) -> None:
+    options = dict(debug=debug, workers=workers, averages=averages, max_channels=max_channels, budget=budget,
+                   refresh_all=refresh_all, history=history, blocker=RequestBlocker.from_spec(block))
+    if engine == "sync" and averages == "json" and workers > 1:
+        print(f"Using the async engine to fetch JSON averages with {workers} workers")
+        engine = "async"
+    if engine == "async":
+        scraper = AsyncChannelStatsScraper(**options)
+    else:
+        scraper = ChannelStatsScraper(**options)
     scraper.run()
@@ -1,9 +1,11 @@
 from .base_scraper import BaseScraper
 from .db_schema import YouTubeDB
+from .innertube import BROWSE_ENDPOINT, iter_feed_items, parse_duration
+from .oembed import DEFAULT_RATE, DEFAULT_WORKERS, OEmbedPool, OEmbedResolver
+from .request_blocking import DEFAULT_BLOCK_SPEC, RequestBlocker
 from datetime import datetime, timedelta
 import re
 import json
-from urllib import request
 
 from rich.console import Console, Group
 from rich.live import Live
@@ -11,33 +13,199 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn, TaskID
 
+# Extracts video cards from the subscriptions grid that earlier passes have not returned.
+# Fully rendered cards are tagged with data-ytsubs-seen so each one crosses the CDP
+# boundary once; cards still missing metadata are retried on the next pass.
+FEED_ITEMS_SCRIPT = r"""() => {
+    const selectors = [
+        'ytd-rich-item-renderer:not([is-slim-media])',
+        'ytd-rich-grid-media',
+        'ytd-grid-video-renderer',
+        '#contents > ytd-rich-item-renderer'
+    ];
+    let elements = [];
+
+    // Find first selector that returns elements
+    for (const selector of selectors) {
+        elements = Array.from(document.querySelectorAll(selector));
+        if (elements.length > 0) break;
+    }
+
+    // Extract info from each element not returned by an earlier pass
+    return elements.filter(element => !element.hasAttribute('data-ytsubs-seen')).map(element => {
+        // Title - updated selector for new YouTube structure
+        const titleEl = element.querySelector('h3 a') ||
+                      element.querySelector('a#video-title-link') ||
+                      element.querySelector('#video-title');
+
+        // Channel - updated to find channel link in new structure
+        const channelEl = element.querySelector('a.yt-core-attributed-string__link') ||
+                        element.querySelector('[href*="/@"]') ||
+                        element.querySelector('[href*="/channel/"]');
+
+        // Filter out video links from channel links
+        const isChannelLink = channelEl && !channelEl.href.includes('/watch?v=');
+        const finalChannelEl = isChannelLink ? channelEl : null;
+
+        // Metadata - look for spans in the metadata area
+        const metadataSpans = element.querySelectorAll('yt-lockup-metadata-view-model span');
+        const channelTextFromMetadata = element.querySelector('yt-content-metadata-view-model span')?.textContent?.trim() || null;
+
+        // Thumbnail
+        const thumbnail = element.querySelector('img.yt-core-image--loaded') ||
+                        element.querySelector('yt-image img');
+
+        // Duration - updated selector for new YouTube structure
+        const durationEl = element.querySelector('badge-shape.yt-badge-shape div.yt-badge-shape__text') ||
+                         element.querySelector('div.yt-badge-shape__text') ||
+                         element.querySelector('yt-thumbnail-overlay-time-status-view-model span') ||
+                         element.querySelector('ytd-thumbnail-overlay-time-status-renderer span');
+
+        // Ensure URLs are absolute
+        const absolutize = (href) => {
+            if (!href) return null;
+            if (href.startsWith('http')) return href;
+            return new URL(href, 'https://www.youtube.com').href;
+        };
+        const videoUrl = titleEl ? absolutize(titleEl.getAttribute('href') || titleEl.href) : null;
+        const channelUrl = finalChannelEl ? absolutize(finalChannelEl.getAttribute('href') || finalChannelEl.href) : null;
+
+        // Parse metadata for views and publish date
+        let publishDate = null;
+        let views = 0;
+
+        metadataSpans.forEach(span => {
+            const text = span.textContent.trim();
+            if (text.includes('views')) {
+                views = text;
+            } else if (text.includes('ago') || text.includes('hour') || text.includes('day') ||
+                     text.includes('week') || text.includes('month') || text.includes('year')) {
+                publishDate = text;
+            }
+        });
+
+        // Get channel ID from URL (prefer handle over channel ID)
+        let channelId = null;
+        if (channelUrl) {
+            // First try to get handle
+            const handleMatch = channelUrl.match(/@([\w-]+)/);
+            if (handleMatch) {
+                channelId = handleMatch[1];
+            } else {
+                // Fallback to channel ID if no handle
+                const channelMatch = channelUrl.match(/channel\/([\w-]+)/);
+                if (channelMatch) {
+                    channelId = channelMatch[1];
+                }
+            }
+        }
+
+        const title = titleEl ? titleEl.textContent.trim() : null;
+        if (!title || !videoUrl) return null;  // Not hydrated yet
+        if (publishDate || views) element.setAttribute('data-ytsubs-seen', '');
+
+        return {
+            title: title,
+            url: videoUrl,
+            channelName: finalChannelEl ? finalChannelEl.textContent.trim() : null,
+            channelUrl: channelUrl,
+            channelId: channelId,
+            channelText: channelTextFromMetadata,
+            views: views,
+            publishDate: publishDate,
+            thumbnailUrl: thumbnail ? thumbnail.src : null,
+            duration: durationEl ? durationEl.textContent.trim() : null
+        };
+    }).filter(Boolean);
+}"""
+
+# How far off a date parsed from "N <unit>s ago" can be; smaller is more precise
+DATE_PRECISION_SECONDS = {
+    'minute': 60,
+    'hour': 60 * 60,
+    'day': 24 * 60 * 60,
+    'week': 7 * 24 * 60 * 60,
+    'month': 30 * 24 * 60 * 60,
+    'year': 365 * 24 * 60 * 60,
+}
+
 class VideoScraper(BaseScraper):
-    def __init__(self, debug=False):
-        super().__init__(debug)
+    def __init__(
+        self,
+        debug=False,
+        adaptive_waits=True,
+        scroll_timeout=5.0,
+        source='dom',
+        oembed_workers=DEFAULT_WORKERS,
+        oembed_rate=DEFAULT_RATE,
+        blocker=None,
+    ):
+        super().__init__(debug, adaptive_waits=adaptive_waits, scroll_timeout=scroll_timeout, blocker=blocker)
         self.db = YouTubeDB()
+        self.oembed = OEmbedResolver(self.db.db)  # Cached across runs in the oembed_cache table
+        self.oembed_workers = oembed_workers
+        self.oembed_rate = oembed_rate  # Requests per second; None or 0 for no limit
         self.videos = []
         self.console = Console()
+        self.source = source  # 'dom' scrapes rendered cards, 'network' parses InnerTube JSON
+        self._captured_responses = []
+        self._initial_data_pending = False
+        self._seen_feed_ids = set()
+        self.feed_bytes_per_scroll = []  # Serialized size of the items each pass returned
+        self.feed_items_seen = 0  # Items returned by all passes so far
+
+    def _capture_browse_response(self, response):
+        """Response listener: keep browse continuations to parse on the next collection pass"""
+        if BROWSE_ENDPOINT in response.url and response.request.method == 'POST':
+            self._captured_responses.append(response)
+
+    def _collect_feed_items(self):
+        """Return feed items not seen by earlier passes, recording how many bytes they took"""
+        items = self._read_feed_items()
+        self.feed_bytes_per_scroll.append(len(json.dumps(items)))
+        self.feed_items_seen += len(items)
+        return items
+
+    def _read_feed_items(self):
+        """Read new feed items from the DOM or from captured InnerTube JSON"""
+        if self.source != 'network':
+            return self.page.evaluate(FEED_ITEMS_SCRIPT)
+
+        payloads = []
+        if self._initial_data_pending:
+            self._initial_data_pending = False
+            payloads.append(self.page.evaluate('() => window.ytInitialData || null'))
+        while self._captured_responses:
+            response = self._captured_responses.pop(0)
+            try:
+                payloads.append(response.json())
+            except Exception as e:
+                print(f"Could not read browse response: {e}")
+
+        # Continuations only carry new items, but guard against repeats anyway
+        items = []
+        for payload in payloads:
+            for item in iter_feed_items(payload):
+                if item['videoId'] in self._seen_feed_ids:
+                    continue
+                self._seen_feed_ids.add(item['videoId'])
+                items.append(item)
+        return items
 
     def resolve_channel_using_oembed(self, video_id):
         """Fallback: hit YouTube oEmbed to recover channel info when the feed omits it (e.g., collab videos)."""
-        url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-        try:
-            with request.urlopen(url, timeout=10) as resp:
-                data = json.load(resp)
-        except Exception:
-            return None, None, None
-
-        author_url = data.get("author_url")
-        author_name = data.get("author_name")
-        channel_id = None
-        if author_url:
-            handle_match = re.search(r'/@([A-Za-z0-9_-]+)', author_url)
-            id_match = re.search(r'/channel/([A-Za-z0-9_-]+)', author_url)
-            if id_match:
-                channel_id = id_match.group(1)
-            elif handle_match:
-                channel_id = handle_match.group(1)
-        return channel_id, author_url, author_name
+        return self.oembed.resolve(video_id)
+
+    @staticmethod
+    def apply_resolved_channel(video_info, resolved):
+        """Fill channel fields the feed card lacked from an oEmbed result"""
+        resolved_id, resolved_url, resolved_name = resolved
+        if resolved_id:
+            video_info['channel_id'] = resolved_id
+        if resolved_url and not video_info.get('channel_url'):
+            video_info['channel_url'] = resolved_url
+        if resolved_name and not video_info.get('channel_name'):
+            video_info['channel_name'] = resolved_name
 
     def parse_view_count(self, view_count_text):
         """Convert view count text like '3.2K views', '15K views', '3M views' into numbers."""
@@ -64,6 +232,10 @@ class VideoScraper(BaseScraper):
 
     def parse_date(self, date_text):
         """Parse date from relative text like '1 month ago'"""
+        return self.parse_date_with_precision(date_text)[0]
+
+    def parse_date_with_precision(self, date_text):
+        """(ISO date, precision in seconds) from relative text; the precision is the size of the unit shown"""
         if not date_text:
             raise ValueError("No date text provided")
         
@@ -72,14 +244,14 @@ class VideoScraper(BaseScraper):
         
         # Handle "just now", "moments ago", etc.
         if text in ['just now', 'moments ago']:
-            return datetime.now().isoformat()
+            return datetime.now().isoformat(), DATE_PRECISION_SECONDS['minute']
             
         # Handle "X minutes ago"
         if 'minute' in text:
             match = re.search(r'(\d+)\s*minute', text)
             if match:
                 minutes = int(match.group(1))
-                return (datetime.now() - timedelta(minutes=minutes)).isoformat()
+                return (datetime.now() - timedelta(minutes=minutes)).isoformat(), DATE_PRECISION_SECONDS['minute']
         
         # Extract number and unit from relative date
         match = re.match(r'^(\d+)\s+(hour|day|week|month|year)s?\s+ago$', text)
@@ -91,16 +263,18 @@ class VideoScraper(BaseScraper):
         
         now = datetime.now()
         
+        precision = DATE_PRECISION_SECONDS[unit]
+        
         if unit == 'hour':
-            return (now - timedelta(hours=number)).isoformat()
+            return (now - timedelta(hours=number)).isoformat(), precision
         elif unit == 'day':
-            return (now - timedelta(days=number)).isoformat()
+            return (now - timedelta(days=number)).isoformat(), precision
         elif unit == 'week':
-            return (now - timedelta(days=number * 7)).isoformat()
+            return (now - timedelta(days=number * 7)).isoformat(), precision
         elif unit == 'month':
             if number == 1:
                 # Keep videos that show as "1 month ago"
-                return (now - timedelta(days=29)).isoformat()
+                return (now - timedelta(days=29)).isoformat(), precision
             else:
                 # Multiple months old - definitely too old
                 raise ValueError(f"Video too old: {number} months ago")
@@ -112,6 +286,11 @@ class VideoScraper(BaseScraper):
     def scrape(self, days=30):
         """Fetch recent videos from subscriptions"""
         print("\nScanning YouTube subscriptions feed...")
+        if self.source == 'network':
+            self._captured_responses.clear()
+            self._seen_feed_ids.clear()
+            self._initial_data_pending = True
+            self.page.on('response', self._capture_browse_response)
         self.page.goto('https://www.youtube.com/feed/subscriptions')
         self.wait_for_page_load()
         
@@ -124,6 +303,11 @@ class VideoScraper(BaseScraper):
         trimmed_count = cursor.rowcount
         self.db.db.commit()
         
+        # Membership checks are served from memory; writes are batched per scroll
+        channel_index = self.db.get_channel_index()  # Handles, UC ids and custom URLs -> canonical id
+        known_video_ids = self.db.get_video_ids()
+        pending_rows = []
+        
         processed_video_ids = set()
         old_videos_count = 0
         max_old_videos = 3  # Stop after finding this many old videos
@@ -132,6 +316,50 @@ class VideoScraper(BaseScraper):
         missing_channel_videos = 0
         missing_channel_log = []
         stop_reason = ""
+        # Cards without a channel are resolved on worker threads while scrolling continues
+        oembed_pool = OEmbedPool(self.oembed, workers=self.oembed_workers, rate=self.oembed_rate)
+
+        def admit(video_id, video_info):
+            """Queue a video whose channel is known for the next write: 'new', 'updated', 'old' or None if skipped"""
+            nonlocal missing_channel_videos, total_new, total_updated
+            if not video_info['channel_id']:
+                missing_channel_videos += 1
+                missing_channel_log.append(f"{video_info['title']} ({video_id}) - missing channel")
+                return None
+
+            channel_id = channel_index.resolve(video_info['channel_id'], video_info.get('channel_url'))
+            if not channel_id:
+                missing_channel_videos += 1
+                missing_channel_log.append(f"{video_info['title']} ({video_id}) - channel {video_info['channel_id']} not tracked")
+                return None
+            video_info['channel_id'] = channel_id
+
+            processed_video_ids.add(video_id)
+
+            try:
+                if datetime.fromisoformat(video_info['publish_date']) < cutoff_date:
+                    return 'old'
+            except ValueError:
+                return None
+
+            pending_rows.append((
+                video_id,
+                video_info['channel_id'],
+                video_info['title'],
+                video_info['url'],
+                video_info['thumbnail'],
+                video_info['views'],
+                video_info['publish_date'],
+                video_info.get('publish_precision'),
+                video_info.get('duration'),
+                parse_duration(video_info.get('duration'))
+            ))
+            if video_id in known_video_ids:
+                total_updated += 1
+                return 'updated'
+            known_video_ids.add(video_id)
+            total_new += 1
+            return 'new'
 
         max_scrolls = 20
 
@@ -153,6 +381,11 @@ class VideoScraper(BaseScraper):
             stats.add_row(f"[cyan]Processed:[/] {len(processed_video_ids)}")
             stats.add_row(f"[green]New:[/] {total_new}   [yellow]Updated:[/] {total_updated}")
             stats.add_row(f"[red]Missing channels:[/] {missing_channel_videos}")
+            if self.feed_bytes_per_scroll:
+                stats.add_row(
+                    f"[blue]Transferred:[/] {self.feed_bytes_per_scroll[-1] / 1024:.1f} KB last pass, "
+                    f"{sum(self.feed_bytes_per_scroll) / 1024:.1f} KB total"
+                )
             if notes:
                 stats.add_row(f"[bright_magenta]Note:[/] {notes}")
 
@@ -188,107 +421,11 @@ class VideoScraper(BaseScraper):
                 live.update(render_status(i + 1, "Loading feed"))
                 
                 try:
-                    # Extract all video information in one JavaScript call
-                    videos_info = self.page.evaluate(r"""() => {
-                    const selectors = [
-                        'ytd-rich-item-renderer:not([is-slim-media])',
-                        'ytd-rich-grid-media',
-                        'ytd-grid-video-renderer',
-                        '#contents > ytd-rich-item-renderer'
-                    ];
-                    let elements = [];
-
-                    // Find first selector that returns elements
-                    for (const selector of selectors) {
-                        elements = Array.from(document.querySelectorAll(selector));
-                        if (elements.length > 0) break;
-                    }
-
-                    // Extract info from each element
-                    return elements.map(element => {
-                        // Title - updated selector for new YouTube structure
-                        const titleEl = element.querySelector('h3 a') ||
-                                      element.querySelector('a#video-title-link') ||
-                                      element.querySelector('#video-title');
-
-                        // Channel - updated to find channel link in new structure
-                        const channelEl = element.querySelector('a.yt-core-attributed-string__link') ||
-                                        element.querySelector('[href*="/@"]') ||
-                                        element.querySelector('[href*="/channel/"]');
-
-                        // Filter out video links from channel links
-                        const isChannelLink = channelEl && !channelEl.href.includes('/watch?v=');
-                        const finalChannelEl = isChannelLink ? channelEl : null;
-
-                        // Metadata - look for spans in the metadata area
-                        const metadataSpans = element.querySelectorAll('yt-lockup-metadata-view-model span');
-                        const channelTextFromMetadata = element.querySelector('yt-content-metadata-view-model span')?.textContent?.trim() || null;
-
-                        // Thumbnail
-                        const thumbnail = element.querySelector('img.yt-core-image--loaded') ||
-                                        element.querySelector('yt-image img');
-
-                        // Duration - updated selector for new YouTube structure
-                        const durationEl = element.querySelector('badge-shape.yt-badge-shape div.yt-badge-shape__text') ||
-                                         element.querySelector('div.yt-badge-shape__text') ||
-                                         element.querySelector('yt-thumbnail-overlay-time-status-view-model span') ||
-                                         element.querySelector('ytd-thumbnail-overlay-time-status-renderer span');
-
-                        // Ensure URLs are absolute
-                        const absolutize = (href) => {
-                            if (!href) return null;
-                            if (href.startsWith('http')) return href;
-                            return new URL(href, 'https://www.youtube.com').href;
-                        };
-                        const videoUrl = titleEl ? absolutize(titleEl.getAttribute('href') || titleEl.href) : null;
-                        const channelUrl = finalChannelEl ? absolutize(finalChannelEl.getAttribute('href') || finalChannelEl.href) : null;
-
-                        // Parse metadata for views and publish date
-                        let publishDate = null;
-                        let views = 0;
-
-                        metadataSpans.forEach(span => {
-                            const text = span.textContent.trim();
-                            if (text.includes('views')) {
-                                views = text;
-                            } else if (text.includes('ago') || text.includes('hour') || text.includes('day') ||
-                                     text.includes('week') || text.includes('month') || text.includes('year')) {
-                                publishDate = text;
-                            }
-                        });
-
-                        // Get channel ID from URL (prefer handle over channel ID)
-                        let channelId = null;
-                        if (channelUrl) {
-                            // First try to get handle
-                            const handleMatch = channelUrl.match(/@([\w-]+)/);
-                            if (handleMatch) {
-                                channelId = handleMatch[1];
-                            } else {
-                                // Fallback to channel ID if no handle
-                                const channelMatch = channelUrl.match(/channel\/([\w-]+)/);
-                                if (channelMatch) {
-                                    channelId = channelMatch[1];
-                                }
-                            }
-                        }
-
-                        return {
-                            title: titleEl ? titleEl.textContent.trim() : null,
-                            url: videoUrl,
-                            channelName: finalChannelEl ? finalChannelEl.textContent.trim() : null,
-                            channelUrl: channelUrl,
-                            channelId: channelId,
-                            channelText: channelTextFromMetadata,
-                            views: views,
-                            publishDate: publishDate,
-                            thumbnailUrl: thumbnail ? thumbnail.src : null,
-                            duration: durationEl ? durationEl.textContent.trim() : null
-                        };
-                    });
-                }""")
+                    # Extract information for cards not returned by earlier passes
+                    videos_info = self._collect_feed_items()
                 
-                    if not videos_info:
+                    # An empty pass after content has loaded just means nothing new yet
+                    if not videos_info and not self.feed_items_seen:
                         no_new_content_count += 1
                         if no_new_content_count >= max_no_new_content:
                             stop_reason = "No new content found"
@@ -324,7 +461,10 @@ class VideoScraper(BaseScraper):
                                 }
                                 
                                 try:
-                                    video_info['publish_date'] = self.parse_date(info['publishDate']) if info['publishDate'] else None
+                                    if info['publishDate']:
+                                        video_info['publish_date'], video_info['publish_precision'] = self.parse_date_with_precision(info['publishDate'])
+                                    else:
+                                        video_info['publish_date'] = None
                                 except ValueError as e:
                                     if "too old" in str(e):
                                         old_videos_count += 1
@@ -347,81 +487,32 @@ class VideoScraper(BaseScraper):
                                     continue
 
                                 if not video_info['channel_id']:
-                                    resolved_id, resolved_url, resolved_name = self.resolve_channel_using_oembed(video_id)
-                                    if resolved_id:
-                                        video_info['channel_id'] = resolved_id
-                                    if resolved_url and not video_info.get('channel_url'):
-                                        video_info['channel_url'] = resolved_url
-                                    if resolved_name and not video_info.get('channel_name'):
-                                        video_info['channel_name'] = resolved_name
-                                
+                                    # A /c/ or /user/ link the card gave no id for may still be a known alias
+                                    video_info['channel_id'] = channel_index.resolve(video_info.get('channel_url'))
                                 if not video_info['channel_id']:
-                                    missing_channel_videos += 1
-                                    missing_channel_log.append(f"{video_info['title']} ({video_id}) - missing channel")
+                                    resolved = self.oembed.resolve_cached(video_id)
+                                    if resolved is None:
+                                        # Merged once the lookup finishes, before this or a later scroll's write
+                                        oembed_pool.submit(video_id, video_info)
+                                        continue
+                                    self.apply_resolved_channel(video_info, resolved)
+
+                                outcome = admit(video_id, video_info)
+                                if outcome == 'old':
+                                    old_videos_count += 1
+                                    if old_videos_count >= max_old_videos:
+                                        stop_reason = "Reached content older than 30 days"
+                                        break
                                     continue
-
-                                cursor = self.db.db.cursor()
-                                cursor.execute('SELECT 1 FROM channels WHERE id = ?', (video_info['channel_id'],))
-                                if not cursor.fetchone():
-                                    missing_channel_videos += 1
-                                    missing_channel_log.append(f"{video_info['title']} ({video_id}) - channel {video_info['channel_id']} not tracked")
+                                if outcome is None:
                                     continue
-                                
-                                processed_video_ids.add(video_id)
-                                
-                                if video_info['publish_date']:
-                                    try:
-                                        publish_date = datetime.fromisoformat(video_info['publish_date'])
-                                        if publish_date < cutoff_date:
-                                            old_videos_count += 1
-                                            if old_videos_count >= max_old_videos:
-                                                stop_reason = "Reached content older than 30 days"
-                                                break
-                                            continue
-                                    except ValueError:
-                                        continue
-                                
-                                cursor.execute('SELECT id FROM videos WHERE id = ?', (video_id,))
-                                existing_video = cursor.fetchone()
-                                
-                                if existing_video:
-                                    cursor.execute('''
-                                        UPDATE videos 
-                                        SET title = ?, url = ?, thumbnail = ?, views = ?, published_date = ?, duration = ?
-                                        WHERE id = ?
-                                    ''', (
-                                        video_info['title'],
-                                        video_info['url'],
-                                        video_info['thumbnail'],
-                                        video_info['views'],
-                                        video_info['publish_date'],
-                                        video_info.get('duration'),
-                                        video_id
-                                    ))
-                                    self.db.db.commit()
+                                if outcome == 'updated':
                                     updated_in_this_scroll += 1
-                                    total_updated += 1
                                 else:
-                                    cursor.execute('''
-                                        INSERT INTO videos 
-                                        (id, channel_id, title, url, thumbnail, views, published_date, duration)
-                                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                                    ''', (
-                                        video_id,
-                                        video_info['channel_id'],
-                                        video_info['title'],
-                                        video_info['url'],
-                                        video_info['thumbnail'],
-                                        video_info['views'],
-                                        video_info['publish_date'],
-                                        video_info.get('duration')
-                                    ))
-                                    self.db.db.commit()
                                     new_in_this_scroll += 1
-                                    total_new += 1
-                                
+
                                 old_videos_count = 0
-                                
+
                                 if (new_in_this_scroll + updated_in_this_scroll) % 5 == 0:
                                     live.update(render_status(i + 1, "Processing videos"))
                             
@@ -431,6 +522,17 @@ class VideoScraper(BaseScraper):
                         if stop_reason:
                             break
 
+                    # Fold in lookups that finished meanwhile, then write everything in one transaction
+                    for video_id, resolved, video_info in oembed_pool.completed():
+                        self.apply_resolved_channel(video_info, resolved)
+                        outcome = admit(video_id, video_info)
+                        if outcome == 'updated':
+                            updated_in_this_scroll += 1
+                        elif outcome == 'new':
+                            new_in_this_scroll += 1
+                    self.db.upsert_videos(pending_rows)
+                    pending_rows.clear()
+
                     if stop_reason:
                         live.update(render_status(i + 1, "Stopping", stop_reason))
                         break
@@ -464,6 +566,17 @@ class VideoScraper(BaseScraper):
 
                 live.update(render_status(i + 1, "Processing latest videos"))
 
+        # Wait for outstanding channel lookups, then flush them with anything an interrupted scroll left behind
+        if oembed_pool.pending:
+            self.console.print(f"[dim]Resolving {len(oembed_pool.pending)} remaining channels via oEmbed...[/]")
+        try:
+            for video_id, resolved, video_info in oembed_pool.completed(wait=True):
+                self.apply_resolved_channel(video_info, resolved)
+                admit(video_id, video_info)
+        finally:
+            oembed_pool.shutdown()
+        self.db.upsert_videos(pending_rows)
+
         reason_text = stop_reason or "Completed planned scrolls"
         self.console.print(f"\n[bold green]󰗣  Scan complete ({reason_text}).[/] {total_new} new videos added, {total_updated} videos updated, {trimmed_count} videos trimmed.")
         if missing_channel_videos:
@@ -475,6 +588,20 @@ class VideoScraper(BaseScraper):
                 if len(missing_channel_log) > 5:
                     self.console.print(f"  ... and {len(missing_channel_log) - 5} more")
             self.console.print("Run `uv run ytsubs scrape-channels` to refresh channel records, then re-run video scrape.")
+        if any(self.oembed.stats.values()):
+            self.console.print(f"[dim]{self.oembed.summary()}.[/]")
+        if self.feed_bytes_per_scroll:
+            per_pass = ", ".join(f"{size / 1024:.1f}" for size in self.feed_bytes_per_scroll)
+            self.console.print(
+                f"[dim]Feed items transferred: {sum(self.feed_bytes_per_scroll) / 1024:.1f} KB "
+                f"over {len(self.feed_bytes_per_scroll)} passes (KB per pass: {per_pass}).[/]"
+            )
+        if self.adaptive_waits:
+            stats = self.wait_stats
+            self.console.print(
+                f"[dim]Adaptive waits saved ~{stats['seconds_saved']:.1f}s "
+                f"({stats['adaptive_scrolls']} scrolls settled early, {stats['fallback_scrolls']} fell back to fixed waits).[/]"
+            )
 
     def extract_video_info(self, page):
         """Extract video information from the page."""
@@ -520,8 +647,25 @@ class VideoScraper(BaseScraper):
             print(f"Error extracting video info: {str(e)}")
             return []
 
-def run(debug: bool = False, generate_feed_after: bool = True) -> None:
-    scraper = VideoScraper(debug=debug)
+def run(
+    debug: bool = False,
+    generate_feed_after: bool = True,
+    adaptive_waits: bool = True,
+    scroll_timeout: float = 5.0,
+    source: str = "dom",
+    oembed_workers: int = DEFAULT_WORKERS,
+    oembed_rate: float | None = DEFAULT_RATE,
+    block: str = DEFAULT_BLOCK_SPEC,
+) -> None:
+    scraper = VideoScraper(
+        debug=debug,
+        adaptive_waits=adaptive_waits,
+        scroll_timeout=scroll_timeout,
+        source=source,
+        oembed_workers=oembed_workers,
+        oembed_rate=oembed_rate,
+        blocker=RequestBlocker.from_spec(block),
+    )
     scraper.run()  # Use run() instead of scrape() to ensure proper setup
 
     if not generate_feed_after:
@@ -0,0 +1,232 @@
+"""
+Local thumbnail cache for the feed page.
+
+``ytsubs thumbs sync`` downloads the thumbnails of recent videos into a
+content-addressed store under the state directory (files are named by the
+SHA-256 of their bytes, so identical images are stored once) and records
+which feed URL maps to which file in the ``thumbnails`` table. The feed
+generator then points cards at the local copies. The cache is kept under a
+size budget by evicting the least recently used entries.
+
+YouTube serves several renditions of every thumbnail; instead of resizing
+images locally, the fetcher asks for the one closest to the card size.
+"""
+
+import hashlib
+import re
+import sqlite3
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from .db_schema import connect, resolve_db_path, resolve_state_dir
+
+YTIMG_HOST = 'https://i.ytimg.com'
+# 480x360 rendition: comfortably covers a 300-600px card once cropped to 16:9
+CARD_RENDITION = 'hqdefault.jpg'
+YTIMG_VIDEO_PATH = re.compile(r'^/(vi|vi_webp)/([^/]+)/[^/?]+')
+
+DEFAULT_WORKERS = 8
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+DEFAULT_RECENT_DAYS = 30  # Widest time range the feed page offers
+FETCH_TIMEOUT = 15
+
+THUMBNAIL_CACHE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS thumbnails (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    fetched_at TIMESTAMP NOT NULL,
+    last_used_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_thumbnails_digest ON thumbnails(digest);
+CREATE INDEX IF NOT EXISTS idx_thumbnails_last_used_at ON thumbnails(last_used_at);
+'''
+
+# Feed thumbnail URL of every recent video, resolved the same way generate_feed does
+_RECENT_THUMBNAILS_SQL = '''
+    SELECT
+        CASE
+            WHEN thumbnail IS NOT NULL AND TRIM(thumbnail) != '' THEN thumbnail
+            ELSE 'https://i.ytimg.com/vi/' || id || '/maxresdefault.jpg'
+        END
+    FROM videos
+    WHERE published_date >= :cutoff
+'''
+
+
+def cache_dir() -> Path:
+    return resolve_state_dir() / "thumbs"
+
+
+def digest_path(digest: str, root: Path | None = None) -> Path:
+    """Where the file for a content digest lives (fanned out by its first two hex digits)"""
+    root = root or cache_dir()
+    return root / digest[:2] / f"{digest}.jpg"
+
+
+def ensure_thumbnail_cache(conn: sqlite3.Connection) -> None:
+    conn.executescript(THUMBNAIL_CACHE_SCHEMA)
+
+
+def card_size_url(url: str, image_host: str | None = None) -> str:
+    """URL to download for a feed thumbnail: the card-size rendition, optionally from another host"""
+    if url.startswith(YTIMG_HOST):
+        path = url[len(YTIMG_HOST):]
+        match = YTIMG_VIDEO_PATH.match(path)
+        if match:
+            path = f"/vi/{match.group(2)}/{CARD_RENDITION}"
+        if image_host:
+            return image_host.rstrip('/') + path
+        return YTIMG_HOST + path
+    return url
+
+
+def fetch_image(url: str) -> bytes:
+    request = urllib.request.Request(url, headers={'User-Agent': 'ytsubs'})
+    with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+        return response.read()
+
+
+def store_image(data: bytes, root: Path | None = None) -> str:
+    """Write image bytes into the content-addressed store; returns their digest"""
+    digest = hashlib.sha256(data).hexdigest()
+    path = digest_path(digest, root)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.part')
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+    return digest
+
+
+def load_cached_thumbnails(conn: sqlite3.Connection, root: Path | None = None) -> dict[str, str]:
+    """Map feed thumbnail URL -> file:// URL of its cached copy, for files still on disk"""
+    try:
+        rows = conn.execute('SELECT url, digest FROM thumbnails').fetchall()
+    except sqlite3.OperationalError:  # `thumbs sync` has never run
+        return {}
+    cached = {}
+    for url, digest in rows:
+        path = digest_path(digest, root)
+        if path.exists():
+            cached[url] = path.resolve().as_uri()
+    return cached
+
+
+def evict(conn: sqlite3.Connection, max_bytes: int, root: Path | None = None) -> tuple[int, int]:
+    """Drop least recently used entries until the store fits in ``max_bytes``; returns (entries, bytes) freed"""
+    # Several URLs can share one file, so the budget is counted per digest
+    digests = conn.execute('''
+        SELECT digest, MAX(size), MAX(last_used_at) AS last_used
+        FROM thumbnails
+        GROUP BY digest
+        ORDER BY last_used ASC
+    ''').fetchall()
+    total = sum(row[1] for row in digests)
+    evicted = freed = 0
+    with conn:
+        for digest, size, _ in digests:
+            if total <= max_bytes:
+                break
+            evicted += conn.execute('DELETE FROM thumbnails WHERE digest = ?', (digest,)).rowcount
+            digest_path(digest, root).unlink(missing_ok=True)
+            total -= size
+            freed += size
+    return evicted, freed
+
+
+def sync(
+    conn: sqlite3.Connection,
+    workers: int = DEFAULT_WORKERS,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    recent_days: int = DEFAULT_RECENT_DAYS,
+    image_host: str | None = None,
+    root: Path | None = None,
+) -> dict[str, int | float]:
+    """Download missing thumbnails for recent videos, refresh LRU times, then evict over budget"""
+    ensure_thumbnail_cache(conn)
+    now = datetime.now(timezone.utc).isoformat()
+    # Naive local time, like the dates scrape-videos stores (julianday('now') would be UTC)
+    cutoff = (datetime.now() - timedelta(days=recent_days)).isoformat()
+    wanted = {row[0] for row in conn.execute(_RECENT_THUMBNAILS_SQL, {'cutoff': cutoff})}
+    cached = load_cached_thumbnails(conn, root)
+    missing = sorted(wanted - set(cached))
+    stats: dict[str, int | float] = {
+        'wanted': len(wanted), 'cached': len(wanted) - len(missing), 'fetched': 0, 'failed': 0, 'bytes': 0,
+    }
+
+    print(f"{len(wanted)} recent thumbnails, {stats['cached']} already cached, {len(missing)} to fetch")
+    started = time.monotonic()
+    rows = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(fetch_image, card_size_url(url, image_host)): url for url in missing}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                data = future.result()
+            except (urllib.error.URLError, OSError, ValueError) as e:
+                stats['failed'] += 1
+                print(f"Failed to fetch {url}: {e}")
+                continue
+            digest = store_image(data, root)
+            rows.append((url, digest, len(data), now, now))
+            stats['fetched'] += 1
+            stats['bytes'] += len(data)
+
+    with conn:
+        conn.executemany('''
+            INSERT INTO thumbnails (url, digest, size, fetched_at, last_used_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                digest = excluded.digest,
+                size = excluded.size,
+                fetched_at = excluded.fetched_at,
+                last_used_at = excluded.last_used_at
+        ''', rows)
+        conn.executemany(
+            'UPDATE thumbnails SET last_used_at = ? WHERE url = ?',
+            [(now, url) for url in wanted],
+        )
+
+    stats['evicted'], stats['freed'] = evict(conn, max_bytes, root)
+    stats['seconds'] = time.monotonic() - started
+    return stats
+
+
+def run(
+    workers: int = DEFAULT_WORKERS,
+    max_mb: float = DEFAULT_MAX_BYTES / (1024 * 1024),
+    recent_days: int = DEFAULT_RECENT_DAYS,
+    image_host: str | None = None,
+) -> bool:
+    db_path = resolve_db_path()
+    if not db_path.exists():
+        print("Database file not found. Run `ytsubs scrape-videos` first.")
+        return False
+
+    conn = connect(db_path)
+    try:
+        stats = sync(
+            conn,
+            workers=workers,
+            max_bytes=int(max_mb * 1024 * 1024),
+            recent_days=recent_days,
+            image_host=image_host,
+        )
+    finally:
+        conn.close()
+
+    print(
+        f"Fetched {stats['fetched']} thumbnails ({stats['bytes'] / 1024:.0f} KB) "
+        f"in {stats['seconds']:.1f}s with {workers} workers; {stats['failed']} failed"
+    )
+    if stats['evicted']:
+        print(f"Evicted {stats['evicted']} entries ({stats['freed'] / 1024:.0f} KB) to stay under {max_mb:g} MB")
+    print(f"Cache: {cache_dir()}")
+    print("Run `ytsubs feed` to point the feed at the cached thumbnails.")
+    return True
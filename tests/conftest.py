@@ -0,0 +1,210 @@
+import copy
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from ytsubs.db_schema import YouTubeDB
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def fixture_text(name: str) -> str:
+    return (FIXTURES / name).read_text()
+
+
+def fixture_json(name: str):
+    return json.loads(fixture_text(name))
+
+
+def channel_renderers(count: int) -> list[dict]:
+    """Copies of the channel_renderer.json fixture with distinct ids, handles and subscriber counts.
+
+    Every third channel is verified and every hundredth has no handle (it is keyed by its UC id).
+    """
+    template = fixture_json('channel_renderer.json')
+    renderers = []
+    for n in range(count):
+        renderer = copy.deepcopy(template)
+        channel = renderer['channelRenderer']
+        channel_id = f'UCfixture{n:015d}'
+        handle = '' if n % 100 == 99 else f'@fixture{n}'
+        channel['channelId'] = channel['navigationEndpoint']['browseEndpoint']['browseId'] = channel_id
+        channel['title']['simpleText'] = f'Fixture Channel {n}'
+        channel['navigationEndpoint']['commandMetadata']['webCommandMetadata']['url'] = f'/{handle or "channel/" + channel_id}'
+        if handle:
+            channel['navigationEndpoint']['browseEndpoint']['canonicalBaseUrl'] = f'/{handle}'
+        else:
+            del channel['navigationEndpoint']['browseEndpoint']['canonicalBaseUrl']
+        channel['subscriberCountText']['simpleText'] = handle or f'{n + 1}K subscribers'
+        channel['videoCountText']['simpleText'] = f'{n + 1}K subscribers'
+        if n % 3:
+            channel['ownerBadges'] = []
+        renderers.append(renderer)
+    return renderers
+
+
+def channels_feed_page(count: int, continuation: str | None = None, filler_bytes: int = 0) -> str:
+    """HTML of the /feed/channels page listing `count` channel renderers.
+
+    filler_bytes of unrelated script go on each side of ytInitialData, standing in for
+    the rest of a real page (which also mentions "channelRenderer" outside the data).
+    """
+    items = channel_renderers(count)
+    contents = [{'itemSectionRenderer': {'contents': [{'shelfRenderer': {'content': {
+        'expandedShelfContentsRenderer': {'items': items},
+    }}}]}}]
+    if continuation:
+        contents.append({'continuationItemRenderer': {'continuationEndpoint': {
+            'continuationCommand': {'token': continuation, 'request': 'CONTINUATION_REQUEST_TYPE_BROWSE'},
+        }}})
+    data = {'contents': {'twoColumnBrowseResultsRenderer': {'tabs': [{'tabRenderer': {
+        'selected': True, 'content': {'sectionListRenderer': {'contents': contents}},
+    }}]}}}
+    filler = '\n'.join(
+        f'var module{n} = {{"name": "module{n}", "renders": "channelRenderer", "size": {n}}};'
+        for n in range(filler_bytes // 70)
+    )
+    return (
+        '<!DOCTYPE html><html><head><script nonce="n">ytcfg.set({"INNERTUBE_API_KEY":"test-key",'
+        '"INNERTUBE_CONTEXT":{"client":{"clientName":"WEB","clientVersion":"2.20260101.00.00"}}});</script>'
+        f'<script nonce="n">{filler}</script></head>\n'
+        f'<body><script nonce="n">var ytInitialData = {json.dumps(data, separators=(',', ':'))};</script>\n'
+        f'<script nonce="n">{filler}</script></body></html>'
+    )
+
+
+def add_synthetic_feed(conn, videos: int, channels: int = 40, seed: int = 1) -> None:
+    """Random channels and videos covering the scoring edge cases.
+
+    Some channels have no subscriber count or no average views, some videos have no
+    duration, and publish dates run from a few minutes in the future (clock skew) to a
+    month ago, each distinct so the newest-first tie break is deterministic.
+    """
+    rng = random.Random(seed)
+    conn.executemany(
+        'INSERT INTO channels (id, name, url, subscriber_count, average_views) VALUES (?, ?, ?, ?, ?)',
+        [
+            (f'channel{i}', f'Channel {i}', f'https://www.youtube.com/@channel{i}',
+             0 if i % 13 == 0 else int(10 ** rng.uniform(2, 7.5)),
+             0 if i % 7 == 0 else int(10 ** rng.uniform(2, 6)))
+            for i in range(channels)
+        ],
+    )
+    now = datetime.now()
+    offsets = rng.sample(range(-600, 30 * 86400), videos)  # Seconds before now
+    conn.executemany(
+        'INSERT INTO videos (id, title, url, channel_id, views, published_date, duration_seconds) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+        [
+            (f'video{i:06d}', f'Video {i}', f'https://www.youtube.com/watch?v=video{i:06d}',
+             f'channel{rng.randrange(channels)}', int(10 ** rng.uniform(0, 6.5)),
+             (now - timedelta(seconds=offset)).isoformat(), rng.choice([None, rng.randrange(30, 7200)]))
+            for i, offset in enumerate(offsets)
+        ],
+    )
+    conn.commit()
+
+
+@pytest.fixture(autouse=True)
+def state_home(tmp_path, monkeypatch):
+    """Keep the database and Chrome profile of every test under tmp_path"""
+    monkeypatch.setenv('XDG_STATE_HOME', str(tmp_path / 'state'))
+    return tmp_path / 'state'
+
+
+@pytest.fixture
+def far_from_utc():
+    """Run in UTC-10, where local and UTC dates disagree by most of a day"""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv('TZ', 'Etc/GMT+10')
+        time.tzset()
+        yield
+    time.tzset()
+
+
+@pytest.fixture
+def db():
+    """A YouTubeDB migrated to the latest schema"""
+    database = YouTubeDB()
+    yield database
+    database.db.close()
+
+
+@dataclass
+class Response:
+    status: int = 200
+    body: bytes | str = b''
+    content_type: str = 'text/html; charset=utf-8'
+    delay: float = 0.0  # Seconds to hold the response, to overlap concurrent requests
+
+
+@dataclass
+class FixtureServer:
+    """Local HTTP server answering from a path -> Response (or callable(path, body) -> Response) table.
+
+    Paths are matched with their query string first, then without it.
+    """
+    url: str
+    routes: dict = field(default_factory=dict)
+    requests: list = field(default_factory=list)
+    in_flight: int = 0
+    max_in_flight: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def respond(self, method: str, path: str, body: bytes) -> Response:
+        with self.lock:
+            self.requests.append((method, path))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            route = self.routes.get(path) or self.routes.get(path.split('?', 1)[0])
+            if callable(route):
+                route = route(path, body)
+            response = route or Response(404, 'not found', 'text/plain')
+            if response.delay:
+                time.sleep(response.delay)
+            return response
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def paths(self, method: str = 'GET') -> list[str]:
+        return [path for request_method, path in self.requests if request_method == method]
+
+
+@pytest.fixture
+def http_server():
+    """A FixtureServer on an ephemeral localhost port, serving on a background thread"""
+    server_state = None
+
+    class Handler(BaseHTTPRequestHandler):
+        def _serve(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            response = server_state.respond(self.command, self.path, self.rfile.read(length))
+            body = response.body.encode() if isinstance(response.body, str) else response.body
+            self.send_response(response.status)
+            self.send_header('Content-Type', response.content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = _serve
+        do_POST = _serve
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server_state = FixtureServer(f'http://127.0.0.1:{httpd.server_address[1]}')
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield server_state
+    httpd.shutdown()
+    httpd.server_close()
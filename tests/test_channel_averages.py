@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+
+from ytsubs.channel_averages import load_history_views
+
+NOW = datetime(2026, 10, 17, 9, 0, 0)
+PUBLISHED = NOW - timedelta(days=20)
+
+
+def scrape(db, at: datetime, video_id: str, views: int) -> None:
+    db.upsert_videos([(
+        video_id, 'UC1', 'Title', f'https://www.youtube.com/watch?v={video_id}', None, views,
+        PUBLISHED.isoformat(), 3600, '10:00', 600,
+    )], observed_at=at)
+
+
+def test_history_only_uses_views_read_after_the_video_matured(db):
+    scrape(db, PUBLISHED + timedelta(hours=20), 'early', 40)  # Never seen again after its first day
+    scrape(db, PUBLISHED + timedelta(hours=20), 'matured', 60)
+    scrape(db, PUBLISHED + timedelta(days=9), 'matured', 900)
+    db.db.execute(
+        "INSERT INTO videos (id, title, url, channel_id, views, published_date) "
+        "VALUES ('legacy', 'Title', 'https://www.youtube.com/watch?v=legacy', 'UC1', 700, ?)",
+        (PUBLISHED.isoformat(),),
+    )
+    db.db.commit()
+
+    assert load_history_views(db.db, now=NOW) == {'UC1': [900]}
+    assert db.db.execute("SELECT views_updated FROM videos WHERE id = 'matured'").fetchone()[0] == (
+        (PUBLISHED + timedelta(days=9)).isoformat()
+    )
+
+
+def test_history_minimum_age_boundary(db):
+    scrape(db, PUBLISHED + timedelta(days=7), 'week', 500)
+    scrape(db, PUBLISHED + timedelta(days=7) - timedelta(minutes=1), 'almost', 400)
+
+    assert load_history_views(db.db, now=NOW) == {'UC1': [500]}
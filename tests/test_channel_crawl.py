@@ -0,0 +1,198 @@
+import asyncio
+
+import pytest
+from playwright.async_api import async_playwright
+from playwright.sync_api import sync_playwright
+
+from conftest import Response, fixture_text
+from ytsubs.scrape_channel_stats import AsyncChannelStatsScraper, ChannelStatsScraper
+
+FIXTURE_AVERAGE = 15_500  # Trimmed mean of the 1,000..30,000 view counts in the fixture pages
+CHANNEL_COUNT = 8
+
+
+class SyncRequestBrowser:
+    """Just enough of a BrowserContext for the JSON crawl: pages that only carry an APIRequestContext"""
+
+    def __init__(self, request):
+        self.request = request
+
+    def new_page(self):
+        return RequestPage(self.request)
+
+
+class AsyncRequestBrowser(SyncRequestBrowser):
+    async def new_page(self):
+        return AsyncRequestPage(self.request)
+
+
+class RequestPage:
+    def __init__(self, request):
+        self.request = request
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+
+class AsyncRequestPage(RequestPage):
+    async def close(self):
+        self.closed = True
+
+
+def channel_jobs(server, names):
+    return [
+        (f'@{name}', {
+            'name': name.title(),
+            'handle': name,
+            'youtube_id': None,
+            'url': f'{server.url}/@{name}',
+            'subscriber_count': 1000,
+            'is_verified': False,
+            'description': '',
+            'thumbnail_url': '',
+        })
+        for name in names
+    ]
+
+
+def serve_channels(server, names, page='channel_videos.html', delay=0.0):
+    for name in names:
+        server.routes[f'/@{name}/videos'] = Response(body=fixture_text(page), delay=delay)
+    server.routes['/@broken/videos'] = Response(500, 'server error', 'text/plain')
+
+
+def stored_averages(scraper):
+    return dict(scraper.db.db.execute('SELECT id, average_views FROM channels'))
+
+
+def stored_channel(scraper, channel_id):
+    return scraper.db.db.execute('SELECT * FROM channels WHERE id = ?', (channel_id,)).fetchone()
+
+
+def test_async_json_crawl_spreads_channels_across_workers(http_server, capsys):
+    names = [f'channel{i}' for i in range(CHANNEL_COUNT)]
+    serve_channels(http_server, names, delay=0.2)
+    jobs = channel_jobs(http_server, names + ['broken'])
+
+    async def crawl():
+        async with async_playwright() as p:
+            request = await p.request.new_context()
+            scraper = AsyncChannelStatsScraper(workers=3, averages='json')
+            scraper._browser = AsyncRequestBrowser(request)
+            scraper._page = await scraper._browser.new_page()
+            try:
+                counts = await scraper.crawl_channels(jobs)
+                scraper.print_crawl_summary(len(jobs), *counts, elapsed=1.0)
+                return scraper, counts
+            finally:
+                await request.dispose()
+
+    scraper, (updated, failed) = asyncio.run(crawl())
+
+    assert sorted(http_server.paths()) == sorted(f'/@{name}/videos' for name in names + ['broken'])
+    assert http_server.max_in_flight > 1
+    assert (updated, failed) == (CHANNEL_COUNT, 1)
+    averages = stored_averages(scraper)
+    assert averages.pop('@broken') == 0
+    assert averages == {f'@{name}': FIXTURE_AVERAGE for name in names}
+    # Saved for its subscriber count, but never marked as crawled
+    assert stored_channel(scraper, '@broken')['last_updated'] is None
+    output = capsys.readouterr().out
+    assert 'HTTP 500' in output
+    assert 'using 3 workers, 1 errors' in output
+
+
+def test_sync_json_crawl_runs_on_one_worker(http_server, capsys):
+    names = [f'channel{i}' for i in range(3)]
+    serve_channels(http_server, names)
+    jobs = channel_jobs(http_server, names + ['broken'])
+
+    with sync_playwright() as p:
+        request = p.request.new_context()
+        scraper = ChannelStatsScraper(workers=4, averages='json')
+        scraper._browser = SyncRequestBrowser(request)
+        scraper._page = scraper._browser.new_page()
+        try:
+            updated, failed = scraper.crawl_channels(jobs)
+            scraper.print_crawl_summary(len(jobs), updated, failed, elapsed=1.0)
+        finally:
+            request.dispose()
+
+    assert (updated, failed) == (3, 1)
+    assert stored_averages(scraper)['@channel2'] == FIXTURE_AVERAGE
+    output = capsys.readouterr().out
+    assert 'ignoring --workers' in output
+    assert 'using 1 worker, 1 errors' in output
+
+
+def test_dom_crawl_uses_every_worker_page(http_server, capsys):
+    names = [f'channel{i}' for i in range(5)]
+    serve_channels(http_server, names, page='channel_videos_grid.html')
+    jobs = channel_jobs(http_server, names)
+
+    with sync_playwright() as p:
+        try:
+            browser = p.chromium.launch()
+        except Exception as e:
+            pytest.skip(f"Chromium is not installed: {e}")
+        context = browser.new_context()
+        scraper = ChannelStatsScraper(workers=2, averages='dom')
+        scraper._browser = context
+        scraper._page = context.new_page()
+        try:
+            updated, failed = scraper.crawl_channels(jobs)
+        finally:
+            browser.close()
+
+    assert (updated, failed) == (5, 0)
+    assert stored_averages(scraper) == {f'@{name}': FIXTURE_AVERAGE for name in names}
+    assert '(worker 2)' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('engine', ['sync', 'async'])
+def test_failed_crawl_keeps_the_stored_average(http_server, capsys, engine):
+    serve_channels(http_server, ['healthy'])
+    jobs = channel_jobs(http_server, ['healthy', 'broken'])
+    scraper_class = ChannelStatsScraper if engine == 'sync' else AsyncChannelStatsScraper
+    scraper = scraper_class(workers=1, averages='json')
+    scraper.db.db.execute(
+        "INSERT INTO channels (id, name, url, subscriber_count, average_views, average_views_samples, "
+        "average_views_source, last_updated) "
+        "VALUES ('@broken', 'Broken', ?, 900, 7000, 24, 'history', '2026-10-01 08:00:00')",
+        (f'{http_server.url}/@broken',),
+    )
+    scraper.db.db.commit()
+
+    if engine == 'sync':
+        with sync_playwright() as p:
+            request = p.request.new_context()
+            scraper._browser = SyncRequestBrowser(request)
+            scraper._page = scraper._browser.new_page()
+            try:
+                updated, failed = scraper.crawl_channels(jobs)
+            finally:
+                request.dispose()
+    else:
+        async def crawl():
+            async with async_playwright() as p:
+                request = await p.request.new_context()
+                scraper._browser = AsyncRequestBrowser(request)
+                scraper._page = await scraper._browser.new_page()
+                try:
+                    return await scraper.crawl_channels(jobs)
+                finally:
+                    await request.dispose()
+
+        updated, failed = asyncio.run(crawl())
+
+    assert (updated, failed) == (1, 1)
+    broken = stored_channel(scraper, '@broken')
+    assert broken['subscriber_count'] == 1000
+    assert (broken['average_views'], broken['average_views_samples'], broken['average_views_source']) == (7000, 24, 'history')
+    assert broken['last_updated'] == '2026-10-01 08:00:00'
+    assert stored_channel(scraper, '@healthy')['average_views'] == FIXTURE_AVERAGE
+    assert 'average views left unchanged' in capsys.readouterr().out
@@ -0,0 +1,61 @@
+from conftest import channels_feed_page, fixture_json
+from ytsubs.scrape_channel_stats import ChannelStatsMixin
+
+CHANNELS = 2000
+
+
+def test_parses_every_channel_of_a_large_list():
+    page = channels_feed_page(CHANNELS, filler_bytes=500_000)
+
+    channels, request = ChannelStatsMixin().read_channel_page(page)
+
+    assert len(channels) == CHANNELS
+    assert request is None
+    assert channels['fixture0'] == {
+        'id': 'fixture0',
+        'name': 'Fixture Channel 0',
+        'url': 'https://youtube.com/@fixture0',
+        'description': 'Videos about fixtures, every week.',
+        'subscriber_count': 1000,
+        'thumbnail_url': 'https://yt3.ggpht.com/fixture=s176-c-k-c0x00ffffff-no-rj-mo',
+        'is_verified': True,
+        'handle': 'fixture0',
+        'youtube_id': 'UCfixture000000000000000',
+    }
+    last = channels[f'fixture{CHANNELS - 2}']
+    assert (last['name'], last['subscriber_count'], last['is_verified']) == (
+        f'Fixture Channel {CHANNELS - 2}', (CHANNELS - 1) * 1000, (CHANNELS - 2) % 3 == 0,
+    )
+    # Channels without a handle are keyed by their UC id
+    no_handle = channels['UCfixture000000000000099']
+    assert no_handle['handle'] is None
+    assert no_handle['url'] == 'https://youtube.com/channel/UCfixture000000000000099'
+    assert sum(channel['handle'] is None for channel in channels.values()) == CHANNELS // 100
+
+
+def test_continuation_request_reuses_the_page_client():
+    page = channels_feed_page(10, continuation='page-2')
+
+    channels, request = ChannelStatsMixin().read_channel_page(page)
+
+    assert len(channels) == 10
+    url, body = request
+    assert url == 'https://www.youtube.com/youtubei/v1/browse?prettyPrint=false&key=test-key'
+    assert body == {
+        'context': {'client': {'clientName': 'WEB', 'clientVersion': '2.20260101.00.00'}},
+        'continuation': 'page-2',
+    }
+
+    continued = {'onResponseReceivedActions': [{'appendContinuationItemsAction': {'continuationItems': [
+        fixture_json('channel_renderer.json'),
+        {'continuationItemRenderer': {'continuationEndpoint': {'continuationCommand': {'token': 'page-3'}}}},
+    ]}}]}
+    mixin = ChannelStatsMixin()
+    assert list(mixin.channel_info_from_data(continued)) == ['fixture']
+    assert mixin.next_channel_request(request, continued) == (url, {**body, 'continuation': 'page-3'})
+    # A page repeating its own token ends the crawl
+    assert mixin.next_channel_request((url, {**body, 'continuation': 'page-3'}), continued) is None
+
+
+def test_page_without_initial_data():
+    assert ChannelStatsMixin().read_channel_page('<html><body>Sign in</body></html>') == ({}, None)
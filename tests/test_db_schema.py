@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import ytsubs.scrape_videos
+from ytsubs.scrape_videos import DATE_PRECISION_SECONDS, VideoScraper
+
+FIRST_SCRAPE = datetime(2026, 10, 10, 12, 0, 0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Pin datetime.now() in scrape_videos; set clock.now to move time between scrapes"""
+    class FrozenDatetime(datetime):
+        now_value = FIRST_SCRAPE
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.now_value
+
+    monkeypatch.setattr(ytsubs.scrape_videos, 'datetime', FrozenDatetime)
+    return FrozenDatetime
+
+
+@pytest.fixture
+def channel_db(db):
+    db.db.execute(
+        "INSERT INTO channels (id, name, url, subscriber_count, average_views) "
+        "VALUES ('UC1', 'Channel', 'https://www.youtube.com/channel/UC1', 10000, 1000)"
+    )
+    db.db.commit()
+    return db
+
+
+def scrape(db, clock, at: datetime, date_text: str, views: int = 100) -> None:
+    """Store one video as a scrape at `at` showing `date_text` would"""
+    clock.now_value = at
+    published, precision = VideoScraper(source='network').parse_date_with_precision(date_text)
+    db.upsert_videos([
+        ('vid1', 'UC1', 'Title', 'https://www.youtube.com/watch?v=vid1', None, views, published, precision, '1:00', 60),
+    ])
+
+
+def stored(db) -> tuple:
+    return tuple(db.db.execute('SELECT published_date, published_precision, views FROM videos').fetchone())
+
+
+def test_repeated_scrapes_do_not_drift(channel_db, clock):
+    scrape(channel_db, clock, FIRST_SCRAPE, '3 days ago')
+    first = (FIRST_SCRAPE - timedelta(days=3)).isoformat()
+
+    for hours_later, views in ((2, 150), (9, 200), (20, 260)):
+        scrape(channel_db, clock, FIRST_SCRAPE + timedelta(hours=hours_later), '3 days ago', views)
+        assert stored(channel_db) == (first, DATE_PRECISION_SECONDS['day'], views)
+
+    # A coarser unit later on does not move the date either
+    scrape(channel_db, clock, FIRST_SCRAPE + timedelta(days=5), '1 week ago', 300)
+    assert stored(channel_db) == (first, DATE_PRECISION_SECONDS['day'], 300)
+
+
+def test_more_precise_date_refines_the_first_seen_one(channel_db, clock):
+    scrape(channel_db, clock, FIRST_SCRAPE, '1 day ago')
+    refined_at = FIRST_SCRAPE + timedelta(minutes=30)
+    scrape(channel_db, clock, refined_at, '23 hours ago')
+    refined = (refined_at - timedelta(hours=23)).isoformat()
+    assert stored(channel_db)[:2] == (refined, DATE_PRECISION_SECONDS['hour'])
+
+    # Back to a day-precision label: the hour-precision date stays
+    scrape(channel_db, clock, FIRST_SCRAPE + timedelta(hours=6), '1 day ago')
+    assert stored(channel_db)[:2] == (refined, DATE_PRECISION_SECONDS['hour'])
+
+
+def test_dates_of_unknown_precision_are_replaced(channel_db, clock):
+    channel_db.db.execute(
+        "INSERT INTO videos (id, title, url, channel_id, views, published_date) "
+        "VALUES ('vid1', 'Title', 'https://www.youtube.com/watch?v=vid1', 'UC1', 50, '2026-10-01T00:00:00')"
+    )
+    channel_db.db.commit()
+
+    scrape(channel_db, clock, FIRST_SCRAPE, '2 weeks ago')
+
+    assert stored(channel_db) == ((FIRST_SCRAPE - timedelta(days=14)).isoformat(), DATE_PRECISION_SECONDS['week'], 100)
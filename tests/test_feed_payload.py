@@ -0,0 +1,107 @@
+import base64
+import gzip
+import json
+import re
+import shutil
+import subprocess
+from importlib import resources
+
+import pytest
+
+from conftest import add_synthetic_feed
+from ytsubs.feed_payload import CHANNEL_FIELDS, encode_videos, payload_json
+from ytsubs.generate_feed import iter_videos
+from ytsubs.profiles import BUILTIN_PROFILES
+
+
+def decode(payload: dict) -> list[dict]:
+    """Python transcription of decodeFeed in static_template.html"""
+    channels = [
+        {field: payload['channels'][field][i] for field in CHANNEL_FIELDS}
+        for i in range(len(payload['channels']['name']))
+    ]
+    videos = []
+    for i, channel_index in enumerate(payload['channel']):
+        video = {'channel': channels[channel_index]}
+        video.update({key: values[i] for key, values in payload['fields'].items()})
+        video['performance_details'] = {key: values[i] for key, values in payload['details'].items()}
+        video.update(video['performance_details'])
+        if 'profile_scores' in payload:
+            video['profile_scores'] = {name: scores[i] for name, scores in payload['profile_scores'].items()}
+        videos.append(video)
+    return videos
+
+
+def template_function(name: str) -> str:
+    template = resources.files('ytsubs').joinpath('static_template.html').read_text(encoding='utf-8')
+    match = re.search(rf'^( *)(async )?function {name}\(.*?^\1\}}$', template, re.MULTILINE | re.DOTALL)
+    assert match, f"{name} not found in static_template.html"
+    return match.group(0)
+
+
+@pytest.fixture
+def feed_videos(db):
+    add_synthetic_feed(db.db, videos=400, channels=25)
+    return list(iter_videos([BUILTIN_PROFILES['default'], BUILTIN_PROFILES['rising']]))
+
+
+def test_columnar_round_trip(feed_videos):
+    payload = json.loads(payload_json(encode_videos(feed_videos)))
+
+    assert payload['count'] == len(feed_videos) > 300
+    assert len(payload['channels']['name']) == len({video['channel']['name'] for video in feed_videos}) <= 25
+    assert list(payload['profile_scores']) == ['default', 'rising']
+    assert decode(payload) == feed_videos
+
+
+def test_empty_batch():
+    payload = encode_videos([])
+
+    assert payload['count'] == 0 and 'profile_scores' not in payload
+    assert decode(json.loads(payload_json(payload))) == []
+
+
+def test_script_end_tags_are_escaped(feed_videos):
+    feed_videos[0]['title'] = 'Why </script><script>alert(1)</script> breaks pages'
+    feed_videos[1]['channel'] = {**feed_videos[1]['channel'], 'name': 'Tags </SCRIPT> and </style>'}
+
+    text = payload_json(encode_videos(feed_videos[:2]))
+
+    assert '</' not in text
+    assert decode(json.loads(text)) == feed_videos[:2]
+
+
+def test_compressed_payload_inflates_to_the_same_json(feed_videos):
+    feed_videos[0]['title'] = 'A </script> title'
+    payload = encode_videos(feed_videos)
+
+    wrapper = json.loads(payload_json(payload, compress=True))
+
+    assert wrapper['encoding'] == 'gzip+base64'
+    inflated = gzip.decompress(base64.b64decode(wrapper['data'])).decode('utf-8')
+    assert json.loads(inflated) == json.loads(payload_json(payload)) == payload
+    assert len(wrapper['data']) < len(payload_json(payload))
+    assert payload_json(payload, compress=True) == payload_json(payload, compress=True)  # mtime=0: stable output
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_page_decoder_restores_the_videos(feed_videos, compress):
+    node = shutil.which('node')
+    if not node:
+        pytest.skip("node is not installed")
+    script = '\n'.join([
+        template_function('decodeFeed'),
+        template_function('inflatePayload'),
+        "let input = '';",
+        "process.stdin.on('data', (chunk) => { input += chunk; });",
+        "process.stdin.on('end', async () => {",
+        "  process.stdout.write(JSON.stringify(decodeFeed(await inflatePayload(JSON.parse(input)))));",
+        "});",
+    ])
+
+    result = subprocess.run(
+        [node, '-e', script], input=payload_json(encode_videos(feed_videos), compress),
+        capture_output=True, text=True, check=True, timeout=60,
+    )
+
+    assert json.loads(result.stdout) == feed_videos
@@ -0,0 +1,92 @@
+import json
+import tracemalloc
+
+from ytsubs.generate_feed import feed_data_dir, generate_html
+
+# Peak Python allocations while writing a 200k-video feed. Holding the feed as a list of
+# dicts alone takes several hundred MB; streaming keeps one 2,000-video batch in memory.
+STREAMING_PEAK_BYTES = 40 * 1024 * 1024
+
+
+DETAILS = {
+    'relative_performance': 1.2,
+    'subscriber_reach': 0.1,
+    'forecast_relative_performance': 1.3,
+    'velocity': 40.0,
+    'video_age_hours': 30.0,
+    'views_per_hour': 40.0,
+    'observed_fraction_48h': 0.8,
+    'predicted_views_48h': 1500.0,
+}
+
+
+def feed_videos(count: int, channels: int = 500):
+    """Feed-shaped video dicts, produced lazily like iter_videos does"""
+    channel_info = [
+        {
+            'name': f'Channel {n}',
+            'subscriber_count': 10_000 + n,
+            'is_verified': n % 3 == 0,
+            'thumbnail': f'https://yt3.ggpht.com/channel{n}',
+            'average_views': 5000,
+            'average_views_samples': 30,
+            'average_views_source': 'crawl',
+        }
+        for n in range(channels)
+    ]
+    for i in range(count):
+        yield {
+            'id': f'video{i:07d}',
+            'title': f'Synthetic video number {i} with a title of typical length',
+            'url': f'https://www.youtube.com/watch?v=video{i:07d}',
+            'thumbnail': f'https://i.ytimg.com/vi/video{i:07d}/hqdefault.jpg',
+            'views': 1000 + i,
+            'published_date': f'2026-10-{1 + i % 28:02d}T12:00:00',
+            'duration': '12:34',
+            'avg_view_sub_ratio': 0.01,
+            'performance_score': 0.5 - i / (count * 4),
+            'channel': channel_info[i % channels],
+            'performance_details': DETAILS,
+        }
+
+
+def chunk_names(output_path):
+    return sorted(path.name for path in feed_data_dir(output_path).glob('feed-*.js'))
+
+
+def test_large_feed_is_written_with_bounded_memory(tmp_path):
+    output_path = tmp_path / 'feed.html'
+
+    tracemalloc.start()
+    try:
+        generate_html(feed_videos(200_000), output_path, open_browser=False)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < STREAMING_PEAK_BYTES
+    chunks = chunk_names(output_path)
+    assert len(chunks) == 99  # 2,000 videos inlined, the rest in 2,000-video chunks
+    last_chunk = (feed_data_dir(output_path) / chunks[-1]).read_text()
+    assert last_chunk.startswith('ytsubsFeedChunk(') and 'video0199999' in last_chunk
+
+
+def test_regenerating_removes_stale_chunks(tmp_path):
+    output_path = tmp_path / 'feed.html'
+    data_dir = feed_data_dir(output_path)
+    data_dir.mkdir()
+    for number in range(10):
+        (data_dir / f'feed-{number:03d}.js').write_text('stale')
+    (data_dir / 'notes.txt').write_text('not a chunk')
+
+    generate_html(feed_videos(5000), output_path, open_browser=False, chunk_size=2000)
+
+    assert chunk_names(output_path) == ['feed-000.js', 'feed-001.js']
+    assert all((data_dir / name).read_text() != 'stale' for name in chunk_names(output_path))
+    assert (data_dir / 'notes.txt').exists()
+    page = output_path.read_text()
+    assert json.dumps([f'{data_dir.name}/feed-000.js', f'{data_dir.name}/feed-001.js']) in page
+
+    generate_html(feed_videos(100), output_path, open_browser=False, chunk_size=2000)
+
+    assert chunk_names(output_path) == []
@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from conftest import fixture_json
+from ytsubs.innertube import (
+    SHORTS_SECONDS,
+    browse_continuation_request,
+    continuation_token,
+    extract_initial_data,
+    extract_ytcfg,
+    iter_feed_items,
+    parse_duration,
+)
+
+
+@pytest.mark.parametrize('badge, seconds', [
+    ('12:34', 754),
+    ('1:02:03', 3723),
+    ('0:07', 7),
+    (' 10:00 ', 600),
+    ('SHORTS', SHORTS_SECONDS),
+    ('Shorts', SHORTS_SECONDS),
+    ('LIVE', None),
+    ('UPCOMING', None),
+    ('', None),
+    (None, None),
+    ('1:2:3:4', None),
+    ('45', None),
+    ('1:-2', None),
+])
+def test_parse_duration(badge, seconds):
+    assert parse_duration(badge) == seconds
+
+
+def test_browse_page_items_from_both_renderer_layouts():
+    data = fixture_json('subscriptions_page.json')
+
+    items = list(iter_feed_items(data))
+
+    assert [item['videoId'] for item in items] == ['aaaaaaaaaa1', 'bbbbbbbbbb2', 'cccccccccc3']
+    classic, lockup, live = items
+    assert classic == {
+        'videoId': 'aaaaaaaaaa1',
+        'title': 'Building a lathe from scrap',
+        'url': 'https://www.youtube.com/watch?v=aaaaaaaaaa1',
+        'channelName': 'Shop Channel',
+        'channelUrl': 'https://www.youtube.com/@shopchannel',
+        'channelId': 'shopchannel',
+        'channelText': None,
+        'views': '12,345 views',
+        'publishDate': '3 hours ago',
+        'thumbnailUrl': 'https://i.ytimg.com/vi/aaaaaaaaaa1/hqdefault.jpg',
+        'duration': '14:07',
+    }
+    assert lockup['title'] == 'Gymkhana practice day'
+    assert (lockup['channelName'], lockup['channelId']) == ('Moto Lab', 'motolab')
+    assert (lockup['views'], lockup['publishDate']) == ('987 views', '1 day ago')
+    assert lockup['thumbnailUrl'].endswith('/hq720.jpg')
+    assert parse_duration(lockup['duration']) == 3723
+    assert live['views'] == 0  # "45 watching" is not a view count
+    assert parse_duration(live['duration']) is None
+    assert continuation_token(data) == 'token-page-2'
+
+
+def test_continuation_response_items_and_next_token():
+    data = fixture_json('subscriptions_continuation.json')
+
+    items = list(iter_feed_items(data))
+
+    assert [item['videoId'] for item in items] == ['dddddddddd4', 'eeeeeeeeee5']
+    assert items[0]['views'] == '1.2K views'
+    assert parse_duration(items[0]['duration']) == 60  # Shorts badge
+    assert items[1]['channelUrl'] == 'https://www.youtube.com/@thirdone'
+    assert continuation_token(data) == 'token-page-3'
+
+
+def test_malformed_response_skips_bad_nodes():
+    data = fixture_json('subscriptions_malformed.json')
+
+    items = list(iter_feed_items(data))
+
+    # No videoId, a playlist lockup and a lockup without metadata are dropped or kept bare;
+    # the videoRenderer whose runs is not a list must not abort the page
+    assert [item['videoId'] for item in items] == ['ffffffffff6']
+    assert items[0]['title'] is None and items[0]['views'] == 0
+    assert continuation_token(data) is None
+
+
+def test_missing_keys_yield_nothing():
+    assert list(iter_feed_items({})) == []
+    assert list(iter_feed_items({'contents': None})) == []
+    assert continuation_token([]) is None
+
+
+def test_initial_data_and_ytcfg_from_page_html():
+    data = fixture_json('subscriptions_page.json')
+    html = (
+        '<script>ytcfg.set({"INNERTUBE_API_KEY": "key"});</script>'
+        '<script>ytcfg.set({"INNERTUBE_CONTEXT": {"client": {"clientName": "WEB"}}});</script>'
+        f'<script>var ytInitialData = {json.dumps(data)};</script>'
+    )
+
+    assert extract_initial_data(html) == data
+    config = extract_ytcfg(html)
+    assert browse_continuation_request(config, 'token-page-2') == (
+        'https://www.youtube.com/youtubei/v1/browse?prettyPrint=false&key=key',
+        {'context': {'client': {'clientName': 'WEB'}}, 'continuation': 'token-page-2'},
+    )
+
+
+def test_truncated_page_html():
+    html = '<script>var ytInitialData = {"contents": {"twoColumn'
+    assert extract_initial_data(html) is None
+    assert extract_ytcfg('ytcfg.set({"INNERTUBE_API_KEY": ') == {}
+    assert browse_continuation_request({}, 'token') is None
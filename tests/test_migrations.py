@@ -0,0 +1,208 @@
+import sqlite3
+
+import pytest
+
+from ytsubs.channel_aliases import ChannelIndex, resolve_channel_id
+from ytsubs.db_schema import connect
+from ytsubs.migrations import (
+    MIGRATIONS,
+    QUERY_PLAN_EXPECTATIONS,
+    SCHEMA_VERSION,
+    check_query_plans,
+    migrate,
+    query_plan,
+    schema_version,
+)
+from ytsubs.scoring import check_video_scores
+
+
+def indexes(conn: sqlite3.Connection) -> set[str]:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+@pytest.mark.parametrize(
+    'sql, expected',
+    [(sql, expected) for _, sql, expected in QUERY_PLAN_EXPECTATIONS],
+    ids=[name for name, _, _ in QUERY_PLAN_EXPECTATIONS],
+)
+def test_hot_queries_use_their_index(db, sql, expected):
+    assert expected in query_plan(db.db, sql)
+
+
+def test_migrated_database(db):
+    assert schema_version(db.db) == SCHEMA_VERSION == MIGRATIONS[-1][0]
+    assert check_query_plans(db.db) == []
+    assert 'idx_videos_channel_id' not in indexes(db.db)  # Superseded by idx_videos_channel_published_views
+    assert migrate(db.db) == []
+
+
+# A database from before versioning: the original tables and indexes, user_version 0
+UNVERSIONED_SCHEMA = '''
+CREATE TABLE channels (
+    id TEXT PRIMARY KEY, youtube_id TEXT, name TEXT NOT NULL, url TEXT NOT NULL, handle TEXT, description TEXT,
+    subscriber_count INTEGER DEFAULT 0, thumbnail_url TEXT, is_verified BOOLEAN DEFAULT 0,
+    average_views INTEGER DEFAULT 0, last_updated TIMESTAMP
+);
+CREATE TABLE videos (
+    id TEXT PRIMARY KEY, title TEXT NOT NULL, url TEXT NOT NULL, channel_id TEXT NOT NULL,
+    views INTEGER DEFAULT 0, published_date TIMESTAMP, thumbnail TEXT, duration TEXT,
+    discovered_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_videos_published_date ON videos(published_date);
+CREATE INDEX idx_videos_channel_id ON videos(channel_id);
+'''
+
+
+def unversioned_database(tmp_path) -> sqlite3.Connection:
+    conn = connect(tmp_path / 'old.db')
+    conn.executescript(UNVERSIONED_SCHEMA)
+    return conn
+
+
+def test_unversioned_database_is_brought_up_to_date(tmp_path):
+    conn = unversioned_database(tmp_path)
+
+    applied = migrate(conn)
+
+    assert [version for version, _ in applied] == [version for version, _, _ in MIGRATIONS]
+    assert check_query_plans(conn) == []
+    assert 'idx_videos_channel_id' not in indexes(conn)
+    conn.close()
+
+
+# Badge text stored before migration 7 -> (duration_seconds, duration_score)
+BADGE_DURATIONS = {
+    'short1': ('SHORTS', 60, 0.01),
+    'clip1': ('1:45', 105, 0.01),
+    'talk1': ('9:59', 599, 0.02),
+    'essay1': ('12:34', 754, 0.03),
+    'lecture1': ('1:02:03', 3723, 0.015),
+    'stream1': ('LIVE', None, 0.015),
+    'premiere1': ('UPCOMING', None, 0.015),
+}
+
+
+def test_duration_backfill_rebuilds_video_scores(tmp_path, monkeypatch):
+    conn = unversioned_database(tmp_path)
+    with monkeypatch.context() as patch:
+        patch.setattr('ytsubs.migrations.MIGRATIONS', [m for m in MIGRATIONS if m[0] < 7])
+        migrate(conn)
+    conn.execute(
+        "INSERT INTO channels (id, name, url, subscriber_count, average_views) "
+        "VALUES ('lab', 'Lab', 'https://www.youtube.com/@lab', 50000, 8000)"
+    )
+    conn.executemany(
+        "INSERT INTO videos (id, title, url, channel_id, views, published_date, duration) "
+        "VALUES (?, 'Video', 'https://www.youtube.com/watch?v=' || ?, 'lab', 4000, datetime('now', 'localtime', '-2 days'), ?)",
+        [(video_id, video_id, badge) for video_id, (badge, _, _) in BADGE_DURATIONS.items()],
+    )
+    conn.commit()
+    # Version 6 scores never saw a duration
+    assert {row[0] for row in conn.execute('SELECT duration_score FROM video_scores')} == {0.015}
+
+    applied = migrate(conn)
+
+    assert [version for version, _ in applied] == [version for version, _, _ in MIGRATIONS if version >= 7]
+    assert dict(conn.execute('SELECT id, duration_seconds FROM videos').fetchall()) == {
+        video_id: seconds for video_id, (_, seconds, _) in BADGE_DURATIONS.items()
+    }
+    assert dict(conn.execute('SELECT video_id, duration_score FROM video_scores').fetchall()) == {
+        video_id: score for video_id, (_, _, score) in BADGE_DURATIONS.items()
+    }
+    assert check_video_scores(conn) == []
+    conn.close()
+
+
+SCISHOW_ID = 'UCZYTClx2T1of7BRZ86-8fow'
+VERITASIUM_ID = 'UCHnyfMqiRRG1u-2MsSQLbXA'
+
+# (id, youtube_id, name, url, handle, subscriber_count, average_views, last_updated)
+DUPLICATED_CHANNELS = [
+    # Crawled by scrape-channels under its handle, then seen on feed cards under its UC id
+    ('SciShow', SCISHOW_ID, 'SciShow', 'https://www.youtube.com/@SciShow', 'SciShow',
+     7_800_000, 400_000, '2026-10-01 10:00:00'),
+    (SCISHOW_ID, None, 'SciShow', f'https://www.youtube.com/channel/{SCISHOW_ID}', None, 0, 0, None),
+    # The same handle stored in two spellings
+    ('veritasium', None, 'Veritasium', 'https://www.youtube.com/@veritasium', 'veritasium',
+     17_000_000, 2_000_000, '2026-09-20 08:00:00'),
+    ('Veritasium', VERITASIUM_ID, 'Veritasium', 'https://www.youtube.com/@Veritasium', 'Veritasium',
+     16_000_000, 1_500_000, '2026-01-05 08:00:00'),
+    # Similar names, different channels
+    ('SciShowKids', 'UCRFIPG2u1DxKLNuE3y2SjHA', 'SciShow Kids', 'https://www.youtube.com/@SciShowKids', 'SciShowKids',
+     1_200_000, 60_000, '2026-10-01 10:00:00'),
+    ('scishowpsych', None, 'SciShow Psych', 'https://www.youtube.com/@scishowpsych', 'scishowpsych',
+     600_000, 30_000, '2026-10-01 10:00:00'),
+]
+VIDEO_CHANNELS = {
+    'card1': SCISHOW_ID, 'card2': SCISHOW_ID, 'crawl1': 'SciShow',
+    'lower1': 'veritasium', 'upper1': 'Veritasium',
+    'kids1': 'SciShowKids', 'psych1': 'scishowpsych',
+}
+SURVIVORS = {SCISHOW_ID: 'SciShow', 'Veritasium': 'veritasium'}
+
+
+@pytest.fixture
+def merged_database(tmp_path):
+    conn = unversioned_database(tmp_path)
+    conn.executemany(
+        'INSERT INTO channels (id, youtube_id, name, url, handle, subscriber_count, average_views, last_updated) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        DUPLICATED_CHANNELS,
+    )
+    conn.executemany(
+        "INSERT INTO videos (id, title, url, channel_id, views, published_date, duration) "
+        "VALUES (?, 'Video', 'https://www.youtube.com/watch?v=' || ?, ?, 5000, datetime('now', 'localtime', '-3 days'), '10:00')",
+        [(video_id, video_id, channel_id) for video_id, channel_id in VIDEO_CHANNELS.items()],
+    )
+    conn.commit()
+    migrate(conn)
+    yield conn
+    conn.close()
+
+
+def test_migration_merges_duplicate_channels(merged_database):
+    conn = merged_database
+    channels = {row['id']: row for row in conn.execute('SELECT * FROM channels')}
+
+    assert sorted(channels) == ['SciShow', 'SciShowKids', 'scishowpsych', 'veritasium']
+    scishow, veritasium = channels['SciShow'], channels['veritasium']
+    assert (scishow['subscriber_count'], scishow['average_views'], scishow['youtube_id']) == (7_800_000, 400_000, SCISHOW_ID)
+    # The most recently crawled spelling survives and takes the UC id it lacked
+    assert (veritasium['subscriber_count'], veritasium['average_views'], veritasium['youtube_id']) == (
+        17_000_000, 2_000_000, VERITASIUM_ID,
+    )
+    assert (channels['SciShowKids']['subscriber_count'], channels['scishowpsych']['average_views']) == (1_200_000, 30_000)
+
+    expected = {video_id: SURVIVORS.get(channel_id, channel_id) for video_id, channel_id in VIDEO_CHANNELS.items()}
+    assert dict(conn.execute('SELECT id, channel_id FROM videos').fetchall()) == expected
+
+
+def test_video_scores_follow_the_surviving_channel(merged_database):
+    conn = merged_database
+    scores = {
+        row['video_id']: (row['channel_id'], row['subscriber_count'], row['channel_average_views'])
+        for row in conn.execute('SELECT * FROM video_scores')
+    }
+
+    assert scores['card1'] == scores['crawl1'] == ('SciShow', 7_800_000, 400_000)
+    assert scores['upper1'] == scores['lower1'] == ('veritasium', 17_000_000, 2_000_000)
+    assert scores['kids1'][0] == 'SciShowKids'
+    assert check_video_scores(conn) == []
+
+
+@pytest.mark.parametrize('identifier, expected', [
+    ('https://www.youtube.com/@SciShow', 'SciShow'),
+    ('/@scishow', 'SciShow'),
+    ('@SCISHOW', 'SciShow'),
+    (f'https://www.youtube.com/channel/{SCISHOW_ID}', 'SciShow'),
+    (f'/channel/{SCISHOW_ID}/videos', 'SciShow'),
+    (SCISHOW_ID, 'SciShow'),
+    ('SciShow', 'SciShow'),
+    (VERITASIUM_ID, 'veritasium'),
+    ('https://www.youtube.com/@Veritasium', 'veritasium'),
+    ('https://www.youtube.com/@SciShowKids', 'SciShowKids'),
+    ('https://www.youtube.com/@scishowtalkshow', None),
+])
+def test_aliases_resolve_to_the_surviving_channel(merged_database, identifier, expected):
+    assert ChannelIndex.load(merged_database).resolve(identifier) == expected
+    assert resolve_channel_id(merged_database, identifier) == expected
@@ -0,0 +1,154 @@
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from conftest import Response
+from ytsubs.oembed import OEmbedPool, OEmbedResolver
+
+
+def serve_oembed(server, videos, delay=0.0, arrivals=None):
+    """Fake oEmbed endpoint: video id -> author dict, or an HTTP status to fail with"""
+    def respond(path, body):
+        if arrivals is not None:
+            arrivals.append(time.monotonic())
+        video_url = parse_qs(urlsplit(path).query)['url'][0]
+        answer = videos.get(parse_qs(urlsplit(video_url).query)['v'][0], 404)
+        if isinstance(answer, int):
+            return Response(answer, 'error', 'text/plain', delay=delay)
+        return Response(body=json.dumps({'type': 'video', **answer}), content_type='application/json', delay=delay)
+
+    server.routes['/oembed'] = respond
+    return f'{server.url}/oembed'
+
+
+AUTHORS = {
+    'byhandle01': {'author_name': 'Moto Lab', 'author_url': 'https://www.youtube.com/@motolab'},
+    'bychannel1': {'author_name': 'Shop', 'author_url': 'https://www.youtube.com/channel/UCshop0000000000000000001'},
+    'noauthor01': {'title': 'No author fields'},
+    'flaky00001': 503,
+    'removed001': 404,
+}
+
+
+@pytest.fixture
+def resolver(db, http_server):
+    return OEmbedResolver(db.db, endpoint=serve_oembed(http_server, AUTHORS))
+
+
+def test_miss_then_hit(resolver, http_server):
+    assert resolver.resolve('byhandle01') == ('motolab', 'https://www.youtube.com/@motolab', 'Moto Lab')
+    assert resolver.resolve('byhandle01') == ('motolab', 'https://www.youtube.com/@motolab', 'Moto Lab')
+    assert resolver.resolve('bychannel1')[0] == 'UCshop0000000000000000001'
+
+    assert len(http_server.paths()) == 2
+    assert resolver.stats == {'hits': 1, 'negative_hits': 0, 'misses': 2, 'errors': 0}
+
+
+def test_definite_misses_are_cached_briefly(resolver, http_server):
+    assert resolver.resolve('removed001') == (None, None, None)
+    assert resolver.resolve('noauthor01') == (None, None, None)
+    assert resolver.resolve('removed001') == (None, None, None)
+    assert resolver.resolve('noauthor01') == (None, None, None)
+
+    assert len(http_server.paths()) == 2
+    assert resolver.stats['negative_hits'] == 2
+
+
+def test_server_errors_are_not_cached(resolver, http_server):
+    assert resolver.resolve('flaky00001') == (None, None, None)
+    assert resolver.resolve('flaky00001') == (None, None, None)
+
+    assert len(http_server.paths()) == 2
+    assert resolver.stats == {'hits': 0, 'negative_hits': 0, 'misses': 2, 'errors': 2}
+    assert resolver.conn.execute('SELECT COUNT(*) FROM oembed_cache').fetchone()[0] == 0
+
+
+def test_unreachable_endpoint_is_an_error(db):
+    resolver = OEmbedResolver(db.db, endpoint='http://127.0.0.1:9/oembed')
+
+    assert resolver.resolve('byhandle01') == (None, None, None)
+    assert resolver.stats['errors'] == 1
+
+
+@pytest.mark.parametrize('video_id, ttl', [('byhandle01', timedelta(days=30)), ('removed001', timedelta(days=1))])
+def test_entries_expire_after_their_ttl(resolver, http_server, video_id, ttl):
+    resolver.resolve(video_id)
+
+    def backdate(age):
+        fetched_at = (datetime.now(timezone.utc) - age).isoformat()
+        resolver.conn.execute('UPDATE oembed_cache SET fetched_at = ?', (fetched_at,))
+        resolver.conn.commit()
+
+    backdate(ttl - timedelta(hours=1))
+    resolver.resolve(video_id)
+    assert len(http_server.paths()) == 1
+
+    backdate(ttl + timedelta(hours=1))
+    resolver.resolve(video_id)
+    assert len(http_server.paths()) == 2
+
+
+def pool_for(db, endpoint, **options):
+    return OEmbedPool(OEmbedResolver(db.db, endpoint=endpoint), **options)
+
+
+def test_pool_caps_the_request_rate(db, http_server):
+    arrivals = []
+    video_ids = [f'video{i:05d}' for i in range(8)]
+    endpoint = serve_oembed(http_server, {video_id: AUTHORS['byhandle01'] for video_id in video_ids},
+                            arrivals=arrivals)
+    pool = pool_for(db, endpoint, workers=4, rate=20.0)
+    try:
+        for video_id in video_ids:
+            pool.submit(video_id)
+        results = pool.completed(wait=True)
+    finally:
+        pool.shutdown()
+
+    assert len(results) == 8
+    # Slots are handed out 1/20 s apart however many workers are free
+    assert arrivals[-1] - arrivals[0] >= 7 / 20 - 0.02
+
+
+def test_pool_overlaps_slow_lookups(db, http_server):
+    video_ids = [f'video{i:05d}' for i in range(8)]
+    endpoint = serve_oembed(http_server, {video_id: AUTHORS['byhandle01'] for video_id in video_ids}, delay=0.2)
+    pool = pool_for(db, endpoint, workers=4, rate=None)
+    started = time.monotonic()
+    try:
+        for video_id in video_ids:
+            pool.submit(video_id)
+        results = pool.completed(wait=True)
+    finally:
+        pool.shutdown()
+
+    assert len(results) == 8
+    assert http_server.max_in_flight == 4
+    assert time.monotonic() - started < 8 * 0.2
+
+
+def test_pool_reports_each_outcome_with_its_context(db, http_server):
+    endpoint = serve_oembed(http_server, AUTHORS, delay=0.1)
+    pool = pool_for(db, endpoint, workers=2, rate=None)
+    try:
+        for video_id in ('byhandle01', 'flaky00001', 'removed001'):
+            pool.submit(video_id, context={'card': video_id})
+        pool.submit('byhandle01', context='ignored duplicate')
+        assert pool.completed() == []  # Nothing has come back yet
+        results = {video_id: (resolved, context) for video_id, resolved, context in pool.completed(wait=True)}
+    finally:
+        pool.shutdown()
+
+    assert results == {
+        'byhandle01': (('motolab', 'https://www.youtube.com/@motolab', 'Moto Lab'), {'card': 'byhandle01'}),
+        'flaky00001': ((None, None, None), {'card': 'flaky00001'}),
+        'removed001': ((None, None, None), {'card': 'removed001'}),
+    }
+    assert pool.pending == {}
+    assert pool.resolver.stats == {'hits': 0, 'negative_hits': 0, 'misses': 3, 'errors': 1}
+    # The 503 is retried on the next run; the 404 is a cached miss
+    cached = dict(db.db.execute('SELECT video_id, channel_id FROM oembed_cache'))
+    assert cached == {'byhandle01': 'motolab', 'removed001': None}
@@ -0,0 +1,89 @@
+import pytest
+
+from ytsubs import cli
+from ytsubs.profiles import BUILTIN_PROFILES, load_profiles, profiles_path
+from ytsubs.scoring import DEFAULT_CURVE, DEFAULT_WEIGHTS, ForecastCurve
+
+USER_PROFILES = '''
+[profiles.rising]
+description = "Taking off in the last few hours"
+weights = { forecast_48h = 0.5, velocity = 0.3 }
+
+[profiles.rising.curve]
+early_hours = 4
+
+[profiles.deep-dives]
+description = "Long videos from mid-sized channels"
+weights = { duration = 0.10, channel_size = 0 }
+'''
+
+
+def test_user_profiles_override_and_extend_the_builtins():
+    profiles_path().write_text(USER_PROFILES, encoding='utf-8')
+
+    profiles = load_profiles()
+
+    assert list(profiles) == ['default', 'rising', 'small-channels', 'deep-dives']
+    assert profiles['default'] == BUILTIN_PROFILES['default']
+    assert profiles['small-channels'] == BUILTIN_PROFILES['small-channels']
+    rising = profiles['rising']
+    assert rising.description == 'Taking off in the last few hours'
+    # Left-out weights and curve values fall back to the default profile, not the built-in being replaced
+    assert rising.weights == {**DEFAULT_WEIGHTS, 'forecast_48h': 0.5, 'velocity': 0.3}
+    assert rising.curve == ForecastCurve(early_hours=4.0)
+    deep_dives = profiles['deep-dives']
+    assert deep_dives.weights == {**DEFAULT_WEIGHTS, 'duration': 0.10, 'channel_size': 0.0}
+    assert deep_dives.curve == DEFAULT_CURVE
+
+
+def test_explicit_path_and_missing_file(tmp_path):
+    path = tmp_path / 'team.toml'
+    path.write_text('[profiles.team]\ndescription = "Shared"\n', encoding='utf-8')
+
+    assert list(load_profiles(path)) == [*BUILTIN_PROFILES, 'team']
+    assert load_profiles(tmp_path / 'missing.toml') == BUILTIN_PROFILES
+
+
+@pytest.mark.parametrize('toml, message', [
+    ('[profiles.fast]\nweight = { velocity = 1 }', r"'fast': unknown keys weight"),
+    ('[profiles.fast]\nweights = { speed = 1 }', r"'fast': unknown weight 'speed'"),
+    ('[profiles.fast]\nweights = { velocity = "high" }', r"weight 'velocity' must be a non-negative number"),
+    ('[profiles.fast]\nweights = { velocity = true }', r"weight 'velocity' must be a non-negative number"),
+    ('[profiles.fast]\nweights = { velocity = -0.1 }', r"weight 'velocity' must be a non-negative number"),
+    ('[profiles.fast.curve]\nearly_days = 1', r"'fast': unknown curve keys early_days"),
+    ('[profiles.fast.curve]\nearly_hours = "six"', r"curve values must be numbers"),
+    ('[profiles.fast.curve]\nfloor = false', r"curve values must be numbers"),
+    ('[profiles.fast.curve]\nearly_hours = 60', r"curve needs 0 < early_hours < full_hours"),
+    ('[profiles.fast]\ndescription = "a"\n\n[profiles.fast]\ndescription = "b"', r"profiles\.toml: "),
+    ('[profiles]\nfast = 1', r"\[profiles\.fast\] must be a table"),
+])
+def test_invalid_profiles_raise_value_error(toml, message):
+    profiles_path().write_text(toml, encoding='utf-8')
+
+    with pytest.raises(ValueError, match=message):
+        load_profiles()
+
+
+def test_feed_rejects_an_unknown_profile(capsys):
+    assert cli.main(['feed', '--profile', 'rising', '--profile', 'unknown', '--no-open']) == 1
+
+    output = capsys.readouterr().out
+    assert 'Unknown ranking profile: unknown' in output
+    assert 'available: default, rising, small-channels' in output
+
+
+def test_feed_reports_a_broken_profiles_file(tmp_path, capsys):
+    path = tmp_path / 'profiles.toml'
+    path.write_text('[profiles.fast]\nweights = { speed = 1 }', encoding='utf-8')
+
+    assert cli.main(['feed', '--profiles-file', str(path)]) == 1
+    assert "Error loading ranking profiles: Profile 'fast': unknown weight 'speed'" in capsys.readouterr().out
+
+
+def test_feed_lists_user_profiles(capsys):
+    profiles_path().write_text(USER_PROFILES, encoding='utf-8')
+
+    assert cli.main(['feed', '--list-profiles']) == 0
+    output = capsys.readouterr().out
+    assert 'deep-dives       Long videos from mid-sized channels' in output
+    assert 'rising           Taking off in the last few hours' in output
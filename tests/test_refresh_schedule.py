@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta, timezone
+
+from ytsubs.channel_aliases import record_channel_aliases
+from ytsubs.refresh_schedule import ACTIVITY_WINDOW_DAYS, plan_refresh
+
+UPLOADS = 10  # Enough recent uploads to make a channel crawled 5 days ago due
+
+
+def add_channel(conn, channel_id: str, upload_ages: list[timedelta], now: datetime,
+                crawled: timedelta = timedelta(days=5)) -> None:
+    last_updated = (now - crawled).astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')  # Like CURRENT_TIMESTAMP
+    conn.execute(
+        "INSERT INTO channels (id, name, url, subscriber_count, average_views, last_updated) "
+        "VALUES (?, ?, ?, 10000, 500, ?)",
+        (channel_id, channel_id, f'https://www.youtube.com/channel/{channel_id}', last_updated),
+    )
+    record_channel_aliases(conn, channel_id)
+    conn.executemany(
+        'INSERT INTO videos (id, title, url, channel_id, views, published_date) VALUES (?, ?, ?, ?, 100, ?)',
+        [
+            (f'{channel_id}-{n}', 'Video', f'https://www.youtube.com/watch?v={channel_id}-{n}', channel_id,
+             (now - age).isoformat())
+            for n, age in enumerate(upload_ages)
+        ],
+    )
+    conn.commit()
+
+
+def job(channel_id: str) -> tuple[str, dict]:
+    return channel_id, {'youtube_id': channel_id, 'handle': None, 'subscriber_count': 10000}
+
+
+def test_activity_window_uses_local_publish_dates(db, far_from_utc):
+    now = datetime.now()
+    window = timedelta(days=ACTIVITY_WINDOW_DAYS)
+    add_channel(db.db, 'UCinside', [window - timedelta(hours=2)] * UPLOADS, now)
+    add_channel(db.db, 'UCoutside', [window + timedelta(hours=2)] * UPLOADS, now)
+
+    plan = plan_refresh(db.db, [job('UCinside'), job('UCoutside')])
+
+    assert [channel_id for channel_id, _ in plan.due] == ['UCinside']
+    assert [channel_id for channel_id, _ in plan.fresh] == ['UCoutside']
+
+
+def test_activity_window_follows_the_given_time(db):
+    now = datetime(2026, 3, 1, 12, 0, 0)
+    add_channel(db.db, 'UCactive', [timedelta(days=day) for day in range(UPLOADS)], now)
+    add_channel(db.db, 'UClapsed', [timedelta(days=ACTIVITY_WINDOW_DAYS + 1 + day) for day in range(UPLOADS)], now)
+
+    plan = plan_refresh(db.db, [job('UCactive'), job('UClapsed')], now=now)
+
+    assert [channel_id for channel_id, _ in plan.due] == ['UCactive']
+    assert [channel_id for channel_id, _ in plan.fresh] == ['UClapsed']
+
+
+def test_time_since_crawl_follows_the_given_time(db):
+    now = datetime(2026, 3, 1, 12, 0, 0)
+    add_channel(db.db, 'UCquiet', [], now, crawled=timedelta(days=3))
+
+    assert [channel_id for channel_id, _ in plan_refresh(db.db, [job('UCquiet')], now=now).fresh] == ['UCquiet']
+    later = now + timedelta(days=5)
+    assert [channel_id for channel_id, _ in plan_refresh(db.db, [job('UCquiet')], now=later).due] == ['UCquiet']
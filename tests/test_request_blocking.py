@@ -0,0 +1,140 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from playwright.sync_api import sync_playwright
+
+from conftest import Response
+from ytsubs.request_blocking import AD_HOSTS, DEFAULT_BLOCK_SPEC, ESTIMATED_BYTES, ESTIMATED_OTHER_BYTES, RequestBlocker
+
+ABORTED = [
+    ('image', 'https://i.ytimg.com/vi/abc123def45/hqdefault.jpg'),
+    ('image', 'https://yt3.ggpht.com/avatar=s88-c-k'),
+    ('media', 'https://rr3---sn-abc.googlevideo.com/videoplayback?itag=18'),
+    ('font', 'https://fonts.gstatic.com/s/roboto/v30/KFOmCnqEu92Fr1Mu4mxK.woff2'),
+    ('script', 'https://securepubads.g.doubleclick.net/tag/js/gpt.js'),
+    ('xhr', 'https://www.google-analytics.com/g/collect?v=2'),
+    ('script', 'https://imasdk.googleapis.com/js/sdkloader/ima3.js'),
+]
+PASSED = [
+    ('document', 'https://www.youtube.com/feed/subscriptions'),
+    ('xhr', 'https://www.youtube.com/youtubei/v1/browse?prettyPrint=false'),
+    ('fetch', 'https://www.youtube.com/youtubei/v1/next'),
+    ('script', 'https://www.youtube.com/s/desktop/12345678/jsbin/desktop_polymer.vflset/desktop_polymer.js'),
+    ('stylesheet', 'https://www.youtube.com/s/desktop/12345678/cssbin/www-main-desktop-home-page-skeleton.css'),
+    ('xhr', 'https://notdoubleclick.net/ping'),  # Only the host and its subdomains match
+]
+
+
+class FakeRoute:
+    """Records what a route handler did with the request"""
+
+    def __init__(self, resource_type: str, url: str):
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.outcome = None
+
+    def abort(self, error_code: str = 'failed') -> None:
+        self.outcome = ('abort', error_code)
+
+    def continue_(self) -> None:
+        self.outcome = ('continue',)
+
+
+class AsyncFakeRoute(FakeRoute):
+    async def abort(self, error_code: str = 'failed') -> None:
+        FakeRoute.abort(self, error_code)
+
+    async def continue_(self) -> None:
+        FakeRoute.continue_(self)
+
+
+@pytest.mark.parametrize('resource_type, url', ABORTED)
+def test_default_spec_blocks_assets_and_ad_hosts(resource_type, url):
+    assert RequestBlocker.from_spec(DEFAULT_BLOCK_SPEC).should_block(resource_type, url)
+
+
+@pytest.mark.parametrize('resource_type, url', PASSED)
+def test_default_spec_lets_data_requests_through(resource_type, url):
+    assert not RequestBlocker.from_spec(DEFAULT_BLOCK_SPEC).should_block(resource_type, url)
+
+
+def test_route_handlers_abort_or_continue():
+    blocker = RequestBlocker.from_spec(DEFAULT_BLOCK_SPEC)
+    requests = ABORTED + PASSED
+
+    routes = [FakeRoute(*request) for request in requests]
+    for route in routes:
+        blocker.handle_route(route)
+    async_routes = [AsyncFakeRoute(*request) for request in requests]
+
+    async def route_all():
+        for route in async_routes:
+            await blocker.handle_route_async(route)
+
+    asyncio.run(route_all())
+
+    expected = [('abort', 'blockedbyclient')] * len(ABORTED) + [('continue',)] * len(PASSED)
+    assert [route.outcome for route in routes] == expected
+    assert [route.outcome for route in async_routes] == expected
+    assert blocker.stats['requests'] == 2 * len(requests)
+    assert blocker.stats['blocked'] == 2 * len(ABORTED)
+    assert blocker.blocked_by_type == {'image': 4, 'media': 2, 'font': 2, 'script': 4, 'xhr': 2}
+    assert blocker.summary().startswith(f"Blocked {2 * len(ABORTED)} of {2 * len(requests)} page requests")
+
+
+def test_block_specs():
+    assert not RequestBlocker.from_spec('none')
+    assert not RequestBlocker.from_spec('')
+    custom = RequestBlocker.from_spec('Image, example-tracker.com')
+    assert custom.resource_types == {'image'} and custom.hosts == ('example-tracker.com',)
+    assert custom.should_block('script', 'https://cdn.example-tracker.com/t.js')
+    assert not custom.should_block('font', 'https://fonts.gstatic.com/roboto.woff2')
+    assert RequestBlocker.from_spec('ads').hosts == AD_HOSTS
+    with pytest.raises(ValueError, match="Unknown block item 'document'"):
+        RequestBlocker.from_spec('document')
+
+
+HEAVY_PAGE = """<!DOCTYPE html>
+<html><head>
+<link rel="stylesheet" href="/static/page.css">
+<link rel="icon" href="data:,">
+<style>@font-face {{ font-family: Fixture; src: url(/static/roboto.woff2); }} body {{ font-family: Fixture; }}</style>
+<script src="http://securepubads.g.doubleclick.net:{port}/tag/js/gpt.js"></script>
+</head><body>
+<p>Subscriptions</p>
+<img src="/vi/abc123def45/hqdefault.jpg" width="320" height="180">
+<script>fetch('/youtubei/v1/browse', {{method: 'POST', body: '{{}}'}});</script>
+</body></html>
+"""
+
+
+def test_browser_never_requests_blocked_assets(http_server):
+    port = http_server.url.rsplit(':', 1)[1]
+    http_server.routes['/feed/subscriptions'] = Response(body=HEAVY_PAGE.format(port=port))
+    http_server.routes['/youtubei/v1/browse'] = Response(body='{}', content_type='application/json')
+    for path, content_type in (('/static/page.css', 'text/css'), ('/static/roboto.woff2', 'font/woff2'),
+                               ('/vi/abc123def45/hqdefault.jpg', 'image/jpeg'), ('/tag/js/gpt.js', 'text/javascript')):
+        http_server.routes[path] = Response(body='x' * 100, content_type=content_type)
+    blocker = RequestBlocker.from_spec(f'{DEFAULT_BLOCK_SPEC},stylesheet')
+
+    with sync_playwright() as p:
+        try:
+            # The ad host resolves to the fixture server, so a request that got through would show up there
+            browser = p.chromium.launch(args=['--host-resolver-rules=MAP securepubads.g.doubleclick.net 127.0.0.1'])
+        except Exception as e:
+            pytest.skip(f"Chromium is not installed: {e}")
+        try:
+            context = browser.new_context()
+            context.route('**/*', blocker.handle_route)
+            page = context.new_page()
+            page.goto(f'{http_server.url}/feed/subscriptions', wait_until='networkidle')
+        finally:
+            browser.close()
+
+    assert sorted(http_server.paths('GET')) == ['/feed/subscriptions']
+    assert http_server.paths('POST') == ['/youtubei/v1/browse']
+    assert blocker.blocked_by_type == {'stylesheet': 1, 'font': 1, 'image': 1, 'script': 1}
+    assert blocker.stats['estimated_bytes'] == (
+        ESTIMATED_BYTES['stylesheet'] + ESTIMATED_BYTES['font'] + ESTIMATED_BYTES['image'] + ESTIMATED_OTHER_BYTES
+    )
+    assert blocker.summary().startswith('Blocked 4 of 6 page requests')
@@ -0,0 +1,111 @@
+import pytest
+
+from conftest import add_synthetic_feed
+from ytsubs.profiles import BUILTIN_PROFILES
+from ytsubs.scoring import REFERENCE_SCORE_SQL, check_video_scores, julian_now, score_videos
+
+
+@pytest.fixture
+def feed_db(db):
+    add_synthetic_feed(db.db, videos=3000)
+    db.db.execute(
+        "INSERT INTO videos (id, title, url, channel_id, views, published_date) "
+        "VALUES ('undated', 'Undated', 'https://www.youtube.com/watch?v=undated', 'channel1', 5000, NULL)"
+    )
+    db.db.commit()
+    return db.db
+
+
+def test_score_videos_matches_reference_ordering(feed_db):
+    now = julian_now(feed_db)
+    reference = [dict(row) for row in feed_db.execute(REFERENCE_SCORE_SQL, {'now': now})]
+
+    ranked = score_videos(feed_db, now)
+
+    assert len(reference) > 2500  # Videos of channels without subscribers are left out of both
+    assert [video['id'] for video in ranked] == [row['id'] for row in reference]
+    for video, row in zip(ranked, reference):
+        assert video['performance_score'] == pytest.approx(row['performance_score'] or 0.0, abs=1e-12)
+        assert video['predicted_views_48h'] == pytest.approx(row['predicted_views_48h'] or 0.0, rel=1e-12)
+        assert video['avg_view_sub_ratio'] == pytest.approx(row['avg_view_sub_ratio'], rel=1e-12)
+    assert check_video_scores(feed_db) == []
+
+
+def test_score_videos_on_empty_database(db):
+    assert score_videos(db.db) == []
+    assert check_video_scores(db.db) == []
+
+
+def test_profile_scores_follow_each_profile(feed_db):
+    now = julian_now(feed_db)
+    profiles = [BUILTIN_PROFILES['rising'], BUILTIN_PROFILES['default']]
+
+    ranked = score_videos(feed_db, now, profiles)
+
+    scores = [video['performance_score'] for video in ranked]
+    assert scores == sorted(scores, reverse=True)
+    assert all(video['performance_score'] == video['profile_scores']['rising'] for video in ranked)
+    default_scores = sorted((video['profile_scores']['default'] for video in ranked), reverse=True)
+    assert default_scores == [video['performance_score'] for video in score_videos(feed_db, now)]
+
+
+def add_videos(conn):
+    conn.execute(
+        "INSERT INTO videos (id, title, url, channel_id, views, published_date, duration_seconds) "
+        "VALUES ('added', 'Added', 'https://www.youtube.com/watch?v=added', 'channel3', 12000, "
+        "datetime('now', 'localtime', '-5 hours'), 600)"
+    )
+    conn.execute(
+        "INSERT INTO channels (id, name, url, subscriber_count, average_views) "
+        "VALUES ('late', 'Late', 'https://www.youtube.com/@late', 50000, 2000)"
+    )
+    conn.execute(
+        "INSERT INTO videos (id, title, url, channel_id, views, published_date) "
+        "VALUES ('orphan', 'Orphan', 'https://www.youtube.com/watch?v=orphan', 'unknown', 300, "
+        "datetime('now', 'localtime', '-1 day'))"
+    )
+
+
+def update_videos(conn):
+    conn.execute("UPDATE videos SET views = views * 3 + 7 WHERE rowid % 5 = 0")
+    conn.execute("UPDATE videos SET published_date = datetime(published_date, '-2 hours') WHERE rowid % 11 = 0")
+    conn.execute("UPDATE videos SET duration_seconds = 45 WHERE rowid % 17 = 0")
+    conn.execute("UPDATE videos SET channel_id = 'channel2' WHERE rowid % 23 = 0")
+
+
+def update_channels(conn):
+    conn.execute("UPDATE channels SET subscriber_count = subscriber_count * 2 + 1000 WHERE id IN ('channel1', 'channel13')")
+    conn.execute("UPDATE channels SET average_views = 0 WHERE id = 'channel4'")
+    conn.execute("UPDATE channels SET average_views = 8000 WHERE id = 'channel7'")
+    conn.execute("UPDATE channels SET subscriber_count = 0 WHERE id = 'channel5'")
+
+
+def delete_videos(conn):
+    conn.execute("DELETE FROM videos WHERE rowid % 4 = 0")
+
+
+def delete_channels(conn):
+    conn.execute("DELETE FROM channels WHERE id IN ('channel2', 'channel9')")
+
+
+@pytest.mark.parametrize('mutate', [add_videos, update_videos, update_channels, delete_videos, delete_channels])
+def test_video_scores_follow_every_mutation(feed_db, mutate):
+    mutate(feed_db)
+    feed_db.commit()
+
+    assert check_video_scores(feed_db) == []
+
+
+def test_video_scores_follow_upserts(db):
+    add_synthetic_feed(db.db, videos=200, channels=10)
+    rows = [
+        (video_id, channel_id, 'Rescraped', url, None, views + 100, published, 3600, '1:00', 60)
+        for video_id, channel_id, url, views, published in db.db.execute(
+            'SELECT id, channel_id, url, views, published_date FROM videos WHERE rowid % 2 = 0'
+        )
+    ]
+    rows.append(('new', 'channel1', 'New', 'https://www.youtube.com/watch?v=new', None, 50, None, None, None, None))
+
+    db.upsert_videos(rows)
+
+    assert check_video_scores(db.db) == []
@@ -0,0 +1,28 @@
+from conftest import fixture_json
+from ytsubs.scrape_videos import VideoScraper
+
+
+class CapturedResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+def test_feed_items_seen_counts_items_not_bytes():
+    scraper = VideoScraper(source='network')
+
+    assert scraper._collect_feed_items() == []
+    assert scraper.feed_items_seen == 0
+    assert scraper.feed_bytes_per_scroll == [2]  # An empty pass still serializes to '[]'
+
+    scraper._captured_responses.append(CapturedResponse(fixture_json('subscriptions_continuation.json')))
+    assert len(scraper._collect_feed_items()) == 2
+    assert scraper.feed_items_seen == 2
+
+    # Repeats of already returned items are not new
+    scraper._captured_responses.append(CapturedResponse(fixture_json('subscriptions_continuation.json')))
+    assert scraper._collect_feed_items() == []
+    assert scraper.feed_items_seen == 2
+    assert len(scraper.feed_bytes_per_scroll) == 3
@@ -0,0 +1,93 @@
+import hashlib
+from datetime import datetime, timedelta
+
+from conftest import Response
+from ytsubs.thumbnails import DEFAULT_RECENT_DAYS, digest_path, evict, load_cached_thumbnails, sync
+
+IMAGES = {video_id: f'{video_id} jpeg bytes'.encode().ljust(1000, b'.') for video_id in ('vid1', 'vid2', 'vid3')}
+
+
+def thumbnail_url(video_id: str) -> str:
+    return f'https://i.ytimg.com/vi/{video_id}/hqdefault.jpg'
+
+
+def add_video(conn, video_id: str, age: timedelta = timedelta(days=1)) -> None:
+    conn.execute(
+        'INSERT INTO videos (id, title, url, channel_id, views, published_date, thumbnail) VALUES (?, ?, ?, ?, ?, ?, ?)',
+        (video_id, 'Video', f'https://www.youtube.com/watch?v={video_id}', 'UC1', 100,
+         (datetime.now() - age).isoformat(), thumbnail_url(video_id)),
+    )
+    conn.commit()
+
+
+def serve_images(server, images: dict[str, bytes]) -> None:
+    for video_id, data in images.items():
+        server.routes[f'/vi/{video_id}/hqdefault.jpg'] = Response(body=data, content_type='image/jpeg')
+
+
+def run_sync(db, server, root, **options):
+    return sync(db.db, workers=4, image_host=server.url, root=root, **options)
+
+
+def test_sync_stores_images_by_content(db, http_server, tmp_path):
+    root = tmp_path / 'thumbs'
+    serve_images(http_server, {**IMAGES, 'copy': IMAGES['vid1']})
+    for video_id in ('vid1', 'vid2', 'copy'):
+        add_video(db.db, video_id)
+
+    stats = run_sync(db, http_server, root)
+
+    assert (stats['wanted'], stats['fetched'], stats['failed'], stats['bytes']) == (3, 3, 0, 3000)
+    assert sorted(http_server.paths()) == ['/vi/copy/hqdefault.jpg', '/vi/vid1/hqdefault.jpg', '/vi/vid2/hqdefault.jpg']
+    for video_id in ('vid1', 'vid2'):
+        path = digest_path(hashlib.sha256(IMAGES[video_id]).hexdigest(), root)
+        assert path.read_bytes() == IMAGES[video_id]
+    assert len(list(root.glob('*/*.jpg'))) == 2  # Identical images share a file
+    cached = load_cached_thumbnails(db.db, root)
+    assert cached[thumbnail_url('copy')] == cached[thumbnail_url('vid1')]
+
+    again = run_sync(db, http_server, root)
+
+    assert (again['cached'], again['fetched']) == (3, 0)
+    assert len(http_server.paths()) == 3
+
+
+def test_missing_image_counts_as_failure(db, http_server, tmp_path):
+    serve_images(http_server, {'vid1': IMAGES['vid1'], 'vid3': IMAGES['vid3']})
+    for video_id in ('vid1', 'vid2', 'vid3'):
+        add_video(db.db, video_id)
+
+    stats = run_sync(db, http_server, tmp_path / 'thumbs')
+
+    assert (stats['fetched'], stats['failed']) == (2, 1)
+    assert set(load_cached_thumbnails(db.db, tmp_path / 'thumbs')) == {thumbnail_url('vid1'), thumbnail_url('vid3')}
+
+
+def test_least_recently_used_thumbnails_are_evicted(db, http_server, tmp_path):
+    root = tmp_path / 'thumbs'
+    serve_images(http_server, IMAGES)
+    add_video(db.db, 'vid1')
+    add_video(db.db, 'vid2')
+    run_sync(db, http_server, root)
+    # vid1 drops out of the recent window, so the next sync does not touch it
+    db.db.execute("UPDATE videos SET published_date = '2020-01-01T00:00:00' WHERE id = 'vid1'")
+    add_video(db.db, 'vid3')
+
+    stats = run_sync(db, http_server, root, max_bytes=2000)
+
+    assert (stats['evicted'], stats['freed']) == (1, 1000)
+    assert set(load_cached_thumbnails(db.db, root)) == {thumbnail_url('vid2'), thumbnail_url('vid3')}
+    assert not digest_path(hashlib.sha256(IMAGES['vid1']).hexdigest(), root).exists()
+    assert evict(db.db, 1000, root) == (1, 1000)
+    assert len(list(root.glob('*/*.jpg'))) == 1
+
+
+def test_recent_window_uses_local_publish_dates(db, http_server, tmp_path, far_from_utc):
+    serve_images(http_server, IMAGES)
+    add_video(db.db, 'vid1', timedelta(days=DEFAULT_RECENT_DAYS) - timedelta(hours=2))
+    add_video(db.db, 'vid2', timedelta(days=DEFAULT_RECENT_DAYS) + timedelta(hours=2))
+
+    stats = run_sync(db, http_server, tmp_path / 'thumbs')
+
+    assert (stats['wanted'], stats['fetched']) == (1, 1)
+    assert http_server.paths() == ['/vi/vid1/hqdefault.jpg']